@@ -0,0 +1,228 @@
+"""
+Replay the odds recorded with --record-odds (common.odds_recorder) through
+the live betting rules over a grid of thresholds, and report bets, hit
+rate, ROI and max drawdown per sport. Run from src/:
+
+    python backtest.py
+    python backtest.py --sport FOOTBALL --from 2026-09-01 --param "time_min >=" 70,75,80,85
+
+Like the bot, each rule bets once per match, on the first snapshot where it
+holds. Matches are settled from their last recorded snapshot with odds: the
+outcome with the lowest odd won. Bets on matches whose last odd was still
+above SETTLE_ODD (recording stopped before the match was decided) are
+settled the same way and counted as "unsettled" in the report.
+"""
+
+import csv
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common.odds_recorder import load_history
+from sports.football import FOOTBALL_STRATEGY
+from sports.hockey import HOCKEY_STRATEGY
+from sports.basketball import BASKETBALL_STRATEGY
+from sports.tennis import TENNIS_STRATEGY
+
+STRATEGIES = {
+    "FOOTBALL": FOOTBALL_STRATEGY,
+    "HOCKEY": HOCKEY_STRATEGY,
+    "BASKETBALL": BASKETBALL_STRATEGY,
+    "TENNIS": TENNIS_STRATEGY,
+}
+
+# Thresholds tried per sport; anything not listed keeps its live value
+DEFAULT_GRIDS = {
+    "FOOTBALL": {
+        "time_min >=": [70, 75, 79, 82, 85],
+        "odds_low": [1.10, 1.20, 1.30],
+        "odds_high": [1.5, 2.0, 2.5],
+    },
+    "HOCKEY": {
+        "minute_in_tercja >=": [5, 10, 15],
+        "odds_low": [1.10, 1.20, 1.30],
+        "odds_high": [1.5, 2.0, 2.5],
+    },
+    "BASKETBALL": {
+        "ratio(total_elapsed,total_game_minutes) >=": [0.8, 0.85, 0.9, 0.95],
+        "min_odds_ratio": [1.0, 1.25, 1.5],
+        "odds_low": [1.10, 1.20, 1.30],
+        "odds_high": [1.5, 2.0, 2.5],
+    },
+    "TENNIS": {
+        "max(games_player1,games_player2) >=": [2, 3, 4],
+        "odds_low": [1.05, 1.15, 1.25],
+        "odds_high": [1.5, 2.0, 2.5],
+    },
+}
+
+SETTLE_ODD = 1.10
+STAKE = 2.0
+
+def load_snapshots(sport, keys, first_day=None, last_day=None):
+    """
+    (match_codes, columns) for every recorded row of a sport, sorted by
+    match and time; None without data. Columns missing on a day are NaN.
+    """
+    history = load_history(sport, first_day, last_day)
+    if not history:
+        return None
+    data = {}
+    for name in ["ts", "match_id"] + keys:
+        data[name] = np.concatenate([
+            segment[name] if name in segment else np.full(len(segment["ts"]), np.nan)
+            for (_, segment) in history
+        ])
+    _, codes = np.unique(data["match_id"], return_inverse=True)
+    order = np.lexsort((data["ts"], codes))
+    columns = {name: np.asarray(data[name][order], dtype=np.float64) for name in ["ts"] + keys}
+    return codes[order], columns
+
+def settle(strategy, codes, columns):
+    """
+    (winners, clear) per match code: the index of the outcome with the
+    lowest odd in the match's last snapshot that shows any (-1 if none
+    does), and whether that odd had fallen to SETTLE_ODD.
+    """
+    if len(codes) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    odds = np.column_stack([columns[key] for key in strategy.odds_keys])
+    odds = np.where(odds > 0, odds, np.inf)
+    rows = np.flatnonzero(np.isfinite(odds).any(axis=1))
+    winners = np.full(codes.max() + 1, -1)
+    clear = np.zeros(codes.max() + 1, dtype=bool)
+    if len(rows) == 0:
+        return winners, clear
+    # rows are sorted by match, then time
+    last = rows[np.r_[np.flatnonzero(np.diff(codes[rows])), len(rows) - 1]]
+    best = odds[last].argmin(axis=1)
+    winners[codes[last]] = best
+    clear[codes[last]] = odds[last, best] <= SETTLE_ODD
+    return winners, clear
+
+def backtest(strategy, codes, columns, settled, stake=STAKE):
+    winners, clear = settled
+    mask, best, best_odd = strategy.evaluate(columns)
+    rows = np.flatnonzero(mask & (winners[codes] >= 0))
+    # rows are sorted by match, then time: the first hit per match is the bet
+    _, first = np.unique(codes[rows], return_index=True)
+    rows = rows[first]
+    rows = rows[np.argsort(columns["ts"][rows], kind="stable")]
+
+    won = best[rows] == winners[codes[rows]]
+    profit = np.where(won, stake * (best_odd[rows] - 1), -stake)
+    balance = np.cumsum(profit)
+    peak = np.maximum.accumulate(np.r_[0.0, balance])[1:]
+    bets = len(rows)
+    return {
+        "bets": bets,
+        "hits": int(won.sum()),
+        "unsettled": int((~clear[codes[rows]]).sum()),
+        "hit_rate": float(won.mean()) if bets else 0.0,
+        "profit": float(balance[-1]) if bets else 0.0,
+        "roi": float(balance[-1] / (stake * bets)) if bets else 0.0,
+        "max_drawdown": float((peak - balance).max()) if bets else 0.0,
+    }
+
+def grid_params(strategy, grid):
+    base = strategy.params()
+    unknown = set(grid) - set(base) - {"min_odds_ratio"}
+    if unknown:
+        raise ValueError(f"{strategy.name}: unknown parameters {sorted(unknown)}; known: {sorted(base)}")
+    names = list(grid)
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(base, **dict(zip(names, values)))
+        if params["odds_low"] <= params["odds_high"]:
+            yield params
+
+def run_sport(sport, grid, first_day=None, last_day=None):
+    """
+    [(params, result), ...] for every grid point, the live thresholds first.
+    """
+    strategy = STRATEGIES[sport]
+    loaded = load_snapshots(sport, strategy.keys, first_day, last_day)
+    if loaded is None:
+        return []
+    codes, columns = loaded
+    if len(codes) == 0:
+        return []
+    settled = settle(strategy, codes, columns)
+    results = [(strategy.params(), backtest(strategy, codes, columns, settled))]
+    for params in grid_params(strategy, grid):
+        results.append((params, backtest(strategy.tuned(params), codes, columns, settled)))
+    return results
+
+def format_params(params):
+    return ", ".join(f"{name} {value:g}" if name.endswith((">=", ">", "<=", "<", "==", "!="))
+                     else f"{name}={value:g}" for name, value in params.items())
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sport", action="append", choices=sorted(STRATEGIES), help="default: all")
+    parser.add_argument("--from", dest="first_day", metavar="YYYY-MM-DD")
+    parser.add_argument("--to", dest="last_day", metavar="YYYY-MM-DD")
+    parser.add_argument(
+        "--param",
+        nargs=2,
+        action="append",
+        metavar=("NAME", "VALUES"),
+        help='replace a grid axis, e.g. --param "time_min >=" 70,75,80 (needs a single --sport)'
+    )
+    parser.add_argument("--min-bets", type=int, default=20, help="rank only grid points with this many bets")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--out", metavar="CSV", help="write every grid point to a CSV file")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    sports = args.sport or list(STRATEGIES)
+    grids = {sport: dict(DEFAULT_GRIDS[sport]) for sport in sports}
+    if args.param:
+        if len(sports) != 1:
+            print("--param needs exactly one --sport.")
+            return
+        for name, values in args.param:
+            grids[sports[0]][name] = [float(v) for v in values.split(",")]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=len(sports)) as pool:
+        futures = {
+            sport: pool.submit(run_sport, sport, grids[sport], args.first_day, args.last_day)
+            for sport in sports
+        }
+        results = {sport: future.result() for sport, future in futures.items()}
+    elapsed = time.perf_counter() - start
+
+    rows = []
+    for sport in sports:
+        if not results[sport]:
+            print(f"[{sport}] No recorded odds (run the bot with --record-odds).")
+            continue
+        live, grid = results[sport][0][1], results[sport][1:]
+        print(f"[{sport}] {len(grid)} grid points. Live rule: {live['bets']} bets "
+              f"({live['unsettled']} unsettled), hit {live['hit_rate']:.1%}, ROI {live['roi']:+.1%}, "
+              f"max drawdown {live['max_drawdown']:.2f} zł")
+        ranked = sorted(
+            (r for r in grid if r[1]["bets"] >= args.min_bets),
+            key=lambda r: r[1]["roi"],
+            reverse=True
+        )
+        for params, r in ranked[:args.top]:
+            print(f"  {r['bets']:>6} bets ({r['unsettled']} unsettled)  hit {r['hit_rate']:>6.1%}  ROI {r['roi']:>+7.1%}  "
+                  f"DD {r['max_drawdown']:>8.2f}  {format_params(params)}")
+        for params, r in results[sport]:
+            rows.append({"sport": sport, **r, "params": format_params(params)})
+    print(f"[BACKTEST] Done in {elapsed:.2f}s.")
+
+    if args.out and rows:
+        with open(args.out, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"[BACKTEST] Wrote {len(rows)} rows to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_tile_extraction.py
+"""
+Compare per-element scraping with bulk (one execute_script) scraping
+on a synthetic live page, and the incremental MutationObserver poll after
+a few tiles changed. Run from src/:
+
+    python -m benchmarks.bench_tile_extraction --tiles 80 --rounds 5 --changed 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.fixtures import build_live_page
+from benchmarks.harness import make_headless_driver, count_driver_commands
+from common.tile_stream import LiveTileTable
+from sports.football import scrape_football_matches, football_info_from_tile
+from sports.hockey import scrape_hockey_matches, hockey_info_from_tile
+from sports.basketball import scrape_basketball_matches, basketball_info_from_tile
+from sports.tennis import scrape_tennis_matches, tennis_info_from_tile
+
+SCRAPERS = {
+    "pilka-nozna": (scrape_football_matches, football_info_from_tile),
+    "hokej-na-lodzie": (scrape_hockey_matches, hockey_info_from_tile),
+    "koszykowka": (scrape_basketball_matches, basketball_info_from_tile),
+    "tenis": (scrape_tennis_matches, tennis_info_from_tile),
+}
+
+# Simulates live odds moving on the first N tiles
+CHANGE_ODDS_JS = """
+const tiles = document.querySelectorAll("bb-live-match-tile");
+for (let i = 0; i < Math.min(arguments[0], tiles.length); i++) {
+    const value = tiles[i].querySelector("[data-testid='odds-value']");
+    if (value) value.textContent = (1.5 + Math.random()).toFixed(2).replace(".", ",");
+}
+"""
+
+def run_scraper(driver, counter, scraper, bulk, rounds):
+    best = None
+    calls = 0
+    results = []
+    for _ in range(rounds):
+        counter["calls"] = 0
+        start = time.perf_counter()
+        results = scraper(driver, bulk=bulk)
+        elapsed = time.perf_counter() - start
+        calls = counter["calls"]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, calls, [info for (_, info) in results]
+
+def run_incremental(driver, counter, sport, info_from_tile, changed, rounds):
+    table = LiveTileTable(sport, info_from_tile)
+    table.install(driver)
+    best = None
+    calls = 0
+    for _ in range(rounds):
+        driver.execute_script(CHANGE_ODDS_JS, changed)
+        counter["calls"] = 0
+        start = time.perf_counter()
+        table.poll(driver)
+        elapsed = time.perf_counter() - start
+        calls = counter["calls"]
+        best = elapsed if best is None else min(best, elapsed)
+    return best, calls, len(table.last_changed)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tiles", type=int, default=80)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--changed", type=int, default=5, help="tiles changed between incremental polls")
+    args = parser.parse_args()
+
+    driver = make_headless_driver()
+    counter = count_driver_commands(driver)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for sport, (scraper, info_from_tile) in SCRAPERS.items():
+                page_path = os.path.join(tmp_dir, f"{sport}.html")
+                with open(page_path, "w", encoding="utf-8") as f:
+                    f.write(build_live_page(sport, args.tiles))
+                driver.get(f"file://{page_path}")
+
+                slow_s, slow_calls, slow_infos = run_scraper(driver, counter, scraper, False, args.rounds)
+                fast_s, fast_calls, fast_infos = run_scraper(driver, counter, scraper, True, args.rounds)
+                incr_s, incr_calls, incr_tiles = run_incremental(
+                    driver, counter, sport, info_from_tile, args.changed, args.rounds
+                )
+
+                same = "OK" if slow_infos == fast_infos else "MISMATCH"
+                print(f"[{sport}] {args.tiles} tiles | per-element: {slow_s * 1000:.0f} ms, {slow_calls} calls "
+                      f"| bulk: {fast_s * 1000:.0f} ms, {fast_calls} calls "
+                      f"| speedup x{slow_s / max(fast_s, 1e-9):.1f} | match_info {same} "
+                      f"| incremental: {incr_s * 1000:.0f} ms, {incr_calls} calls for {incr_tiles} changed tiles")
+    finally:
+        driver.quit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/fixtures.py
+
+import random
+
+# Markup mirrors the selectors used by sports/* on sts.pl live pages:
+#   div.collapsable-container bb-live-match-tile
+#     a[data-cy=".../<match_id>"]
+#     .match-tile-scoreboard-team__name span      (x2)
+#     .live-match-tile-time-details__game-name
+#     .live-match-tile-scoreboard-score__partials div
+#     sds-odds-button .odds-button__label / [data-testid='odds-value']
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div class="collapsable-container">
+{tiles}
+</div>
+</body>
+</html>
+"""
+
+TILE_TEMPLATE = """<bb-live-match-tile>
+  <a data-cy="live-match/{match_id}" href="/live/{sport}/{match_id}"></a>
+  <div class="match-tile-scoreboard-team__name"><span>{team_home}</span></div>
+  <div class="match-tile-scoreboard-team__name"><span>{team_away}</span></div>
+  <div class="live-match-tile-time-details"><span class="live-match-tile-time-details__game-name">{time_str}</span></div>
+  <div class="live-match-tile-scoreboard-score__partials">{partials}</div>
+  {odds}
+</bb-live-match-tile>"""
+
+ODDS_TEMPLATE = """<sds-odds-button><span class="odds-button__label">{label}</span><span data-testid="odds-value">{value}</span></sds-odds-button>"""
+
+SPORT_LABELS = {
+    "pilka-nozna": ["1", "x", "2"],
+    "hokej-na-lodzie": ["1", "x", "2"],
+    "koszykowka": ["1", "2"],
+    "tenis": ["1", "2"],
+}
+
+def random_time_str(sport, rng):
+    if sport == "pilka-nozna":
+        return f"{rng.randint(1, 90)}'"
+    if sport == "hokej-na-lodzie":
+        return f"{rng.randint(1, 3)} tercja / {rng.randint(0, 19)}'"
+    if sport == "koszykowka":
+        return f"{rng.randint(1, 4)} kwarta / {rng.randint(0, 9)}'"
+    return f"{rng.randint(1, 3)} set"
+
+def random_partials(sport, rng):
+    if sport != "tenis":
+        return ""
+    values = [rng.randint(0, 6), rng.randint(0, 6), rng.randint(0, 5), rng.randint(0, 5)]
+    return "".join(f"<div>{v}</div>" for v in values)
+
+def random_odd(rng):
+    if rng.random() < 0.05:
+        return "-"
+    return f"{rng.uniform(1.05, 6.0):.2f}".replace(".", ",")
+
+def build_live_page(sport, tile_count, seed=0):
+    """
+    Synthetic live page for `sport` (URL slug, e.g. "pilka-nozna") with
+    `tile_count` tiles. Deterministic for a given seed.
+    """
+    rng = random.Random(f"{sport}-{seed}")
+    tiles = []
+    for i in range(tile_count):
+        odds = "".join(
+            ODDS_TEMPLATE.format(label=label, value=random_odd(rng))
+            for label in SPORT_LABELS[sport]
+        )
+        tiles.append(TILE_TEMPLATE.format(
+            sport=sport,
+            match_id=11600000 + i,
+            team_home=f"Home {i}",
+            team_away=f"Away {i}",
+            time_str=random_time_str(sport, rng),
+            partials=random_partials(sport, rng),
+            odds=odds,
+        ))
+    return PAGE_TEMPLATE.format(title=f"live {sport}", tiles="\n".join(tiles))
+
+INSPIRATION_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>strefa-inspiracji</title></head>
+<body>
+<div class="coupons-zone__profiles-info">
+{profiles}
+</div>
+</body>
+</html>
+"""
+
+PROFILE_TEMPLATE = """<sts-coupons-zone-profile-info>
+  <span class="coupons-zone__profile-info-item-details-stats-badge-content-value">{rate}%</span>
+</sts-coupons-zone-profile-info>"""
+
+def build_inspiration_page(profile_count, seed=0):
+    """
+    Synthetic strefa-inspiracji page with `profile_count` user boxes.
+    """
+    rng = random.Random(f"inspiration-{seed}")
+    profiles = "\n".join(
+        PROFILE_TEMPLATE.format(rate=rng.randint(40, 95)) for _ in range(profile_count)
+    )
+    return INSPIRATION_TEMPLATE.format(profiles=profiles)
@@ -0,0 +1,98 @@
+# benchmarks/harness.py
+
+import os
+import re
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from common.browser import resolve_driver_path
+from common.odds_feed import PERFORMANCE_LOG_PREFS
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), "snapshots")
+
+def make_headless_driver(capture_network=False):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", PERFORMANCE_LOG_PREFS)
+    # same chromedriver lookup as the bot (no download when a usable one is cached)
+    return webdriver.Chrome(service=Service(resolve_driver_path()), options=options)
+
+def count_driver_commands(driver):
+    """
+    Wrap driver.execute so every WebDriver command (including WebElement
+    calls, which go through their parent driver) bumps counter["calls"].
+    """
+    counter = {"calls": 0}
+    original_execute = driver.execute
+
+    def counting_execute(driver_command, params=None):
+        counter["calls"] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = counting_execute
+    return counter
+
+def snapshot_filename(path):
+    """
+    "/live/pilka-nozna" -> "live_pilka-nozna.html"
+    """
+    return path.strip("/").replace("/", "_") + ".html"
+
+def strip_scripts(html):
+    """
+    Captured pages must not boot the real app (it would hit sts.pl again
+    and re-render the tiles), so <script> blocks are removed.
+    """
+    return re.sub(r"<script\b[^>]*>.*?</script>", "", html, flags=re.S | re.I)
+
+def load_snapshot(path):
+    """
+    Captured HTML for a site path from SNAPSHOT_DIR, or None.
+    """
+    file_path = os.path.join(SNAPSHOT_DIR, snapshot_filename(path))
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def save_snapshot(path, html):
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    file_path = os.path.join(SNAPSHOT_DIR, snapshot_filename(path))
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(strip_scripts(html))
+    return file_path
+
+def start_replay_server(pages):
+    """
+    Serve {path: html} on 127.0.0.1 (random port) from a background thread.
+    Returns (server, base_url); call server.shutdown() when done.
+    """
+    encoded = {path: html.encode("utf-8") for path, html in pages.items()}
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = encoded.get(self.path.split("?")[0].rstrip("/") or "/")
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ReplayHandler)
+    threading.Thread(target=server.serve_forever, name="replay-server", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
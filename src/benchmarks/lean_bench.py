@@ -0,0 +1,85 @@
+# benchmarks/lean_bench.py
+"""
+Full vs lean (headless + blocked images/fonts/trackers) page loads on the
+real site, public pages only, no login. Per page it prints navigation time,
+requests and bytes loaded in each mode, what lean mode saved, and the JS
+heap after load. The full loads are saved as the baseline the bot's
+[LEAN] reports measure bytes saved against. Run from src/:
+
+    python -m benchmarks.lean_bench --rounds 3
+"""
+
+import time
+import argparse
+
+from common.browser import create_driver, resolve_driver_path
+from common.lean import LeanStats, save_baseline, LEAN_BASELINE_FILE
+from common.live_tiles import LIVE_TILE_SELECTOR
+from common.urls import DEFAULT_BASE_URL
+from common.waits import wait_for_live_tiles, wait_for_page_ready
+from benchmarks.replay_bench import LIVE_PAGES, INSPIRATION_PATH
+
+def page_paths():
+    return [(page["name"], page["path"]) for page in LIVE_PAGES] + [("INSPIRATION", INSPIRATION_PATH)]
+
+def load_page(driver, stats, path):
+    stats.observe(driver)
+    stats.reset()
+    start = time.perf_counter()
+    driver.get(DEFAULT_BASE_URL + path)
+    if path.startswith("/live"):
+        wait_for_live_tiles(driver, LIVE_TILE_SELECTOR)
+    else:
+        wait_for_page_ready(driver)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    # late requests (lazy images, trackers) still count towards the page
+    time.sleep(2)
+    stats.observe(driver)
+
+    metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    heap = next((m["value"] for m in metrics if m["name"] == "JSHeapUsedSize"), 0)
+    blocked = sum(stats.blocked.values())
+    return {
+        "navigate_ms": elapsed_ms,
+        "requests": stats.requests - blocked,
+        "blocked": blocked,
+        "bytes": stats.bytes_loaded,
+        "heap_mb": heap / 1024 / 1024,
+    }
+
+def bench_mode(driver_path, lean, rounds):
+    # capture_network gives the full driver the same performance log
+    driver = create_driver(driver_path, capture_network=True, lean=lean)
+    driver.execute_cdp_cmd("Performance.enable", {})
+    stats = LeanStats()
+    results = {}
+    try:
+        for name, path in page_paths():
+            runs = [load_page(driver, stats, path) for _ in range(rounds)]
+            best = min(runs, key=lambda r: r["navigate_ms"])
+            best["bytes"] = sum(r["bytes"] for r in runs) / len(runs)
+            results[name] = best
+    finally:
+        driver.quit()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    driver_path = resolve_driver_path()
+    full = bench_mode(driver_path, lean=False, rounds=args.rounds)
+    lean = bench_mode(driver_path, lean=True, rounds=args.rounds)
+    save_baseline({name: {"requests": r["requests"], "bytes": r["bytes"]} for name, r in full.items()})
+    print(f"[LEAN] Full-load baseline saved to {LEAN_BASELINE_FILE}")
+
+    for name, _ in page_paths():
+        f, l = full[name], lean[name]
+        print(f"[{name:<11}] full {f['navigate_ms']:>6.0f} ms {f['requests']:>4} req {f['bytes'] / 1024:>7.0f} KB "
+              f"heap {f['heap_mb']:>5.1f} MB | lean {l['navigate_ms']:>6.0f} ms {l['requests']:>4} req "
+              f"{l['bytes'] / 1024:>7.0f} KB heap {l['heap_mb']:>5.1f} MB | saved {l['blocked']} req, "
+              f"{(f['bytes'] - l['bytes']) / 1024:.0f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+# benchmarks/replay_bench.py
+"""
+Offline replay harness: serve recorded STS pages from a local HTTP server
+and run the scrape + pick functions against them in headless Chrome.
+No login and no real money involved. Run from src/:
+
+    # record snapshots from the real site (public live pages, no login)
+    python -m benchmarks.replay_bench capture
+
+    # benchmark against snapshots (generated pages where none were captured)
+    python -m benchmarks.replay_bench run --rounds 3 --save-baseline baseline.json
+    python -m benchmarks.replay_bench run --baseline baseline.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+from selenium.webdriver.common.by import By
+
+from benchmarks.fixtures import build_live_page, build_inspiration_page
+from benchmarks.harness import (
+    make_headless_driver,
+    count_driver_commands,
+    load_snapshot,
+    save_snapshot,
+    start_replay_server
+)
+from common.browser import create_driver
+from common.live_tiles import LIVE_TILE_SELECTOR
+from common.urls import DEFAULT_BASE_URL
+from common.waits import wait_for_live_tiles, wait_for_page_ready
+from sports.football import navigate_to_football_live, scrape_football_matches, FOOTBALL_STRATEGY
+from sports.hockey import navigate_to_hockey_live, scrape_hockey_matches, HOCKEY_STRATEGY
+from sports.basketball import navigate_to_basketball_live, scrape_basketball_matches, BASKETBALL_STRATEGY
+from sports.tennis import navigate_to_tennis_live, scrape_tennis_matches, TENNIS_STRATEGY
+from sports.inspiration import go_to_inspiration_page, find_inspiration_users, get_user_success_rate
+
+LIVE_PAGES = [
+    {
+        "name": "FOOTBALL",
+        "path": "/live/pilka-nozna",
+        "slug": "pilka-nozna",
+        "navigate": navigate_to_football_live,
+        "scrape": scrape_football_matches,
+        "strategy": FOOTBALL_STRATEGY,
+    },
+    {
+        "name": "HOCKEY",
+        "path": "/live/hokej-na-lodzie",
+        "slug": "hokej-na-lodzie",
+        "navigate": navigate_to_hockey_live,
+        "scrape": scrape_hockey_matches,
+        "strategy": HOCKEY_STRATEGY,
+    },
+    {
+        "name": "BASKETBALL",
+        "path": "/live/koszykowka",
+        "slug": "koszykowka",
+        "navigate": navigate_to_basketball_live,
+        "scrape": scrape_basketball_matches,
+        "strategy": BASKETBALL_STRATEGY,
+    },
+    {
+        "name": "TENNIS",
+        "path": "/live/tenis",
+        "slug": "tenis",
+        "navigate": navigate_to_tennis_live,
+        "scrape": scrape_tennis_matches,
+        "strategy": TENNIS_STRATEGY,
+    },
+]
+
+SCRAPE_MODES = (
+    ("per-element", {"bulk": False}),
+    ("lazy", {"bulk": False, "lazy": True}),
+    ("bulk", {"bulk": True}),
+)
+
+INSPIRATION_PATH = "/strefa-inspiracji/polecamy"
+
+# A run is flagged when it is this much slower than the baseline
+REGRESSION_TOLERANCE = 0.20
+
+def capture(args):
+    driver = create_driver()
+    try:
+        for page in LIVE_PAGES:
+            driver.get(DEFAULT_BASE_URL + page["path"])
+            wait_for_live_tiles(driver, LIVE_TILE_SELECTOR)
+            print(f"[CAPTURE] {page['name']} => {save_snapshot(page['path'], driver.page_source)}")
+
+        driver.get(DEFAULT_BASE_URL + INSPIRATION_PATH)
+        wait_for_page_ready(driver)
+        print(f"[CAPTURE] INSPIRATION => {save_snapshot(INSPIRATION_PATH, driver.page_source)}")
+    finally:
+        driver.quit()
+
+def build_pages(tiles):
+    pages = {}
+    for page in LIVE_PAGES:
+        html = load_snapshot(page["path"])
+        source = "snapshot"
+        if html is None:
+            html = build_live_page(page["slug"], tiles)
+            source = "generated"
+        pages[page["path"]] = html
+        print(f"[REPLAY] {page['path']} <= {source}")
+
+    html = load_snapshot(INSPIRATION_PATH)
+    if html is None:
+        html = build_inspiration_page(profile_count=12)
+    pages[INSPIRATION_PATH] = html
+    return pages
+
+def bench_live_page(driver, counter, page, scrape_kwargs, rounds):
+    """
+    Best-of-`rounds` timings for navigate -> scrape -> pick on one page.
+    """
+    best = None
+    for _ in range(rounds):
+        counter["calls"] = 0
+        start = time.perf_counter()
+        page["navigate"](driver)
+        navigated = time.perf_counter()
+
+        counter["calls"] = 0
+        matches = page["scrape"](driver, **scrape_kwargs)
+        scraped = time.perf_counter()
+        scrape_calls = counter["calls"]
+
+        candidates = page["strategy"].rank([info for (_, info) in matches])
+        decided = time.perf_counter()
+        # lazy scrapes return only the tiles they read in full
+        tile_count = len(driver.find_elements(By.CSS_SELECTOR, LIVE_TILE_SELECTOR))
+
+        result = {
+            "tiles": tile_count,
+            "candidates": len(candidates),
+            "navigate_ms": (navigated - start) * 1000,
+            "scrape_ms": (scraped - navigated) * 1000,
+            "decision_ms": (decided - start) * 1000,
+            "calls_per_tile": scrape_calls / max(tile_count, 1),
+            "tiles_per_s": tile_count / max(scraped - navigated, 1e-9),
+        }
+        if best is None or result["decision_ms"] < best["decision_ms"]:
+            best = result
+    return best
+
+def bench_inspiration(driver, counter, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        go_to_inspiration_page(driver)
+        counter["calls"] = 0
+        users = find_inspiration_users(driver)
+        rates = [get_user_success_rate(box) for box in users]
+        decided = time.perf_counter()
+
+        result = {
+            "tiles": len(users),
+            "candidates": sum(1 for rate in rates if rate >= 79),
+            "decision_ms": (decided - start) * 1000,
+            "calls_per_tile": counter["calls"] / max(len(users), 1),
+        }
+        if best is None or result["decision_ms"] < best["decision_ms"]:
+            best = result
+    return best
+
+def compare_with_baseline(results, baseline):
+    """
+    Return a list of human-readable regressions against a saved baseline.
+    """
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        if result["decision_ms"] > base["decision_ms"] * (1 + REGRESSION_TOLERANCE):
+            regressions.append(
+                f"{key}: decision {result['decision_ms']:.0f} ms vs baseline {base['decision_ms']:.0f} ms"
+            )
+        if result["calls_per_tile"] > base["calls_per_tile"] + 0.01:
+            regressions.append(
+                f"{key}: {result['calls_per_tile']:.1f} calls/tile vs baseline {base['calls_per_tile']:.1f}"
+            )
+    return regressions
+
+def run(args):
+    server, base_url = start_replay_server(build_pages(args.tiles))
+    os.environ["STS_BASE_URL"] = base_url
+
+    driver = make_headless_driver()
+    counter = count_driver_commands(driver)
+    results = {}
+
+    try:
+        for mode, scrape_kwargs in SCRAPE_MODES:
+            for page in LIVE_PAGES:
+                result = bench_live_page(driver, counter, page, scrape_kwargs, args.rounds)
+                results[f"{page['name']}/{mode}"] = result
+                print(f"[{page['name']:<10}] {mode:<11} {result['tiles']:>4} tiles "
+                      f"| {result['tiles_per_s']:>8.0f} tiles/s "
+                      f"| {result['calls_per_tile']:>5.1f} calls/tile "
+                      f"| scrape {result['scrape_ms']:>6.0f} ms "
+                      f"| decision {result['decision_ms']:>6.0f} ms "
+                      f"| {result['candidates']} candidates")
+
+        result = bench_inspiration(driver, counter, args.rounds)
+        results["INSPIRATION"] = result
+        print(f"[INSPIRATION] {result['tiles']} profiles | {result['calls_per_tile']:.1f} calls/profile "
+              f"| decision {result['decision_ms']:.0f} ms | {result['candidates']} qualifying")
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"[REPLAY] Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_with_baseline(results, json.load(f))
+        for line in regressions:
+            print(f"[REGRESSION] {line}")
+        if regressions:
+            sys.exit(1)
+        print("[REPLAY] No regressions against baseline.")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("capture", help="save live pages from sts.pl into benchmarks/snapshots")
+
+    run_parser = subparsers.add_parser("run", help="benchmark scrape + pick against the snapshots")
+    run_parser.add_argument("--tiles", type=int, default=80, help="tiles per generated page")
+    run_parser.add_argument("--rounds", type=int, default=3)
+    run_parser.add_argument("--save-baseline", metavar="PATH")
+    run_parser.add_argument("--baseline", metavar="PATH")
+
+    args = parser.parse_args()
+    if args.command == "capture":
+        capture(args)
+    else:
+        run(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+# benchmarks/ws_replay.py
+"""
+Stand-in websocket server for the odds feed (common.odds_feed).
+It replays recorded (or generated) frames to a local copy of a live page
+and checks that LiveOddsFeed ends up with the same odds, without a single
+DOM query after the first resync. Run from src/:
+
+    # record frames from the real football page for 60 s (no login needed)
+    python -m benchmarks.ws_replay record --seconds 60 --out frames.jsonl
+
+    # replay them (or generated frames when --frames is omitted)
+    python -m benchmarks.ws_replay run --frames frames.jsonl
+"""
+
+import json
+import time
+import base64
+import hashlib
+import argparse
+import threading
+import socketserver
+
+from benchmarks.fixtures import build_live_page
+from benchmarks.harness import make_headless_driver, count_driver_commands, start_replay_server
+from common.browser import create_driver
+from common.odds_feed import LiveOddsFeed, read_network_payloads, decode_payload
+from sports.football import navigate_to_football_live, football_info_from_tile
+
+WS_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+def encode_text_frame(payload):
+    """
+    Unmasked server -> client text frame (RFC 6455).
+    """
+    data = payload.encode("utf-8")
+    header = bytearray([0x81])
+    if len(data) < 126:
+        header.append(len(data))
+    elif len(data) < 65536:
+        header.append(126)
+        header += len(data).to_bytes(2, "big")
+    else:
+        header.append(127)
+        header += len(data).to_bytes(8, "big")
+    return bytes(header) + data
+
+def start_ws_server(frames, interval):
+    """
+    Every client that connects gets `frames` one by one, `interval` s apart.
+    Returns (server, ws_url).
+    """
+
+    class ReplayWebSocketHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            request = b""
+            while not request.endswith(b"\r\n\r\n"):
+                line = self.rfile.readline()
+                if not line:
+                    return
+                request += line
+            key = None
+            for line in request.split(b"\r\n"):
+                if line.lower().startswith(b"sec-websocket-key:"):
+                    key = line.split(b":", 1)[1].strip()
+            if key is None:
+                return
+
+            accept = base64.b64encode(hashlib.sha1(key + WS_GUID).digest())
+            self.wfile.write(
+                b"HTTP/1.1 101 Switching Protocols\r\n"
+                b"Upgrade: websocket\r\n"
+                b"Connection: Upgrade\r\n"
+                b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n"
+            )
+            try:
+                for payload in frames:
+                    time.sleep(interval)
+                    self.wfile.write(encode_text_frame(payload))
+                    self.wfile.flush()
+                # keep the socket open until the browser leaves the page
+                self.rfile.read(1)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), ReplayWebSocketHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="ws-replay", daemon=True).start()
+    return server, f"ws://127.0.0.1:{server.server_address[1]}/"
+
+def generate_frames(tile_count, updates):
+    """
+    JSON frames moving odds and clock for random matches of the generated
+    football page (ids 11600000 + i, see benchmarks.fixtures).
+    """
+    frames = []
+    for n in range(updates):
+        i = (n * 7) % tile_count
+        frames.append(json.dumps({
+            "type": "odds-update",
+            "matchId": 11600000 + i,
+            "time": f"{79 + n % 12}'",
+            "odds": [
+                {"label": "1", "value": f"{1.20 + (n % 10) / 10:.2f}"},
+                {"label": "x", "value": f"{3.10 + (n % 5) / 10:.2f}"},
+                {"label": "2", "value": f"{4.50 + (n % 7) / 10:.2f}"},
+            ],
+        }))
+    return frames
+
+def load_frames(path):
+    frames = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                frames.append(json.loads(line)["payload"])
+    return frames
+
+def record(args):
+    driver = create_driver(capture_network=True)
+    pending_xhr = set()
+    count = 0
+    try:
+        navigate_to_football_live(driver)
+        deadline = time.time() + args.seconds
+        with open(args.out, "w", encoding="utf-8") as f:
+            while time.time() < deadline:
+                for payload in read_network_payloads(driver, pending_xhr):
+                    f.write(json.dumps({"payload": payload}, ensure_ascii=False) + "\n")
+                    count += 1
+                time.sleep(1)
+    finally:
+        driver.quit()
+    print(f"[RECORD] {count} frames => {args.out}")
+
+def expected_tiles(frames):
+    """
+    Final state per match_id after applying every frame, straight from the decoder.
+    """
+    expected = {}
+    for payload in frames:
+        for update in decode_payload(payload):
+            expected.setdefault(update["match_id"], {}).update(update)
+    return expected
+
+def run(args):
+    frames = load_frames(args.frames) if args.frames else generate_frames(args.tiles, args.updates)
+    ws_server, ws_url = start_ws_server(frames, args.interval)
+
+    page = build_live_page("pilka-nozna", args.tiles).replace(
+        "</body>", f"<script>window.feedSocket = new WebSocket({json.dumps(ws_url)});</script>\n</body>"
+    )
+    http_server, base_url = start_replay_server({"/live/pilka-nozna": page})
+
+    driver = make_headless_driver(capture_network=True)
+    counter = count_driver_commands(driver)
+    feed = LiveOddsFeed(football_info_from_tile)
+
+    try:
+        driver.get(base_url + "/live/pilka-nozna")
+        feed.resync(driver)
+        time.sleep(args.interval * len(frames) + 1)
+
+        counter["calls"] = 0
+        start = time.perf_counter()
+        applied = feed.drain(driver)
+        drain_ms = (time.perf_counter() - start) * 1000
+        drain_calls = counter["calls"]
+    finally:
+        driver.quit()
+        http_server.shutdown()
+        ws_server.shutdown()
+
+    mismatches = 0
+    for match_id, update in expected_tiles(frames).items():
+        tile = feed.tiles.get(match_id)
+        if tile is None:
+            continue
+        for key, value in update.items():
+            if tile.get(key) != value:
+                mismatches += 1
+
+    print(f"[FEED] {len(frames)} frames, {applied} tile updates applied in {drain_ms:.1f} ms "
+          f"with {drain_calls} WebDriver call(s), {mismatches} mismatching fields, "
+          f"fresh={feed.is_fresh()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="record network frames from the live football page")
+    record_parser.add_argument("--seconds", type=int, default=60)
+    record_parser.add_argument("--out", default="frames.jsonl")
+
+    run_parser = subparsers.add_parser("run", help="replay frames to a local page and check the odds table")
+    run_parser.add_argument("--frames", metavar="PATH", help="recorded frames (.jsonl); generated if omitted")
+    run_parser.add_argument("--tiles", type=int, default=80)
+    run_parser.add_argument("--updates", type=int, default=200)
+    run_parser.add_argument("--interval", type=float, default=0.01)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args)
+    else:
+        run(args)
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,41 @@
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.common.exceptions import NoSuchElementException
+
+from common.urls import sts_url
+from common.waits import wait_for_page_ready, wait_for_element, wait_for_invisibility
+
+COOKIE_ACCEPT_SELECTOR = "#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll"
+LOGIN_BUTTON_SELECTOR = "button[data-cy='static-button']"
 
 def login_sts(driver: WebDriver, username: str, password: str):
-    driver.get("https://www.sts.pl/live")
-    time.sleep(2)
+    driver.get(sts_url("/live"))
+    wait_for_page_ready(driver)
 
-    try:
-        accept_all_button = driver.find_element(By.ID, "CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll")
+    accept_all_button = wait_for_element(driver, COOKIE_ACCEPT_SELECTOR, "cookie_banner", clickable=True)
+    if accept_all_button:
         accept_all_button.click()
-        time.sleep(1)
-    except NoSuchElementException:
+        wait_for_invisibility(driver, COOKIE_ACCEPT_SELECTOR, "cookie_banner")
+    else:
         print("Cookie consent button not found or already accepted.")
 
-    login_button = driver.find_element(By.CSS_SELECTOR, "button[data-cy='static-button']")
+    login_button = wait_for_element(driver, LOGIN_BUTTON_SELECTOR, "login_form", clickable=True)
+    if not login_button:
+        login_button = driver.find_element(By.CSS_SELECTOR, LOGIN_BUTTON_SELECTOR)
     login_button.click()
-    time.sleep(2)
 
-    username_input = driver.find_element(By.ID, "Username")
+    username_input = wait_for_element(driver, "#Username", "login_form", clickable=True)
+    if not username_input:
+        username_input = driver.find_element(By.ID, "Username")
     username_input.send_keys(username)
 
     password_input = driver.find_element(By.ID, "Password")
     password_input.send_keys(password)
 
-    try:
-        submit_button = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-login']")
+    submit_button = wait_for_element(driver, "button[data-testid='button-login']", "login_form", clickable=True)
+    if submit_button:
         submit_button.click()
-    except NoSuchElementException:
+    else:
         print("Final login button not found.")
-    time.sleep(2)
+
+    # Form closes once the credentials are accepted (or a captcha takes over)
+    wait_for_invisibility(driver, "#Username", "login_done")
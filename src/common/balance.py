@@ -0,0 +1,105 @@
+# common/balance.py
+
+import time
+
+from common.bet_logic import BETS_LOCK, get_balance
+from common.metrics import timed, BALANCE_READS
+
+# Read the balance element at least this often anyway (settled wins,
+# bets made by hand)
+RECONCILE_SECONDS = 5 * 60
+# Differences up to this are rounding, not drift
+DRIFT_TOLERANCE = 0.01
+
+class BalanceLedger:
+    """
+    The account balance kept locally: read from the page (get_balance) only
+    at reconciliation points, and lowered by every stake that may have
+    left the account in between. A read that disagrees with the local
+    value is reported as drift (e.g. a settled win, a manual bet).
+    Shared by every sport; one account, one ledger.
+    """
+
+    def __init__(self, reconcile_seconds=RECONCILE_SECONDS):
+        self.reconcile_seconds = reconcile_seconds
+        self.balance = None
+        self.synced_at = 0.0
+        self.unsure = "first read"
+        # the last page read failed (e.g. the session expired)
+        self.read_failed = False
+
+    def estimate(self):
+        with BETS_LOCK:
+            return self.balance if self.balance is not None else 0.0
+
+    def spend(self, stake):
+        """
+        A bet that may have gone through: take its stake off. Returns the
+        new local balance (what balance_after records).
+        """
+        with BETS_LOCK:
+            if self.balance is not None:
+                self.balance -= stake
+            return self.estimate()
+
+    def mark_unsure(self, reason):
+        """
+        The next current() reads the page, e.g. after a ticket error.
+        """
+        with BETS_LOCK:
+            self.unsure = reason
+
+    def reconcile_reason(self):
+        with BETS_LOCK:
+            if self.unsure:
+                return self.unsure
+            if time.time() - self.synced_at > self.reconcile_seconds:
+                return "periodic check"
+            return None
+
+    def reconcile(self, driver, sport="", reason="requested"):
+        """
+        Read the balance element and adopt it; report drift from the local value.
+        A failed read (get_balance's None, or an error) keeps the local value
+        and leaves the ledger due for another read.
+        """
+        with timed("get_balance", sport):
+            try:
+                actual = get_balance(driver)
+            except Exception as e:
+                print(f"[BALANCE] Read failed: {e}")
+                actual = None
+        if actual is None:
+            BALANCE_READS.inc(result="failed")
+            with BETS_LOCK:
+                self.read_failed = True
+                self.unsure = self.unsure or "failed read"
+            print(f"[BALANCE] Could not read the balance on {reason}, keeping {self.estimate():.2f} zł.")
+            return self.estimate()
+        with BETS_LOCK:
+            self.read_failed = False
+            expected = self.balance
+            self.balance = actual
+            self.synced_at = time.time()
+            self.unsure = None
+        if expected is not None and abs(actual - expected) > DRIFT_TOLERANCE:
+            BALANCE_READS.inc(result="drift")
+            print(f"[BALANCE] Drift on {reason}: page shows {actual:.2f} zł, "
+                  f"ledger had {expected:.2f} zł ({actual - expected:+.2f}).")
+        else:
+            BALANCE_READS.inc(result="ok")
+        return actual
+
+    def current(self, driver, sport="", low=None):
+        """
+        Local balance, reconciled first when due, or when it is under `low`
+        (a low balance is confirmed on the page before anything is skipped).
+        """
+        reason = self.reconcile_reason()
+        if reason is None and low is not None and self.estimate() < low:
+            reason = "low balance"
+        if reason is not None:
+            return self.reconcile(driver, sport, reason)
+        return self.estimate()
+
+BALANCE = BalanceLedger()
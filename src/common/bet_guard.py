@@ -0,0 +1,56 @@
+# common/bet_guard.py
+
+from common.bet_logic import BETS_LOCK
+
+MIN_BALANCE = 2.0
+
+class BetGuard:
+    """
+    Shared between sport workers that run in parallel on the same account.
+    - claim_match: only one worker may try a given match_id at a time,
+      and never one that is already in bets_data["betted_matches"].
+    - reserve_stake: stakes in flight are subtracted from the last known
+      balance, so concurrent bets can never take it under MIN_BALANCE.
+    """
+
+    def __init__(self, bets_data, min_balance=MIN_BALANCE):
+        self.bets_data = bets_data
+        self.min_balance = min_balance
+        self.balance = 0.0
+        self.reserved = 0.0
+        self.in_flight = set()
+
+    def update_balance(self, balance):
+        with BETS_LOCK:
+            self.balance = balance
+
+    def available(self):
+        with BETS_LOCK:
+            return self.balance - self.reserved
+
+    def claim_match(self, match_id):
+        with BETS_LOCK:
+            if match_id in self.bets_data["betted_matches"] or match_id in self.in_flight:
+                return False
+            self.in_flight.add(match_id)
+            return True
+
+    def release_match(self, match_id):
+        with BETS_LOCK:
+            self.in_flight.discard(match_id)
+
+    def reserve_stake(self, stake):
+        with BETS_LOCK:
+            if self.balance - self.reserved < max(self.min_balance, stake):
+                return False
+            self.reserved += stake
+            return True
+
+    def release_stake(self, stake, spent=0.0):
+        """
+        Drop a reservation. `spent` is what the bet actually used; it comes
+        off the known balance until the next update_balance.
+        """
+        with BETS_LOCK:
+            self.reserved = max(0.0, self.reserved - stake)
+            self.balance -= spent
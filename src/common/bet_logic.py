@@ -1,77 +1,217 @@
 import os
 import json
 import time
+import threading
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 
-def get_daily_bet_filename():
-    date_str = time.strftime("%d_%m_%Y")
-    daily_filename = f"bets_data_{date_str}.json"
+from common.dedup import DedupIndex, cutoff_day
+from common.ledger import append_records, replay_ledger
+from common.metrics import timed
+from common.waits import BALANCE_SELECTOR, wait_for_element
 
-    folder = os.path.join(os.path.dirname(__file__), "db")
-    os.makedirs(folder, exist_ok=True)
+# Guards bets_data when several sport workers share it (see sports/live_scan.py)
+BETS_LOCK = threading.RLock()
 
-    return os.path.join(folder, daily_filename)
+DB_DIR = os.path.join(os.path.dirname(__file__), "db")
+DAILY_FILE_FORMAT = "%d_%m_%Y"
 
-def load_bets_data():
-    json_path = get_daily_bet_filename()
-
-    if not os.path.exists(json_path):
-        return {
-            "betted_matches": set(),
-            "betted_coupons": set(),   # NEW: track coupon IDs
-            "bets_details": []
-        }
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            data["betted_matches"] = set(data.get("betted_matches", []))
-            # If not present, initialize empty set
-            data["betted_coupons"] = set(data.get("betted_coupons", []))
-            return data
-    except Exception as e:
-        print(f"Error loading {json_path}: {e}")
-        return {
-            "betted_matches": set(),
-            "betted_coupons": set(),
-            "bets_details": []
-        }
-
-def save_bets_data(bets_data):
-    json_path = get_daily_bet_filename()
-
-    data_to_save = {
-        "betted_matches": list(bets_data["betted_matches"]),
-        "betted_coupons": list(bets_data.get("betted_coupons", [])),
-        "bets_details": bets_data["bets_details"],
-        "last_saved": time.strftime("%Y-%m-%d %H:%M:%S")
+# extension -> (path, local midnight when it stops being today's file)
+DAILY_FILES = {}
+
+def next_midnight(now):
+    t = time.localtime(now)
+    return time.mktime((t.tm_year, t.tm_mon, t.tm_mday + 1, 0, 0, 0, 0, 0, -1))
+
+def daily_bet_filename(date_str, extension="json"):
+    return os.path.join(DB_DIR, f"bets_data_{date_str}.{extension}")
+
+def get_daily_bet_filename(extension="json"):
+    """
+    Today's bets_data file. The path (and the db folder) is worked out once
+    per day, not on every save.
+    """
+    now = time.time()
+    cached = DAILY_FILES.get(extension)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    os.makedirs(DB_DIR, exist_ok=True)
+    path = daily_bet_filename(time.strftime(DAILY_FILE_FORMAT, time.localtime(now)), extension)
+    DAILY_FILES[extension] = (path, next_midnight(now))
+    return path
+
+def get_daily_ledger_filename():
+    return get_daily_bet_filename(extension="jsonl")
+
+def empty_bets_data():
+    return {
+        "betted_matches": set(),
+        "betted_coupons": set(),   # NEW: track coupon IDs
+        "bets_details": [],
+        # what is already in the ledger, so save_bets_data only appends the rest
+        "journaled": {"details": 0, "matches": set(), "coupons": set()}
     }
-    try:
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(data_to_save, f, ensure_ascii=False, indent=2)
-        print(f"[OK] bets_data saved to {json_path}")
-    except Exception as e:
-        print(f"Error saving {json_path}: {e}")
+
+def read_daily_bets(json_path, ledger_path):
+    """
+    One day's bets_data: the old full .json snapshot (if any), then the
+    append-only ledger (.jsonl).
+    """
+    data = empty_bets_data()
+
+    if os.path.exists(json_path):
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            data["betted_matches"].update(snapshot.get("betted_matches", []))
+            data["betted_coupons"].update(snapshot.get("betted_coupons", []))
+            data["bets_details"].extend(snapshot.get("bets_details", []))
+        except Exception as e:
+            print(f"Error loading {json_path}: {e}")
+
+    for record in replay_ledger(ledger_path):
+        kind = record.get("type")
+        if kind == "bet":
+            detail = record["detail"]
+            data["bets_details"].append(detail)
+            if detail.get("match_id"):
+                data["betted_matches"].add(detail["match_id"])
+            if detail.get("coupon_id"):
+                data["betted_coupons"].add(detail["coupon_id"])
+        elif kind == "match":
+            data["betted_matches"].add(record["match_id"])
+        elif kind == "coupon":
+            data["betted_coupons"].add(record["coupon_id"])
+    return data
+
+def seed_dedup_index(index):
+    """
+    First run with the index: fill it from the daily files still inside
+    its retention window.
+    """
+    cutoff = cutoff_day(index.retention_days)
+    dates = {
+        name[len("bets_data_"):].rsplit(".", 1)[0] for name in os.listdir(DB_DIR)
+        if name.startswith("bets_data_") and name.endswith((".json", ".jsonl"))
+    }
+    for date_str in sorted(dates):
+        try:
+            day = time.strftime("%Y-%m-%d", time.strptime(date_str, DAILY_FILE_FORMAT))
+        except ValueError:
+            continue
+        if day < cutoff:
+            continue
+        data = read_daily_bets(daily_bet_filename(date_str), daily_bet_filename(date_str, "jsonl"))
+        index.add("match", sorted(data["betted_matches"]), day)
+        index.add("coupon", sorted(data["betted_coupons"]), day)
+
+def load_bets_data():
+    """
+    Today's bets_data (for reporting) with betted_matches / betted_coupons
+    taken from the multi-day DedupIndex, so a restart after midnight never
+    bets yesterday's matches again.
+    """
+    data = read_daily_bets(get_daily_bet_filename(), get_daily_ledger_filename())
+
+    index = DedupIndex()
+    if index.exists():
+        index.load()
+    else:
+        seed_dedup_index(index)
+    # today's ledger may hold ids the index missed (crash between the two writes)
+    index.add("match", sorted(data["betted_matches"]))
+    index.add("coupon", sorted(data["betted_coupons"]))
+    data["betted_matches"] = index.matches()
+    data["betted_coupons"] = index.coupons()
+    data["dedup"] = index
+
+    journaled = data["journaled"]
+    journaled["details"] = len(data["bets_details"])
+    journaled["matches"] = set(data["betted_matches"])
+    journaled["coupons"] = set(data["betted_coupons"])
+    return data
+
+def save_bets_data(bets_data, sport=""):
+    """
+    Append whatever is new in bets_data since the last save to the ledger:
+    new bets_details entries, plus match/coupon ids added without a detail.
+    Timed as phase "save_bets_data" under `sport`, like the other phases.
+    """
+    ledger_path = get_daily_ledger_filename()
+
+    with timed("save_bets_data", sport), BETS_LOCK:
+        journaled = bets_data.setdefault(
+            "journaled", {"details": 0, "matches": set(), "coupons": set()}
+        )
+        saved_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        records = []
+        new_matches = set()
+        new_coupons = set()
+
+        for detail in bets_data["bets_details"][journaled["details"]:]:
+            records.append({"type": "bet", "saved_at": saved_at, "detail": detail})
+            if detail.get("match_id"):
+                new_matches.add(detail["match_id"])
+            if detail.get("coupon_id"):
+                new_coupons.add(detail["coupon_id"])
+
+        for match_id in bets_data["betted_matches"] - journaled["matches"] - new_matches:
+            records.append({"type": "match", "saved_at": saved_at, "match_id": match_id})
+            new_matches.add(match_id)
+        for coupon_id in bets_data.get("betted_coupons", set()) - journaled["coupons"] - new_coupons:
+            records.append({"type": "coupon", "saved_at": saved_at, "coupon_id": coupon_id})
+            new_coupons.add(coupon_id)
+
+        if not records:
+            return
+        try:
+            dedup = bets_data.get("dedup")
+            if dedup is not None:
+                # dedup first: a bet must never be forgotten, even if the report write fails
+                dedup.add("match", sorted(new_matches))
+                dedup.add("coupon", sorted(new_coupons))
+            append_records(ledger_path, records)
+            journaled["details"] = len(bets_data["bets_details"])
+            journaled["matches"] |= new_matches
+            journaled["coupons"] |= new_coupons
+            print(f"[OK] {len(records)} record(s) appended to {ledger_path}")
+        except Exception as e:
+            print(f"Error saving {ledger_path}: {e}")
+
+def record_bet(bets_data, detail):
+    """
+    Mark the match (or coupon) from `detail` as bet and append the detail
+    to today's .jsonl ledger right away (fsynced, via save_bets_data),
+    after adding its ids to the dedup index.
+    """
+    with BETS_LOCK:
+        if detail.get("match_id"):
+            bets_data["betted_matches"].add(detail["match_id"])
+        if detail.get("coupon_id"):
+            bets_data["betted_coupons"].add(detail["coupon_id"])
+        bets_data["bets_details"].append(detail)
+        save_bets_data(bets_data, detail.get("sport", "").upper())
 
 def get_balance(driver):
+    """
+    The balance shown on the page, or None when it could not be read
+    (0.0 is a real, empty balance).
+    """
     try:
-        balance_el = driver.find_element(
-            By.CSS_SELECTOR, 
-            "sts-shared-icon-button-deposit-info .icon-button-deposit-info__amount"
-        )
+        balance_el = driver.find_element(By.CSS_SELECTOR, BALANCE_SELECTOR)
         raw_text = balance_el.text.strip()
         cleaned_text = raw_text.replace("zł", "").replace("\xa0", "").strip()
         cleaned_text = cleaned_text.replace(",", ".")
         return float(cleaned_text)
     except NoSuchElementException:
-        print("Could not find deposit info element. Returning 0.0.")
-        return 0.0
+        print("Could not find deposit info element.")
+        return None
     except ValueError:
-        print("Error parsing balance text. Returning 0.0.")
-        return 0.0
+        print("Error parsing balance text.")
+        return None
     except Exception as e:
         print(f"Unexpected error reading balance: {e}")
-        return 0.0
+        return None
 
 def clear_basket(driver):
     try:
@@ -85,16 +225,18 @@ def clear_basket(driver):
         print(f"Error clicking menu button: {e}")
         return
 
-    time.sleep(1)
+    clear_button = wait_for_element(
+        driver,
+        "bb-ticket-menu-item[data-cy='ticket-header-menu-clear'] button.ticket-menu-item",
+        "ticket_menu",
+        clickable=True
+    )
+    if clear_button is None:
+        print("No 'Wyczyść kupon' button found.")
+        return
 
     try:
-        clear_button = driver.find_element(
-            By.CSS_SELECTOR, 
-            "bb-ticket-menu-item[data-cy='ticket-header-menu-clear'] button.ticket-menu-item"
-        )
         clear_button.click()
         print("Basket cleared (Wyczyść kupon).")
-    except NoSuchElementException:
-        print("No 'Wyczyść kupon' button found.")
     except Exception as e:
         print(f"Error clearing the basket: {e}")
@@ -0,0 +1,133 @@
+# common/browser.py
+
+import os
+import re
+import json
+import subprocess
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+from common.lean import LeanStats, lean_options, apply_blocking
+from common.odds_feed import PERFORMANCE_LOG_PREFS
+
+# Where the last resolved chromedriver is remembered between runs
+DRIVER_CACHE_FILE = os.path.join(os.path.dirname(__file__), "drivers", "chromedriver.json")
+
+CHROME_BINARIES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+)
+
+def binary_major_version(binary):
+    """
+    Major version from `<binary> --version` (Chrome or chromedriver), or None.
+    """
+    try:
+        output = subprocess.run(
+            [binary, "--version"], capture_output=True, text=True, timeout=10
+        ).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"(\d+)\.\d+\.\d+", output)
+    return int(match.group(1)) if match else None
+
+def installed_chrome_version():
+    """
+    Major version of the local Chrome (CHROME_BINARY first), or None if not found.
+    """
+    binaries = (os.getenv("CHROME_BINARY"),) + CHROME_BINARIES
+    for binary in binaries:
+        if binary:
+            version = binary_major_version(binary)
+            if version is not None:
+                return version
+    return None
+
+def read_driver_cache():
+    try:
+        with open(DRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def write_driver_cache(driver_path, chrome_version):
+    os.makedirs(os.path.dirname(DRIVER_CACHE_FILE), exist_ok=True)
+    tmp_path = DRIVER_CACHE_FILE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"driver_path": driver_path, "chrome_version": chrome_version}, f)
+    os.replace(tmp_path, DRIVER_CACHE_FILE)
+
+def resolve_driver_path():
+    """
+    chromedriver to use, touching the network only when there is no usable
+    local one:
+      1) CHROMEDRIVER_PATH (pinned, used as is),
+      2) the cached path, if its major version matches the installed Chrome,
+      3) ChromeDriverManager().install(), then cached,
+      4) the cached path even on a version mismatch, if the download failed.
+    """
+    pinned = os.getenv("CHROMEDRIVER_PATH")
+    if pinned:
+        return pinned
+
+    chrome_version = installed_chrome_version()
+    cached_path = read_driver_cache().get("driver_path")
+    if cached_path and os.path.exists(cached_path):
+        driver_version = binary_major_version(cached_path)
+        if chrome_version is None or driver_version == chrome_version:
+            return cached_path
+        print(f"[BROWSER] Cached chromedriver {driver_version} does not match Chrome {chrome_version}.")
+
+    try:
+        driver_path = ChromeDriverManager().install()
+    except Exception as e:
+        if cached_path and os.path.exists(cached_path):
+            print(f"[BROWSER] chromedriver download failed ({e}), using cached {cached_path}.")
+            return cached_path
+        raise
+
+    write_driver_cache(driver_path, chrome_version)
+    return driver_path
+
+def create_driver(driver_path=None, capture_network=False, profile_dir=None, lean=False):
+    """
+    Start a Chrome session with the options the bot always uses.
+    Pass `driver_path` to reuse an already-installed chromedriver
+    (e.g. when starting one driver per sport).
+    capture_network=True turns on the DevTools performance log that
+    common.odds_feed reads.
+    profile_dir keeps cookies/local storage between runs (see common.session).
+    lean=True runs headless and blocks images, fonts and trackers
+    (common.lean); unless the odds feed owns the performance log, every
+    page load is then summarised by common.lean.report_page.
+    """
+    if driver_path is None:
+        driver_path = resolve_driver_path()
+
+    options = Options()
+    if os.getenv("CHROME_BINARY"):
+        options.binary_location = os.getenv("CHROME_BINARY")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+    if lean:
+        lean_options(options)
+    if capture_network or lean:
+        options.set_capability("goog:loggingPrefs", PERFORMANCE_LOG_PREFS)
+
+    driver = webdriver.Chrome(service=Service(driver_path), options=options)
+    # whoever reads the performance log checks this first
+    driver.capture_network = capture_network
+    if lean:
+        driver.lean_patterns = apply_blocking(driver)
+        if not capture_network:
+            driver.lean_stats = LeanStats()
+    return driver
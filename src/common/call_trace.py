@@ -0,0 +1,162 @@
+# common/call_trace.py
+
+import os
+import sys
+import time
+
+from selenium.webdriver.remote.webelement import WebElement
+
+# Every WebElement call (find_element on an element, .text, get_attribute,
+# click, ...) goes through its parent driver's execute(), so wrapping that
+# one method sees all round-trips of the driver and of its elements.
+ELEMENT_KEYS = ("element-6066-11e4-a52f-4a3f8a5b5e6f", "ELEMENT")
+
+COMMAND_NAMES = {
+    "findElement": "find_element",
+    "findElements": "find_elements",
+    "findChildElement": "find_element",
+    "findChildElements": "find_elements",
+    "getElementText": "text",
+    "getElementAttribute": "get_attribute",
+    "getElementProperty": "get_property",
+    "clickElement": "click",
+    "clearElement": "clear",
+    "sendKeysToElement": "send_keys",
+    "isElementEnabled": "is_enabled",
+    "isElementSelected": "is_selected",
+    "executeScript": "execute_script",
+    "executeAsyncScript": "execute_async_script",
+    "get": "get",
+}
+
+# Element ids are forgotten past this many (pages re-render every cycle)
+MAX_REMEMBERED = 20000
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+THIS_FILE = os.path.abspath(__file__)
+
+def element_id(value):
+    """
+    Element id of a WebElement (driver.execute unwraps responses into
+    WebElements) or of a raw W3C element reference.
+    """
+    if isinstance(value, WebElement):
+        return value.id
+    if isinstance(value, dict):
+        for key in ELEMENT_KEYS:
+            if key in value:
+                return value[key]
+    return None
+
+def call_site():
+    """
+    "sports/football.py:71 scrape_football_matches" for the innermost frame
+    in our own code (selenium and this module are skipped).
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = os.path.abspath(frame.f_code.co_filename)
+        if path.startswith(SRC_DIR) and path != THIS_FILE and "site-packages" not in path:
+            return f"{os.path.relpath(path, SRC_DIR)}:{frame.f_lineno} {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "?"
+
+class CallTracker:
+    """
+    Counts and times every WebDriver command by (call, selector, call site).
+    Elements remember the selector they were found with, so e.g. `.text`
+    on a team name is reported as text / ".match-tile-scoreboard-team__name span".
+    """
+
+    def __init__(self, top_n=15):
+        self.top_n = top_n
+        self.selectors = {}
+        self.stats = {}
+
+    def describe(self, command, params):
+        op = COMMAND_NAMES.get(command, command)
+        params = params or {}
+
+        if command in ("findElement", "findElements", "findChildElement", "findChildElements"):
+            selector = params.get("value", "")
+            parent = self.selectors.get(params.get("id"))
+            return op, f"{parent} >> {selector}" if parent else selector
+
+        if command in ("executeScript", "executeAsyncScript"):
+            script = params.get("script", "").strip()
+            args = params.get("args") or []
+            if script.startswith("/*"):
+                # get_attribute / is_displayed are shipped as atoms: "/* getAttribute */..."
+                op = script[2:script.index("*/")].strip() if "*/" in script else op
+                target = self.selectors.get(element_id(args[0]) if args else None, "")
+                return op, target
+            return op, " ".join(script.split())[:60]
+
+        if command == "get":
+            return op, params.get("url", "")
+
+        return op, self.selectors.get(params.get("id"), "")
+
+    def remember(self, selector, response):
+        if len(self.selectors) > MAX_REMEMBERED:
+            self.selectors = {}
+        value = (response or {}).get("value")
+        if isinstance(value, list):
+            for item in value:
+                ref = element_id(item)
+                if ref:
+                    self.selectors[ref] = selector
+        else:
+            ref = element_id(value)
+            if ref:
+                self.selectors[ref] = selector
+
+    def record(self, key, seconds):
+        count, total = self.stats.get(key, (0, 0.0))
+        self.stats[key] = (count + 1, total + seconds)
+
+    def report(self, label=""):
+        """
+        Print the top_n entries by total time since the last report, then reset.
+        """
+        top_n = self.top_n
+        if not self.stats:
+            return
+        calls = sum(count for count, _ in self.stats.values())
+        total = sum(seconds for _, seconds in self.stats.values())
+        print(f"[CALLS]{' ' + label if label else ''} {calls} WebDriver calls, {total * 1000:.0f} ms total. Top {top_n}:")
+        ranked = sorted(self.stats.items(), key=lambda item: item[1][1], reverse=True)
+        for (op, selector, site), (count, seconds) in ranked[:top_n]:
+            print(f"  {seconds * 1000:>8.0f} ms {count:>6}x  {op:<16} {selector[:60]:<60}  {site}")
+        self.stats = {}
+
+def trace_driver_calls(driver, top_n=15):
+    """
+    Opt-in: wrap driver.execute with a CallTracker (driver.call_tracker).
+    """
+    tracker = CallTracker(top_n)
+    original_execute = driver.execute
+
+    def traced_execute(driver_command, params=None):
+        op, selector = tracker.describe(driver_command, params)
+        site = call_site()
+        start = time.perf_counter()
+        try:
+            response = original_execute(driver_command, params)
+        finally:
+            tracker.record((op, selector, site), time.perf_counter() - start)
+        if driver_command.startswith("find"):
+            tracker.remember(selector, response)
+        return response
+
+    driver.execute = traced_execute
+    driver.call_tracker = tracker
+    return tracker
+
+def report_calls(driver, label=""):
+    """
+    Print the driver's call report if tracing is on; no-op otherwise.
+    """
+    tracker = getattr(driver, "call_tracker", None)
+    if tracker is not None:
+        tracker.report(label)
@@ -0,0 +1,83 @@
+# common/coupon_feed.py
+
+import json
+import time
+
+from common.odds_feed import first_key, walk_objects, read_network_payloads
+from common.waits import TIMEOUTS, POLL_FREQUENCY
+
+# Response schema is site-specific (see common.odds_feed). Any JSON object
+# with one of the id keys and a list of legs is read as a coupon.
+COUPON_FIELDS = {
+    "coupon_id": ("couponCode", "couponId", "coupon_id", "shareCode", "code", "ticketId"),
+    "legs": ("legs", "bets", "selections", "events", "items"),
+}
+LEG_FIELDS = {
+    "event": ("eventName", "event", "matchName", "match", "name"),
+    "market": ("marketName", "market", "betType"),
+    "selection": ("selectionName", "selection", "outcome", "pick"),
+    "odd": ("odds", "odd", "price", "value"),
+}
+
+# Only bodies from these URL fragments are pulled
+COUPON_URL_PATTERNS = ("/coupon", "/inspiration", "/profile")
+
+def leg_from_object(obj):
+    leg = {}
+    for field, keys in LEG_FIELDS.items():
+        value = first_key(obj, keys)
+        if isinstance(value, dict):
+            value = first_key(value, ("name", "value", "label"))
+        if value is not None and not isinstance(value, (dict, list)):
+            leg[field] = value
+    return leg
+
+def decode_coupons(payload):
+    """
+    [{"coupon_id", "legs": [{"event", "market", "selection", "odd"}, ...]}]
+    in response order.
+    """
+    try:
+        decoded = json.loads(payload)
+    except ValueError:
+        return []
+    coupons = []
+    for obj in walk_objects(decoded):
+        coupon_id = first_key(obj, COUPON_FIELDS["coupon_id"])
+        legs = first_key(obj, COUPON_FIELDS["legs"])
+        if coupon_id is None or isinstance(coupon_id, (dict, list)) or not isinstance(legs, list):
+            continue
+        legs = [leg_from_object(leg) for leg in legs if isinstance(leg, dict)]
+        if legs:
+            coupons.append({"coupon_id": str(coupon_id).strip(), "legs": legs})
+    return coupons
+
+def drain_coupon_log(driver):
+    """
+    Drop everything logged so far (call right before opening a profile).
+    """
+    read_network_payloads(driver, set(), ())
+
+def collect_coupons(driver, expected=None, timeout=None):
+    """
+    Coupons of the profile just opened, from its network responses:
+    [(page, coupon_id, legs)], page numbered in response order (a guess at
+    the pagination index: the bettor checks the coupon id). Waits up to
+    `timeout` (default: the coupon_page wait) until `expected` coupons have
+    arrived (any, when None); fewer are returned on timeout, so callers
+    compare. Needs a driver started with capture_network=True.
+    """
+    timeout = TIMEOUTS["coupon_page"] if timeout is None else timeout
+    pending = set()
+    coupons = {}
+    end = time.monotonic() + timeout
+    while True:
+        for payload in read_network_payloads(driver, pending, COUPON_URL_PATTERNS):
+            for coupon in decode_coupons(payload):
+                coupons.setdefault(coupon["coupon_id"], coupon["legs"])
+        # profiles can load their coupons in several responses
+        enough = len(coupons) >= expected if expected else bool(coupons)
+        if (enough and not pending) or time.monotonic() >= end:
+            break
+        time.sleep(POLL_FREQUENCY)
+    return [(page, coupon_id, legs) for page, (coupon_id, legs) in enumerate(coupons.items(), start=1)]
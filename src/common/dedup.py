@@ -0,0 +1,95 @@
+# common/dedup.py
+
+import os
+import time
+
+# Every match/coupon id ever bet, across days: "<day>\t<kind>\t<id>" per line
+# (plain text rather than JSON: it is read at every startup)
+DEDUP_INDEX_FILE = os.path.join(os.path.dirname(__file__), "db", "dedup_index.tsv")
+# Ids older than this are dropped (a match never runs that long; coupons
+# go stale well before)
+RETENTION_DAYS = 30
+
+KINDS = ("match", "coupon")
+
+def day_str(now=None):
+    return time.strftime("%Y-%m-%d", time.localtime(now))
+
+def cutoff_day(retention_days=RETENTION_DAYS, now=None):
+    now = time.time() if now is None else now
+    return day_str(now - retention_days * 86400)
+
+def append_lines(path, lines):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("".join(lines))
+        f.flush()
+        os.fsync(f.fileno())
+
+class DedupIndex:
+    """
+    Persistent set of bet match_ids and coupon_ids spanning days, so a
+    restart after midnight still knows what was bet yesterday. The daily
+    bets_data files stay as reports; dedup only looks here.
+    Append-only and fsynced like common.ledger (a torn last line is cut off
+    on load); membership is a set lookup. load() compacts the file when
+    most of it has expired.
+    """
+
+    def __init__(self, path=DEDUP_INDEX_FILE, retention_days=RETENTION_DAYS):
+        self.path = path
+        self.retention_days = retention_days
+        self.ids = {kind: {} for kind in KINDS}
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        if raw and not raw.endswith(b"\n"):
+            cut = raw.rfind(b"\n") + 1
+            print(f"[DEDUP] Dropping torn last line in {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(cut)
+            raw = raw[:cut]
+
+        cutoff = cutoff_day(self.retention_days)
+        lines = raw.decode("utf-8", errors="replace").splitlines()
+        for line in lines:
+            parts = line.split("\t", 2)
+            if len(parts) == 3 and parts[1] in self.ids and parts[0] >= cutoff:
+                # lines are in day order: the last one per id wins
+                self.ids[parts[1]][parts[2]] = parts[0]
+        if len(lines) > 2 * sum(len(ids) for ids in self.ids.values()):
+            self.compact()
+        return self
+
+    def compact(self):
+        tmp_path = self.path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        entries = sorted(
+            (day, kind, id_) for kind in KINDS for id_, day in self.ids[kind].items()
+        )
+        append_lines(tmp_path, [f"{day}\t{kind}\t{id_}\n" for (day, kind, id_) in entries])
+        os.replace(tmp_path, self.path)
+
+    def matches(self):
+        return set(self.ids["match"])
+
+    def coupons(self):
+        return set(self.ids["coupon"])
+
+    def add(self, kind, ids, day=None):
+        """
+        Persist ids not in the index yet; returns how many were new.
+        """
+        day = day or day_str()
+        new = [str(id_) for id_ in dict.fromkeys(ids) if str(id_) not in self.ids[kind]]
+        if not new:
+            return 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        append_lines(self.path, [f"{day}\t{kind}\t{id_}\n" for id_ in new])
+        for id_ in new:
+            self.ids[kind][id_] = day
+        return len(new)
@@ -0,0 +1,186 @@
+# common/lean.py
+
+import os
+import json
+import fnmatch
+
+# Chrome-side blocking only takes URL patterns (Network.setBlockedURLs, "*"
+# wildcards), so resource types are blocked by their usual file extensions.
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "media": ["*.mp4*", "*.webm*", "*.mp3*", "*.m3u8*"],
+}
+
+# Analytics / marketing hosts the bot never needs. Cookiebot stays allowed:
+# login_sts clicks its banner.
+THIRD_PARTY_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*googleadservices.com*",
+    "*doubleclick.net*",
+    "*connect.facebook.net*",
+    "*facebook.com/tr*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*criteo.*",
+    "*tiktok.com*",
+    "*snapchat.com*",
+    "*bing.com/bat*",
+    "*onesignal.com*",
+]
+
+DEFAULT_BLOCKED_TYPES = ("image", "font", "media")
+
+# Full (not lean) load of each page, {page: {"requests", "bytes"}}, written
+# by benchmarks/lean_bench.py. Blocked requests never transfer, so the bytes
+# lean mode saves are only known against this baseline.
+LEAN_BASELINE_FILE = os.path.join(os.path.dirname(__file__), "db", "lean_baseline.json")
+
+def load_baseline(path=LEAN_BASELINE_FILE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_baseline(pages, path=LEAN_BASELINE_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(pages, f, indent=2)
+
+def blocked_url_patterns(deny=None, allow=None):
+    """
+    URL patterns for Network.setBlockedURLs.
+    deny: extra patterns or resource type names (STS_LEAN_DENY, comma-separated)
+    allow: patterns or resource type names to keep loading (STS_LEAN_ALLOW);
+           a deny pattern is dropped if an allow entry matches it.
+    """
+    if deny is None:
+        deny = env_list("STS_LEAN_DENY")
+    if allow is None:
+        allow = env_list("STS_LEAN_ALLOW")
+
+    entries = list(DEFAULT_BLOCKED_TYPES) + THIRD_PARTY_PATTERNS + list(deny)
+    patterns = []
+    for entry in entries:
+        if entry in allow:
+            continue
+        patterns.extend(RESOURCE_TYPE_PATTERNS.get(entry, [entry]))
+
+    return [
+        p for p in dict.fromkeys(patterns)
+        if not any(p == a or fnmatch.fnmatch(p.strip("*"), a) for a in allow)
+    ]
+
+def env_list(name):
+    return [item.strip() for item in (os.getenv(name) or "").split(",") if item.strip()]
+
+def lean_options(options):
+    """
+    Headless, no images, no background chatter. Applied by create_driver(lean=True).
+    """
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--disable-component-update")
+    options.add_argument("--disable-default-apps")
+    options.add_argument("--disable-sync")
+
+def apply_blocking(driver, patterns=None):
+    """
+    Block `patterns` for this tab through the DevTools Protocol.
+    Must be repeated for every new tab/window.
+    """
+    if patterns is None:
+        patterns = blocked_url_patterns()
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+class LeanStats:
+    """
+    Per-page network totals from Chrome's performance log: requests sent,
+    requests blocked (by resource type) and bytes actually transferred.
+    What lean mode saved is reported too: the blocked requests, and bytes
+    against the page's full load in LEAN_BASELINE_FILE (only for reports
+    that include a navigation, i.e. a whole page load).
+    The performance log is drained on read, so this is only used when the
+    odds feed (which reads the same log) is off.
+    """
+
+    def __init__(self, baseline=None):
+        self.baseline = load_baseline() if baseline is None else baseline
+        self.reset()
+
+    def reset(self):
+        self.types = {}
+        self.requests = 0
+        self.documents = 0
+        self.blocked = {}
+        self.bytes_loaded = 0
+
+    def observe(self, driver):
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+
+            if method == "Network.requestWillBeSent":
+                self.requests += 1
+                self.types[params.get("requestId")] = params.get("type", "Other")
+                if params.get("type") == "Document":
+                    self.documents += 1
+            elif method == "Network.loadingFinished":
+                self.bytes_loaded += int(params.get("encodedDataLength", 0))
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                kind = self.types.get(params.get("requestId"), params.get("type", "Other"))
+                self.blocked[kind] = self.blocked.get(kind, 0) + 1
+
+    def bytes_saved(self, page):
+        """
+        Bytes under the page's full-load baseline, None without a baseline
+        or a navigation since the last report.
+        """
+        full = self.baseline.get(page)
+        if not full or not self.documents:
+            return None
+        return max(0, int(full["bytes"]) - self.bytes_loaded)
+
+    def report(self, driver, page):
+        """
+        Print and return {requests, blocked, bytes_loaded, requests_saved,
+        bytes_saved} for everything since the last report, then start
+        counting afresh.
+        """
+        self.observe(driver)
+        blocked = sum(self.blocked.values())
+        by_type = ", ".join(f"{k} {v}" for k, v in sorted(self.blocked.items()))
+        saved = self.bytes_saved(page)
+        saved_text = f"{blocked} requests" + (f" / {saved / 1024:.0f} KB" if saved is not None else "")
+        print(f"[LEAN] {page}: {self.requests - blocked} requests / {self.bytes_loaded / 1024:.0f} KB loaded, "
+              f"{blocked} blocked ({by_type or 'none'}); saved {saved_text}")
+        result = {
+            "requests": self.requests,
+            "blocked": dict(self.blocked),
+            "bytes_loaded": self.bytes_loaded,
+            "requests_saved": blocked,
+            "bytes_saved": saved,
+        }
+        self.reset()
+        return result
+
+def report_page(driver, page):
+    """
+    LeanStats report for drivers started with create_driver(lean=True); no-op otherwise.
+    """
+    stats = getattr(driver, "lean_stats", None)
+    if stats is None:
+        return None
+    return stats.report(driver, page)
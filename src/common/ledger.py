@@ -0,0 +1,47 @@
+# common/ledger.py
+
+import os
+import json
+
+def append_records(path, records):
+    """
+    Append records as JSON lines and fsync, so a bet is on disk before we
+    move on. A crash can at worst leave one torn last line, which
+    replay_ledger drops.
+    """
+    if not records:
+        return
+    lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
+
+def replay_ledger(path):
+    """
+    Read every record from a ledger file. Lines that don't parse are skipped
+    one by one (instead of losing the whole file). A torn last line from a
+    crash mid-write is cut off so the next append starts on a clean line.
+    """
+    if not os.path.exists(path):
+        return []
+
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if raw and not raw.endswith(b"\n"):
+        cut = raw.rfind(b"\n") + 1
+        print(f"[LEDGER] Dropping torn last line in {path}")
+        with open(path, "r+b") as f:
+            f.truncate(cut)
+        raw = raw[:cut]
+
+    records = []
+    for line_no, line in enumerate(raw.decode("utf-8", errors="replace").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            print(f"[LEDGER] Skipping bad line {line_no} in {path}")
+    return records
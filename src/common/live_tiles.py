@@ -0,0 +1,210 @@
+# common/live_tiles.py
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException
+
+LIVE_TILE_SELECTOR = "div.collapsable-container bb-live-match-tile"
+
+# Reads one bb-live-match-tile into a plain object. The tile element itself
+# is returned too (Selenium turns it back into a WebElement), so the place_*
+# functions can still click inside match_el.
+READ_TILE_JS = """
+const readText = (el) => (el ? (el.innerText || el.textContent || "").trim() : "");
+const readTile = (tile) => {
+    const anchor = tile.querySelector("a");
+    const buttons = tile.querySelectorAll("sds-odds-button");
+    return {
+        el: tile,
+        data_cy: anchor ? anchor.getAttribute("data-cy") : null,
+        href: anchor ? anchor.href : null,
+        teams: Array.from(
+            tile.querySelectorAll(".match-tile-scoreboard-team__name span")
+        ).map(readText),
+        time_parts: Array.from(
+            tile.querySelectorAll(".live-match-tile-time-details__game-name")
+        ).map(readText).filter((t) => t),
+        partials: Array.from(
+            tile.querySelectorAll(".live-match-tile-scoreboard-score__partials div")
+        ).map(readText),
+        odds: Array.from(buttons).map(
+            (b) => readText(b.querySelector("[data-testid='odds-value']"))
+        ),
+        labels: Array.from(buttons).map(
+            (b) => readText(b.querySelector(".odds-button__label"))
+        ),
+    };
+};
+"""
+
+# One round-trip for the whole page
+EXTRACT_TILES_JS = READ_TILE_JS + """
+return Array.from(document.querySelectorAll(arguments[0])).map(readTile);
+"""
+
+def match_id_from_link(data_cy, href):
+    if data_cy and "/" in data_cy:
+        return data_cy.split("/")[-1]
+    if href and "/" in href:
+        return href.split("/")[-1]
+    return None
+
+def extract_live_tiles(driver):
+    """
+    Bulk mode: read every live tile on the current page with a single
+    execute_script. Returns a list of raw tile dicts:
+      {
+        "el": WebElement,
+        "match_id": str or None,
+        "teams": [str, ...],
+        "time_str": str,       # same " / " join as the per-element path
+        "partials": [str, ...],
+        "odds": [str, ...],    # raw odds-value texts, one per sds-odds-button
+        "labels": [str, ...]   # "1", "x", "2", ...
+      }
+    """
+    raw_tiles = driver.execute_script(EXTRACT_TILES_JS, LIVE_TILE_SELECTOR) or []
+    return [tile_from_js(raw) for raw in raw_tiles]
+
+def tile_from_js(raw):
+    """
+    Raw tile dict from one readTile() result.
+    """
+    return {
+        "el": raw["el"],
+        "match_id": match_id_from_link(raw.get("data_cy"), raw.get("href")),
+        "teams": raw.get("teams") or [],
+        "time_str": " / ".join(raw.get("time_parts") or []),
+        "partials": raw.get("partials") or [],
+        "odds": raw.get("odds") or [],
+        "labels": raw.get("labels") or [],
+    }
+
+def read_tile_header(match_el):
+    """
+    Per-element mode, cheap fields only: match_id and the clock.
+    Returns a raw tile dict with empty teams/partials/odds (see read_tile_details).
+    """
+    anchor = match_el.find_element(By.CSS_SELECTOR, "a")
+    data_cy = anchor.get_attribute("data-cy")
+    href = None if data_cy and "/" in data_cy else anchor.get_attribute("href")
+
+    time_elements = match_el.find_elements(By.CSS_SELECTOR, ".live-match-tile-time-details__game-name")
+    time_texts = [e.text for e in time_elements]
+    time_str = " / ".join(t for t in time_texts if t)
+
+    return {
+        "el": match_el,
+        "match_id": match_id_from_link(data_cy, href),
+        "teams": [],
+        "time_str": time_str,
+        "partials": [],
+        "odds": [],
+        "labels": [],
+    }
+
+def read_tile_details(tile, odds_count, with_partials=False):
+    """
+    Fill the expensive fields (team names, partials, odds) into a header tile.
+    Only the first `odds_count` odds are read (none if the tile has fewer
+    buttons) and labels are not read at all.
+    """
+    match_el = tile["el"]
+
+    team_elements = match_el.find_elements(By.CSS_SELECTOR, ".match-tile-scoreboard-team__name span")
+    tile["teams"] = [e.text.strip() for e in team_elements]
+
+    if with_partials:
+        partial_elements = match_el.find_elements(
+            By.CSS_SELECTOR, ".live-match-tile-scoreboard-score__partials div"
+        )
+        tile["partials"] = [p.text.strip() for p in partial_elements]
+
+    odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
+    if len(odds_buttons) >= odds_count:
+        tile["odds"] = [
+            btn.find_element(By.CSS_SELECTOR, "[data-testid='odds-value']").text
+            for btn in odds_buttons[:odds_count]
+        ]
+    return tile
+
+def read_tile_elements(match_el, odds_count, with_partials=False):
+    """
+    Per-element mode: build the same raw tile dict as extract_live_tiles,
+    one WebDriver call per field.
+    """
+    return read_tile_details(read_tile_header(match_el), odds_count, with_partials)
+
+def scrape_tiles_lazily(driver, name, info_from_tile, clock_fields, strategy, odds_count,
+                        with_partials=False, skip_ids=()):
+    """
+    Per-element mode that reads as little as possible:
+      1) match_id + clock of every tile,
+      2) drop tiles in `skip_ids` and tiles outside the strategy's time window
+         (its conditions on the clock_fields(time_str) keys, e.g. time_min >= 79),
+      3) teams/partials/odds only for the tiles left.
+    Returns [(match_el, match_info)] for those tiles only.
+    """
+    containers = driver.find_elements(By.CSS_SELECTOR, LIVE_TILE_SELECTOR)
+
+    headers = []
+    for match_el in containers:
+        try:
+            tile = read_tile_header(match_el)
+        except StaleElementReferenceException:
+            print(f"[{name}] Stale element, skipping.")
+            continue
+        except Exception as e:
+            print(f"[{name}] Error parsing match: {e}")
+            continue
+        if tile["match_id"] and tile["match_id"] not in skip_ids:
+            headers.append(tile)
+
+    in_window = strategy.conditions_hold([clock_fields(tile["time_str"]) for tile in headers])
+
+    matches_data = []
+    for tile, keep in zip(headers, in_window):
+        if not keep:
+            continue
+        try:
+            read_tile_details(tile, odds_count, with_partials)
+            matches_data.append((tile["el"], info_from_tile(tile)))
+        except StaleElementReferenceException:
+            print(f"[{name}] Stale element, skipping.")
+        except Exception as e:
+            print(f"[{name}] Error parsing match: {e}")
+
+    print(f"[{name}] {len(matches_data)}/{len(containers)} tiles read in full "
+          f"({len(containers) - len(headers)} already bet or unreadable).")
+    return matches_data
+
+def team_names(tile):
+    teams = tile["teams"]
+    if len(teams) == 2:
+        return teams[0], teams[1]
+    return "Unknown", "Unknown"
+
+def odds_strings(tile, count):
+    """
+    First `count` raw odds strings, or "0.00" for each if the tile has fewer buttons.
+    """
+    odds = tile["odds"]
+    if len(odds) >= count:
+        return odds[:count]
+    return ["0.00"] * count
+
+FIND_TILE_JS = """
+for (const tile of document.querySelectorAll(arguments[0])) {
+    const anchor = tile.querySelector("a");
+    if (!anchor) continue;
+    const dataCy = anchor.getAttribute("data-cy");
+    const ref = (dataCy && dataCy.includes("/")) ? dataCy : (anchor.href || "");
+    if (ref.split("/").pop() === arguments[1]) return tile;
+}
+return null;
+"""
+
+def find_tile_element(driver, match_id):
+    """
+    The bb-live-match-tile for `match_id` on the current page, or None.
+    """
+    return driver.execute_script(FIND_TILE_JS, LIVE_TILE_SELECTOR, match_id)
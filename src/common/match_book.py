@@ -0,0 +1,146 @@
+# common/match_book.py
+
+import time
+from array import array
+
+# Samples kept per match (oldest are overwritten)
+HISTORY_SIZE = 32
+# A match not seen on its page for this long has ended
+FORGET_SECONDS = 30 * 60
+# Hard cap per sport; the longest-unseen matches go first
+MAX_MATCHES = 3000
+# Window of the "<odds_key>_change" fields added by annotate()
+MOVEMENT_SECONDS = 5 * 60
+
+class MatchRecord:
+    """
+    One live match: its last scrape plus a ring buffer of
+    (timestamp, minute, odds) samples in flat arrays, so a record costs the
+    same after 14 hours as after 14 minutes.
+    """
+
+    __slots__ = ("match_id", "odds_keys", "last_seen", "head", "count", "times", "minutes", "odds")
+
+    def __init__(self, match_id, odds_keys, size=HISTORY_SIZE):
+        self.match_id = match_id
+        self.odds_keys = odds_keys
+        self.last_seen = 0.0
+        self.head = 0
+        self.count = 0
+        self.times = array("d", [0.0]) * size
+        self.minutes = array("f", [0.0]) * size
+        self.odds = array("d", [0.0]) * (size * len(odds_keys))
+
+    def last_index(self):
+        return (self.head - 1) % len(self.times)
+
+    def latest_odds(self):
+        if not self.count:
+            return None
+        k = len(self.odds_keys)
+        start = self.last_index() * k
+        return tuple(self.odds[start:start + k])
+
+    def add(self, now, minute, odds):
+        """
+        Store a sample if the minute or any odd moved since the last one.
+        """
+        self.last_seen = now
+        if self.count and self.minutes[self.last_index()] == minute and self.latest_odds() == tuple(odds):
+            return False
+        k = len(self.odds_keys)
+        self.times[self.head] = now
+        self.minutes[self.head] = minute
+        self.odds[self.head * k:(self.head + 1) * k] = array("d", odds)
+        self.head = (self.head + 1) % len(self.times)
+        self.count = min(self.count + 1, len(self.times))
+        return True
+
+    def samples(self):
+        """
+        [(timestamp, minute, {odds_key: odd}), ...], oldest first.
+        """
+        size = len(self.times)
+        k = len(self.odds_keys)
+        result = []
+        for n in range(self.count):
+            i = (self.head - self.count + n) % size
+            odds = dict(zip(self.odds_keys, self.odds[i * k:(i + 1) * k]))
+            result.append((self.times[i], self.minutes[i], odds))
+        return result
+
+    def odds_change(self, key, seconds=MOVEMENT_SECONDS, now=None):
+        """
+        Latest odd minus the oldest one sampled in the last `seconds`
+        (0.0 with fewer than two samples in the window, or a missing odd).
+        """
+        if self.count < 2:
+            return 0.0
+        now = time.time() if now is None else now
+        size = len(self.times)
+        k = len(self.odds_keys)
+        col = self.odds_keys.index(key)
+        latest = self.odds[self.last_index() * k + col]
+        oldest = latest
+        for n in range(1, self.count):
+            i = (self.head - 1 - n) % size
+            if now - self.times[i] > seconds:
+                break
+            oldest = self.odds[i * k + col]
+        if latest <= 0 or oldest <= 0:
+            return 0.0
+        return latest - oldest
+
+class MatchBook:
+    """
+    Per-sport MatchRecords keyed by match_id, fed with every scrape so the
+    previous cycles' odds are not lost. `minute` maps a match_info to the
+    game clock stored with each sample. Used by one scan thread at a time.
+    """
+
+    def __init__(self, odds_keys, minute, size=HISTORY_SIZE,
+                 forget_seconds=FORGET_SECONDS, max_matches=MAX_MATCHES):
+        self.odds_keys = tuple(odds_keys)
+        self.minute = minute
+        self.size = size
+        self.forget_seconds = forget_seconds
+        self.max_matches = max_matches
+        self.records = {}
+
+    def get(self, match_id):
+        return self.records.get(match_id)
+
+    def observe(self, infos, now=None):
+        now = time.time() if now is None else now
+        for info in infos:
+            match_id = info.get("match_id")
+            if not match_id or any(key not in info for key in self.odds_keys):
+                # no id, or a lazy-scrape record without odds
+                continue
+            record = self.records.get(match_id)
+            if record is None:
+                record = self.records[match_id] = MatchRecord(match_id, self.odds_keys, self.size)
+            record.add(now, self.minute(info), [info[key] for key in self.odds_keys])
+        self.forget(now)
+
+    def forget(self, now):
+        cutoff = now - self.forget_seconds
+        gone = [match_id for match_id, record in self.records.items() if record.last_seen < cutoff]
+        for match_id in gone:
+            del self.records[match_id]
+        if len(self.records) > self.max_matches:
+            by_age = sorted(self.records.values(), key=lambda record: record.last_seen)
+            for record in by_age[:len(self.records) - self.max_matches]:
+                del self.records[record.match_id]
+
+    def annotate(self, infos, seconds=MOVEMENT_SECONDS, now=None):
+        """
+        Add "<odds_key>_change" to every match_info (see MatchRecord.odds_change),
+        so Strategy conditions can use odds movement, e.g.
+        ("odd_home_change", "<", -0.1).
+        """
+        now = time.time() if now is None else now
+        for info in infos:
+            record = self.records.get(info.get("match_id"))
+            for key in self.odds_keys:
+                info[f"{key}_change"] = record.odds_change(key, seconds, now) if record else 0.0
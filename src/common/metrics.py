@@ -0,0 +1,153 @@
+# common/metrics.py
+
+import os
+import time
+import threading
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Shared by every metric: sport workers update them from several threads
+METRICS_LOCK = threading.Lock()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def format_labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{escape_label(v)}"' for n, v in zip(names, values)) + "}"
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values = {}
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with METRICS_LOCK:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{format_labels(self.label_names, key)} {value}")
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # key -> [bucket counts..., +Inf count, sum]
+        self.values = {}
+
+    def observe(self, seconds, **labels):
+        key = tuple(labels.get(n, "") for n in self.label_names)
+        with METRICS_LOCK:
+            series = self.values.get(key)
+            if series is None:
+                series = self.values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series[i] += 1
+            series[len(self.buckets)] += 1
+            series[-1] += seconds
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        names = self.label_names + ("le",)
+        for key, series in sorted(self.values.items()):
+            for bound, count in zip(self.buckets, series):
+                lines.append(f"{self.name}_bucket{format_labels(names, key + (bound,))} {count}")
+            count = series[len(self.buckets)]
+            lines.append(f"{self.name}_bucket{format_labels(names, key + ('+Inf',))} {count}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, key)} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, key)} {count}")
+        return lines
+
+PHASE_SECONDS = Histogram(
+    "sts_phase_seconds",
+    "Time spent per phase (navigate, scrape, pick, place, clear_basket, get_balance, save_bets_data).",
+    ("phase", "sport")
+)
+TILES_SCRAPED = Counter("sts_tiles_scraped_total", "Live tiles read.", ("sport",))
+CANDIDATES = Counter("sts_candidates_total", "Matches the strategy picked.", ("sport",))
+BETS_PLACED = Counter("sts_bets_placed_total", "Bets recorded as placed.", ("sport",))
+TICKET_RESULTS = Counter("sts_ticket_results_total", "Ticket outcomes by status.", ("status",))
+CYCLES = Counter("sts_cycles_total", "Completed scan passes.", ("sport",))
+SCAN_FAILURES = Counter("sts_scan_failures_total", "Scan cycles that failed or timed out.", ("sport", "kind"))
+BALANCE_READS = Counter("sts_balance_reads_total", "Balance reads from the page: ok, drift or failed.", ("result",))
+
+ALL_METRICS = [
+    PHASE_SECONDS, TILES_SCRAPED, CANDIDATES, BETS_PLACED, TICKET_RESULTS, CYCLES, SCAN_FAILURES, BALANCE_READS
+]
+
+@contextmanager
+def timed(phase, sport=""):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_SECONDS.observe(time.perf_counter() - start, phase=phase, sport=sport)
+
+def render_metrics():
+    with METRICS_LOCK:
+        lines = []
+        for metric in ALL_METRICS:
+            lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def write_metrics_file(path):
+    """
+    Atomic write, so a node_exporter textfile collector never reads half a file.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_metrics())
+    os.replace(tmp_path, path)
+
+def start_metrics_export(path=None, port=None, interval=15):
+    """
+    Export the metrics as Prometheus text: rewrite `path` every `interval`
+    seconds and/or serve them on http://127.0.0.1:<port>/metrics.
+    Both run in daemon threads.
+    """
+    if path:
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+
+        def write_loop():
+            while True:
+                try:
+                    write_metrics_file(path)
+                except OSError as e:
+                    print(f"[METRICS] Could not write {path}: {e}")
+                time.sleep(interval)
+
+        threading.Thread(target=write_loop, name="metrics-file", daemon=True).start()
+        print(f"[METRICS] Writing {path} every {interval}s.")
+
+    if port:
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render_metrics().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+        print(f"[METRICS] Serving http://127.0.0.1:{port}/metrics")
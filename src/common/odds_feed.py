@@ -0,0 +1,226 @@
+# common/odds_feed.py
+
+import json
+import time
+
+from common.live_tiles import extract_live_tiles
+
+# Chrome writes DevTools Network events into the "performance" log when the
+# driver is started with this capability (see create_driver(capture_network=True)).
+PERFORMANCE_LOG_PREFS = {"performance": "ALL"}
+
+# Frame schema is site-specific. Any JSON object in a frame that has one of
+# MATCH_ID_KEYS plus at least one of the other fields is read as a tile update.
+FRAME_FIELDS = {
+    "match_id": ("matchId", "match_id", "eventId", "event_id"),
+    "time_str": ("time_str", "time", "clock", "gameTime"),
+    "teams": ("teams", "participants", "competitors"),
+    "home": ("home", "homeTeam", "team_home"),
+    "away": ("away", "awayTeam", "team_away"),
+    "partials": ("partials", "periodScores", "sets"),
+    "odds": ("odds", "selections", "outcomes"),
+}
+ODDS_VALUE_KEYS = ("value", "odds", "price", "odd")
+ODDS_LABEL_KEYS = ("label", "name", "shortName")
+NAME_KEYS = ("name", "shortName", "label")
+
+# Only XHR/fetch bodies from these URL fragments are pulled (one CDP call each)
+XHR_URL_PATTERNS = ("/live", "/odds", "/event")
+
+# Fall back to the DOM when no frame updated the table for this long
+FRAME_STALE_SECONDS = 30
+# Full DOM resync at least this often even while frames keep coming
+RESYNC_SECONDS = 300
+
+def first_key(obj, keys):
+    for key in keys:
+        if key in obj and obj[key] is not None:
+            return obj[key]
+    return None
+
+def as_name(value):
+    if isinstance(value, dict):
+        value = first_key(value, NAME_KEYS)
+    return "" if value is None else str(value).strip()
+
+def decode_odds(raw_odds):
+    odds = []
+    labels = []
+    for item in raw_odds:
+        if isinstance(item, dict):
+            value = first_key(item, ODDS_VALUE_KEYS)
+            label = first_key(item, ODDS_LABEL_KEYS)
+        else:
+            value, label = item, None
+        odds.append("" if value is None else str(value))
+        labels.append("" if label is None else str(label))
+    return odds, labels
+
+def tile_update_from_object(obj):
+    """
+    Partial raw tile (same keys as common.live_tiles) from one decoded
+    JSON object, or None if it doesn't describe a match.
+    """
+    match_id = first_key(obj, FRAME_FIELDS["match_id"])
+    if match_id is None:
+        return None
+
+    update = {"match_id": str(match_id)}
+
+    time_str = first_key(obj, FRAME_FIELDS["time_str"])
+    if time_str is not None:
+        update["time_str"] = str(time_str)
+
+    teams = first_key(obj, FRAME_FIELDS["teams"])
+    home = first_key(obj, FRAME_FIELDS["home"])
+    away = first_key(obj, FRAME_FIELDS["away"])
+    if isinstance(teams, list):
+        update["teams"] = [as_name(t) for t in teams]
+    elif home is not None and away is not None:
+        update["teams"] = [as_name(home), as_name(away)]
+
+    partials = first_key(obj, FRAME_FIELDS["partials"])
+    if isinstance(partials, list):
+        update["partials"] = [str(p) for p in partials]
+
+    raw_odds = first_key(obj, FRAME_FIELDS["odds"])
+    if isinstance(raw_odds, list):
+        update["odds"], update["labels"] = decode_odds(raw_odds)
+
+    if len(update) == 1:
+        return None
+    return update
+
+def walk_objects(value):
+    if isinstance(value, dict):
+        yield value
+        for child in value.values():
+            yield from walk_objects(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from walk_objects(child)
+
+def decode_payload(payload):
+    """
+    All tile updates found in one websocket frame / XHR body.
+    Handles plain JSON, SignalR (\\x1e-separated) and socket.io ("42[...]").
+    """
+    updates = []
+    for chunk in payload.split("\x1e"):
+        chunk = chunk.strip().lstrip("0123456789")
+        if not chunk or chunk[0] not in "[{":
+            continue
+        try:
+            decoded = json.loads(chunk)
+        except ValueError:
+            continue
+        for obj in walk_objects(decoded):
+            update = tile_update_from_object(obj)
+            if update:
+                updates.append(update)
+    return updates
+
+def read_network_payloads(driver, pending_xhr, url_patterns=XHR_URL_PATTERNS):
+    """
+    Drain Chrome's performance log: websocket text frames, plus JSON
+    XHR/fetch bodies whose URL matches one of url_patterns.
+    `pending_xhr` carries requestIds between calls until loading finishes.
+    """
+    payloads = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+
+        if method == "Network.webSocketFrameReceived":
+            response = params.get("response", {})
+            if response.get("opcode") == 1:
+                payloads.append(response.get("payloadData", ""))
+
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            if (params.get("type") in ("XHR", "Fetch")
+                    and "json" in response.get("mimeType", "")
+                    and any(p in response.get("url", "") for p in url_patterns)):
+                pending_xhr.add(params.get("requestId"))
+
+        elif method == "Network.loadingFinished":
+            request_id = params.get("requestId")
+            if request_id in pending_xhr:
+                pending_xhr.discard(request_id)
+                try:
+                    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                    payloads.append(body.get("body", ""))
+                except Exception as e:
+                    print(f"[FEED] Could not read XHR body => {e}")
+    return payloads
+
+class LiveOddsFeed:
+    """
+    In-memory live odds table for one sport page, kept up to date from the
+    page's own network traffic between DOM reads.
+    - resync(driver): bulk-read the DOM and reset the table.
+    - drain(driver): apply every frame received since the last call.
+    - read(driver, navigate): the above as one step for scan_sport.
+    - matches(): [(None, match_info)] built with the sport's *_info_from_tile,
+      i.e. the same records the scrapers produce (match_el is looked up only
+      when a bet is actually placed).
+    """
+
+    def __init__(self, info_from_tile):
+        self.info_from_tile = info_from_tile
+        self.tiles = {}
+        self.pending_xhr = set()
+        self.synced_at = 0.0
+        self.frame_at = 0.0
+        self.frames_applied = 0
+
+    def resync(self, driver):
+        tiles = extract_live_tiles(driver)
+        # frames queued before this read are older than the DOM we just got
+        read_network_payloads(driver, self.pending_xhr)
+        self.tiles = {}
+        for tile in tiles:
+            if tile["match_id"]:
+                self.tiles[tile["match_id"]] = {k: v for k, v in tile.items() if k != "el"}
+        self.synced_at = time.time()
+        self.frame_at = 0.0
+        return [(tile["el"], self.info_from_tile(tile)) for tile in tiles]
+
+    def drain(self, driver):
+        applied = 0
+        for payload in read_network_payloads(driver, self.pending_xhr):
+            for update in decode_payload(payload):
+                tile = self.tiles.get(update["match_id"])
+                if tile is None:
+                    # a match we have never seen in the DOM: wait for the next resync
+                    continue
+                tile.update(update)
+                applied += 1
+        if applied:
+            self.frame_at = time.time()
+            self.frames_applied += applied
+        return applied
+
+    def read(self, driver, navigate):
+        self.drain(driver)
+        if self.is_fresh():
+            matches = self.matches()
+            print(f"[FEED] {len(matches)} matches from the odds feed (no page reload).")
+            return matches
+        navigate(driver)
+        return self.resync(driver)
+
+    def is_fresh(self):
+        now = time.time()
+        return (
+            bool(self.tiles)
+            and now - self.synced_at < RESYNC_SECONDS
+            and now - self.frame_at < FRAME_STALE_SECONDS
+        )
+
+    def matches(self):
+        return [(None, self.info_from_tile(tile)) for tile in self.tiles.values()]
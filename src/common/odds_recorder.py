@@ -0,0 +1,238 @@
+# common/odds_recorder.py
+
+import os
+import json
+import time
+import queue
+import threading
+
+import numpy as np
+
+# <ODDS_DIR>/<YYYY-MM-DD>/<SPORT>/meta.json + one raw file per column
+ODDS_DIR = os.path.join(os.path.dirname(__file__), "db", "odds")
+
+FLUSH_SECONDS = 10
+# Flush earlier once this many rows are waiting
+BATCH_ROWS = 5000
+
+# Always present; every other numeric match_info field becomes a float64 column
+BASE_COLUMNS = {"ts": "<f8", "match_id": "S24"}
+VALUE_DTYPE = "<f8"
+# The scoreboard partials (match_info["partials"]) go to partial_0..partial_<n-1>,
+# NaN where a tile shows fewer (5 sets x 2 players covers every sport)
+MAX_PARTIALS = 10
+
+def partial_columns():
+    return [f"partial_{i}" for i in range(MAX_PARTIALS)]
+
+def value_columns(info):
+    """
+    Numeric match_info fields recorded for a sport: clock, partials, odds.
+    Derived "*_change" fields (common.match_book) are left out.
+    """
+    columns = sorted(
+        key for key, value in info.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and not key.endswith("_change")
+    )
+    if "partials" in info:
+        columns += partial_columns()
+    return columns
+
+def parse_partial(text):
+    try:
+        return float(str(text).strip())
+    except ValueError:
+        return np.nan
+
+def row_values(info, names):
+    """
+    One row of a segment's value columns from a match_info.
+    """
+    partials = info.get("partials") or []
+    values = []
+    for name in names:
+        if name.startswith("partial_") and name not in info:
+            i = int(name[len("partial_"):])
+            values.append(parse_partial(partials[i]) if i < len(partials) else np.nan)
+        else:
+            values.append(info.get(name, np.nan))
+    return tuple(values)
+
+def segment_dir(sport, day, root=ODDS_DIR):
+    return os.path.join(root, day, sport)
+
+def read_meta(folder):
+    with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)["columns"]
+
+def column_path(folder, name):
+    return os.path.join(folder, f"{name}.col")
+
+def segment_rows(folder, columns):
+    """
+    Complete rows in a segment: a crash mid-flush can leave some columns
+    longer than others.
+    """
+    rows = []
+    for name, dtype in columns.items():
+        path = column_path(folder, name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        rows.append(size // np.dtype(dtype).itemsize)
+    return min(rows) if rows else 0
+
+def load_segment(folder):
+    """
+    {column: array} for one sport-day, memory-mapped read-only (zero-copy).
+    """
+    columns = read_meta(folder)
+    rows = segment_rows(folder, columns)
+    if rows == 0:
+        return {name: np.zeros(0, dtype=dtype) for name, dtype in columns.items()}
+    return {
+        name: np.memmap(column_path(folder, name), dtype=dtype, mode="r", shape=(rows,))
+        for name, dtype in columns.items()
+    }
+
+def list_days(root=ODDS_DIR):
+    if not os.path.isdir(root):
+        return []
+    return sorted(day for day in os.listdir(root) if os.path.isdir(os.path.join(root, day)))
+
+def load_history(sport, first_day=None, last_day=None, root=ODDS_DIR):
+    """
+    [(day, segment), ...] for one sport, oldest first. Days are "YYYY-MM-DD".
+    """
+    history = []
+    for day in list_days(root):
+        if (first_day and day < first_day) or (last_day and day > last_day):
+            continue
+        folder = segment_dir(sport, day, root)
+        if os.path.exists(os.path.join(folder, "meta.json")):
+            history.append((day, load_segment(folder)))
+    return history
+
+class OddsRecorder:
+    """
+    Appends every scraped match state to per-day, per-sport columnar
+    segments. record() only queues the batch; a writer thread turns it into
+    columns and appends them every FLUSH_SECONDS. A match is written again
+    only when one of its values changed. record() is a no-op until start().
+    """
+
+    def __init__(self):
+        self.queue = None
+        self.thread = None
+        self.root = ODDS_DIR
+        self.segments = {}
+        self.last_values = {}
+
+    def start(self, root=ODDS_DIR, flush_seconds=FLUSH_SECONDS):
+        self.root = root
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write_loop, name="odds-recorder", daemon=True)
+        self.thread.start()
+        print(f"[ODDS] Recording live snapshots to {root}")
+
+    def is_recording(self):
+        return self.queue is not None
+
+    def record(self, sport, infos, now=None):
+        if self.queue is None or not infos:
+            return
+        now = time.time() if now is None else now
+        # copies: match_info dicts are updated in place by some page sources
+        self.queue.put((sport, now, [
+            dict(info, partials=list(info.get("partials") or [])) for info in infos if info.get("match_id")
+        ]))
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.queue.put(None)
+        self.thread.join(timeout=30)
+        self.thread = None
+        self.queue = None
+
+    def write_loop(self):
+        pending = []
+        rows = 0
+        deadline = time.monotonic() + self.flush_seconds
+        while True:
+            try:
+                item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = False
+            if item:
+                pending.append(item)
+                rows += len(item[2])
+            if item is None or rows >= BATCH_ROWS or time.monotonic() >= deadline:
+                try:
+                    self.flush(pending)
+                except (OSError, ValueError) as e:
+                    print(f"[ODDS] Could not write snapshots: {e}")
+                pending = []
+                rows = 0
+                deadline = time.monotonic() + self.flush_seconds
+            if item is None:
+                return
+
+    def open_segment(self, sport, day, sample_info):
+        """
+        Columns of a sport-day segment, created from the first record seen.
+        An existing segment's columns are cut back to its complete rows.
+        """
+        key = (sport, day)
+        if key in self.segments:
+            return self.segments[key]
+        folder = segment_dir(sport, day, self.root)
+        if os.path.exists(os.path.join(folder, "meta.json")):
+            columns = read_meta(folder)
+            rows = segment_rows(folder, columns)
+            for name, dtype in columns.items():
+                with open(column_path(folder, name), "ab") as f:
+                    f.truncate(rows * np.dtype(dtype).itemsize)
+        else:
+            os.makedirs(folder, exist_ok=True)
+            columns = dict(BASE_COLUMNS)
+            columns.update((name, VALUE_DTYPE) for name in value_columns(sample_info))
+            with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"columns": columns}, f)
+        # a new day starts with an empty change filter
+        for old in [k for k in self.segments if k[0] == sport]:
+            del self.segments[old]
+        self.last_values[sport] = {}
+        self.segments[key] = (folder, columns)
+        return self.segments[key]
+
+    def flush(self, pending):
+        grouped = {}
+        for sport, now, infos in pending:
+            day = time.strftime("%Y-%m-%d", time.localtime(now))
+            grouped.setdefault((sport, day), []).extend((now, info) for info in infos)
+
+        for (sport, day), snapshots in grouped.items():
+            folder, columns = self.open_segment(sport, day, snapshots[0][1])
+            names = [name for name in columns if name not in BASE_COLUMNS]
+            last_values = self.last_values[sport]
+            kept = []
+            for now, info in snapshots:
+                values = row_values(info, names)
+                if last_values.get(info["match_id"]) != values:
+                    last_values[info["match_id"]] = values
+                    kept.append((now, info["match_id"], values))
+            if not kept:
+                continue
+
+            data = {
+                "ts": np.fromiter((k[0] for k in kept), dtype=columns["ts"], count=len(kept)),
+                "match_id": np.array([str(k[1]).encode("utf-8") for k in kept], dtype=columns["match_id"]),
+            }
+            values = np.array([k[2] for k in kept], dtype=VALUE_DTYPE).reshape(len(kept), len(names))
+            for i, name in enumerate(names):
+                data[name] = values[:, i].astype(columns[name])
+            for name in columns:
+                with open(column_path(folder, name), "ab") as f:
+                    f.write(data[name].tobytes())
+
+RECORDER = OddsRecorder()
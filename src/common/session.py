@@ -0,0 +1,95 @@
+# common/session.py
+
+import os
+import json
+
+from common.auth import login_sts
+from common.urls import sts_url
+from common.waits import BALANCE_SELECTOR, wait_for_page_ready, wait_for_element
+
+COOKIES_FILENAME = "cookies.json"
+
+def profile_dir(name):
+    """
+    Chrome user-data dir for one browser. Chrome locks a profile, so every
+    concurrently running driver (one per sport in parallel mode) needs its own.
+    STS_PROFILE_DIR overrides the parent folder.
+    """
+    root = os.getenv("STS_PROFILE_DIR") or os.path.join(os.path.dirname(__file__), "profiles")
+    folder = os.path.abspath(os.path.join(root, name))
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+def is_logged_in(driver):
+    """
+    The deposit-info balance (what get_balance reads) only renders for a
+    logged-in user.
+    """
+    return wait_for_element(driver, BALANCE_SELECTOR, "session_check") is not None
+
+def export_cookies(driver, folder):
+    path = os.path.join(folder, COOKIES_FILENAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(driver.get_cookies(), f)
+    os.replace(tmp_path, path)
+
+def import_cookies(driver, folder):
+    """
+    Add the exported cookies to the current domain. Returns how many were added.
+    """
+    path = os.path.join(folder, COOKIES_FILENAME)
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cookies = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[SESSION] Could not read {path}: {e}")
+        return 0
+
+    added = 0
+    for cookie in cookies:
+        # Chrome rejects some exported fields (e.g. a float expiry, sameSite=None without secure)
+        cookie = {k: v for k, v in cookie.items() if k in ("name", "value", "path", "domain", "secure", "httpOnly")}
+        try:
+            driver.add_cookie(cookie)
+            added += 1
+        except Exception:
+            pass
+    return added
+
+def resume_session(driver, username, password, folder):
+    """
+    Make sure `driver` is logged in, doing as little as possible:
+      1) the profile's own cookies (Chrome user-data dir) are still valid,
+      2) the exported cookies.json restores the session,
+      3) full login_sts.
+    Returns True if the session was reused, False if login_sts ran (a captcha
+    may then need solving before save_session).
+    """
+    driver.get(sts_url("/live"))
+    wait_for_page_ready(driver)
+    if is_logged_in(driver):
+        print("[SESSION] Reusing the logged-in profile.")
+        return True
+
+    if import_cookies(driver, folder):
+        driver.refresh()
+        wait_for_page_ready(driver)
+        if is_logged_in(driver):
+            print("[SESSION] Session restored from exported cookies.")
+            return True
+
+    print("[SESSION] Session expired => logging in.")
+    login_sts(driver, username, password)
+    return False
+
+def save_session(driver, folder):
+    """
+    Export the cookies once the driver is logged in, for the next start.
+    """
+    if is_logged_in(driver):
+        export_cookies(driver, folder)
+    else:
+        print("[SESSION] Not logged in, cookies not saved.")
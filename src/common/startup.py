@@ -0,0 +1,72 @@
+# common/startup.py
+
+import os
+import time
+import threading
+
+from common.ledger import append_records
+
+# One line per run: {"started_at", "phases": {name: seconds}, "first_scrape_s"}
+STARTUP_LOG_FILE = os.path.join(os.path.dirname(__file__), "db", "startup_times.jsonl")
+
+class StartupClock:
+    """
+    Cold-start timing: begin() at the top of main(), phase(name) around each
+    startup step, first_scrape() once the first live page has been read.
+    The summary is printed and appended to STARTUP_LOG_FILE.
+    """
+
+    def __init__(self):
+        self.started = None
+        self.started_at = None
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.reported = False
+
+    def begin(self):
+        self.started = time.perf_counter()
+        self.started_at = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    def phase(self, name):
+        return PhaseTimer(self, name)
+
+    def timed(self, name, fn, *args, **kwargs):
+        """
+        fn(*args, **kwargs) as a phase, e.g. for executor.submit.
+        """
+        with self.phase(name):
+            return fn(*args, **kwargs)
+
+    def first_scrape(self, name):
+        with self.lock:
+            if self.started is None or self.reported:
+                return
+            self.reported = True
+        total = time.perf_counter() - self.started
+        phases = ", ".join(f"{k} {v:.2f}s" for k, v in self.phases.items())
+        print(f"[STARTUP] Cold start to first scrape ({name}): {total:.2f}s ({phases})")
+        try:
+            os.makedirs(os.path.dirname(STARTUP_LOG_FILE), exist_ok=True)
+            append_records(STARTUP_LOG_FILE, [{
+                "started_at": self.started_at,
+                "phases": {k: round(v, 3) for k, v in self.phases.items()},
+                "first_scrape_s": round(total, 3),
+            }])
+        except OSError as e:
+            print(f"[STARTUP] Could not write {STARTUP_LOG_FILE}: {e}")
+
+class PhaseTimer:
+    def __init__(self, clock, name):
+        self.clock = clock
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        with self.clock.lock:
+            self.clock.phases[self.name] = time.perf_counter() - self.start
+        return False
+
+STARTUP = StartupClock()
@@ -0,0 +1,178 @@
+# common/strategy.py
+
+import operator
+
+import numpy as np
+
+OPS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+def feature_columns(feature):
+    """
+    match_info keys a feature reads. A feature is either a key name or an
+    expression tuple: ("max", a, b), ("min", a, b), ("ratio", a, b).
+    """
+    if isinstance(feature, str):
+        return [feature]
+    return list(feature[1:])
+
+def feature_values(feature, columns):
+    if isinstance(feature, str):
+        return columns[feature]
+    op, a, b = feature
+    if op == "max":
+        return np.maximum(columns[a], columns[b])
+    if op == "min":
+        return np.minimum(columns[a], columns[b])
+    if op == "ratio":
+        return np.divide(columns[a], columns[b], out=np.zeros_like(columns[a]), where=columns[b] != 0)
+    raise ValueError(f"Unknown feature op: {op}")
+
+def condition_name(feature, op):
+    """
+    Parameter name of a condition's threshold, e.g. "time_min >=" or
+    "max(games_player1,games_player2) <".
+    """
+    if isinstance(feature, str):
+        return f"{feature} {op}"
+    return f"{feature[0]}({','.join(feature[1:])}) {op}"
+
+def conditions_mask(conditions, columns, n):
+    mask = np.ones(n, dtype=bool)
+    for (feature, op, value) in conditions:
+        mask &= op(feature_values(feature, columns), value)
+    return mask
+
+class Strategy:
+    """
+    A betting rule declared as data and evaluated over a whole batch of
+    match_info dicts at once (one NumPy column per field). Spec keys:
+      "conditions": [(feature, op, value), ...]   all must hold
+      "outcomes":   [(outcome_name, odds_key), ...]
+      "odds_range": (low, high)                   inclusive
+      "all_odds_in_range": bool                   every outcome must be in range
+                                                  (default: only the picked one)
+      "min_odds_ratio": float or None             max odd / min odd
+    Among eligible outcomes the lowest odd is picked (first one on ties).
+    """
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.spec = spec
+        self.conditions = [(feature, OPS[op], value) for (feature, op, value) in spec.get("conditions", [])]
+        self.outcome_names = [outcome for (outcome, _) in spec["outcomes"]]
+        self.odds_keys = [key for (_, key) in spec["outcomes"]]
+        self.odds_low, self.odds_high = spec["odds_range"]
+        self.all_odds_in_range = spec.get("all_odds_in_range", False)
+        self.min_odds_ratio = spec.get("min_odds_ratio")
+
+        keys = list(self.odds_keys)
+        for (feature, _, _) in self.conditions:
+            keys.extend(feature_columns(feature))
+        self.keys = list(dict.fromkeys(keys))
+
+    def params(self):
+        """
+        Tunable thresholds: {"odds_low", "odds_high", ["min_odds_ratio"],
+        condition_name(...): value}.
+        """
+        params = {"odds_low": self.odds_low, "odds_high": self.odds_high}
+        if self.min_odds_ratio is not None:
+            params["min_odds_ratio"] = self.min_odds_ratio
+        for (feature, op, value) in self.spec.get("conditions", []):
+            params[condition_name(feature, op)] = value
+        return params
+
+    def tuned(self, params):
+        """
+        Same rule with some thresholds replaced (names as in params()).
+        """
+        spec = dict(self.spec)
+        spec["odds_range"] = (params.get("odds_low", self.odds_low), params.get("odds_high", self.odds_high))
+        if "min_odds_ratio" in params:
+            spec["min_odds_ratio"] = params["min_odds_ratio"]
+        spec["conditions"] = [
+            (feature, op, params.get(condition_name(feature, op), value))
+            for (feature, op, value) in self.spec.get("conditions", [])
+        ]
+        return Strategy(self.name, spec)
+
+    def columns(self, infos, keys=None):
+        return {
+            key: np.fromiter((info[key] for info in infos), dtype=np.float64, count=len(infos))
+            for key in (self.keys if keys is None else keys)
+        }
+
+    def conditions_hold(self, infos):
+        """
+        Mask over partial records: only the conditions whose fields all are
+        present in the dicts are checked (e.g. the clock, before odds are read).
+        """
+        if not infos:
+            return np.zeros(0, dtype=bool)
+        present = set(infos[0])
+        conditions = [c for c in self.conditions if set(feature_columns(c[0])) <= present]
+        keys = list(dict.fromkeys(k for (feature, _, _) in conditions for k in feature_columns(feature)))
+        return conditions_mask(conditions, self.columns(infos, keys), len(infos))
+
+    def evaluate(self, columns):
+        """
+        Vectorised over n matches. Returns (mask, outcome_index, odd) arrays;
+        only rows with mask=True are bets.
+        """
+        odds = np.column_stack([columns[key] for key in self.odds_keys])
+        n = odds.shape[0]
+        mask = conditions_mask(self.conditions, columns, n)
+
+        in_range = (odds >= self.odds_low) & (odds <= self.odds_high)
+        if self.all_odds_in_range:
+            mask &= in_range.all(axis=1)
+        if self.min_odds_ratio is not None:
+            lowest = odds.min(axis=1)
+            ratio = np.divide(odds.max(axis=1), lowest, out=np.zeros(n), where=lowest > 0)
+            mask &= ratio >= self.min_odds_ratio
+
+        eligible_odds = np.where(in_range, odds, np.inf)
+        best = eligible_odds.argmin(axis=1)
+        best_odd = eligible_odds[np.arange(n), best]
+        mask &= np.isfinite(best_odd)
+        return mask, best, best_odd
+
+    def odds_near_range(self, infos, margin):
+        """
+        Mask over `infos`: some outcome's odd is inside the odds range or
+        at most `margin` times above it (may still fall into it).
+        """
+        if not infos:
+            return np.zeros(0, dtype=bool)
+        columns = self.columns(infos, self.odds_keys)
+        odds = np.column_stack([columns[key] for key in self.odds_keys])
+        return ((odds >= self.odds_low) & (odds <= self.odds_high * margin)).any(axis=1)
+
+    def rank(self, infos):
+        """
+        Candidates among `infos` as [(index, outcome, odd)], lowest odd first.
+        """
+        if not infos:
+            return []
+        mask, best, best_odd = self.evaluate(self.columns(infos))
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(best_odd[rows], kind="stable")]
+        return [(int(i), self.outcome_names[best[i]], float(best_odd[i])) for i in rows]
+
+    def pick(self, match_info):
+        """
+        Single-match form, same result as the old pick_*_bet_type:
+        (outcome, odd) or None.
+        """
+        ranked = self.rank([match_info])
+        if not ranked:
+            return None
+        _, outcome, odd = ranked[0]
+        return outcome, odd
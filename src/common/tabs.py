@@ -0,0 +1,102 @@
+# common/tabs.py
+
+import time
+
+from selenium.common.exceptions import NoSuchWindowException, WebDriverException
+
+from common.lean import apply_blocking
+from common.live_tiles import LIVE_TILE_SELECTOR
+
+# A live page that has not changed for this long has probably lost its feed
+STALE_SECONDS = 60
+# Reload every tab at least this often anyway (memory, missed re-renders)
+RELOAD_SECONDS = 15 * 60
+
+# First call leaves a MutationObserver that stamps the last DOM change.
+TAB_STATE_JS = """
+if (!window.__stsTabWatch) {
+    const watch = {last: Date.now()};
+    new MutationObserver(() => { watch.last = Date.now(); }).observe(
+        document.body, {childList: true, subtree: true, characterData: true}
+    );
+    window.__stsTabWatch = watch;
+}
+return {
+    ready: document.readyState === "complete",
+    url: location.href,
+    tiles: document.querySelectorAll(arguments[0]).length,
+    quiet_ms: Date.now() - window.__stsTabWatch.last,
+};
+"""
+
+class TabManager:
+    """
+    One browser tab per sport, opened once and switched to instead of
+    reloading the live page every cycle. navigator(key, navigate) wraps a
+    navigate_to_*_live function: it switches to the sport's tab and only
+    calls `navigate` when the tab is new, closed, gone elsewhere, empty,
+    quiet for STALE_SECONDS or older than RELOAD_SECONDS.
+    """
+
+    def __init__(self, stale_seconds=STALE_SECONDS, reload_seconds=RELOAD_SECONDS):
+        self.stale_seconds = stale_seconds
+        self.reload_seconds = reload_seconds
+        self.tabs = {}
+
+    def open_tab(self, driver, key):
+        if self.tabs:
+            driver.switch_to.new_window("tab")
+            patterns = getattr(driver, "lean_patterns", None)
+            if patterns:
+                # blocking is per tab
+                apply_blocking(driver, patterns)
+        # the first sport keeps the window we logged in with
+        tab = {"handle": driver.current_window_handle, "url": None, "loaded_at": 0.0}
+        self.tabs[key] = tab
+        return tab
+
+    def stale_reason(self, driver, tab):
+        if tab["url"] is None:
+            return "new tab"
+        if time.time() - tab["loaded_at"] > self.reload_seconds:
+            return "periodic reload"
+        try:
+            state = driver.execute_script(TAB_STATE_JS, LIVE_TILE_SELECTOR)
+        except WebDriverException as e:
+            return f"page error ({e.__class__.__name__})"
+        if not state["ready"]:
+            return "page not loaded"
+        if state["url"].split("?")[0] != tab["url"].split("?")[0]:
+            return "left the live page"
+        if state["tiles"] == 0:
+            return "no tiles"
+        if state["quiet_ms"] > self.stale_seconds * 1000:
+            return f"no updates for {state['quiet_ms'] / 1000:.0f}s"
+        return None
+
+    def show(self, driver, key, navigate):
+        tab = self.tabs.get(key)
+        if tab is None:
+            tab = self.open_tab(driver, key)
+        else:
+            try:
+                driver.switch_to.window(tab["handle"])
+            except NoSuchWindowException:
+                print(f"[{key}] Tab was closed, reopening.")
+                del self.tabs[key]
+                driver.switch_to.window(driver.window_handles[0])
+                tab = self.open_tab(driver, key)
+
+        reason = self.stale_reason(driver, tab)
+        if reason is None:
+            return False
+        print(f"[{key}] Loading live page ({reason}).")
+        navigate(driver)
+        tab["url"] = driver.current_url
+        tab["loaded_at"] = time.time()
+        return True
+
+    def navigator(self, key, navigate):
+        def navigate_in_tab(driver):
+            self.show(driver, key, navigate)
+        return navigate_in_tab
@@ -0,0 +1,250 @@
+# common/ticket.py
+
+import uuid
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException
+)
+
+from common.balance import BALANCE
+from common.metrics import TICKET_RESULTS
+from common.waits import (
+    TIMEOUTS,
+    POLL_FREQUENCY,
+    STAKE_INPUT_SELECTOR,
+    PLACE_BET_SELECTOR,
+    STATUS_DIALOG_SELECTOR
+)
+
+BET_ACCEPTED = "accepted"
+BET_REJECTED = "rejected"
+BET_ODDS_CHANGED = "odds_changed"
+# confirmed, but the ticket showed nothing we could read in time
+BET_UNKNOWN = "unknown"
+
+# Lower-cased fragments of the status dialog text (site-specific)
+ACCEPTED_MARKERS = ("przyjęt", "zaakceptowan", "postawion", "możesz wygrać")
+ODDS_CHANGED_MARKERS = ("zmian",)
+
+# How far (absolute, either way) the odd on the button may have moved since
+# the scrape before the bet is aborted as odds_changed. Short odds move in
+# 0.01-0.05 ticks between scrape and click; 0 aborts on any tick.
+# main.py --odds-tolerance sets it.
+ODDS_TOLERANCE = 0.02
+
+def set_odds_tolerance(tolerance):
+    global ODDS_TOLERANCE
+    if tolerance < 0:
+        raise ValueError("odds tolerance must be >= 0")
+    ODDS_TOLERANCE = tolerance
+
+# Select odds -> set stake -> wait for the potential win -> confirm twice ->
+# read the ticket status, all inside the page. arguments: tile, label,
+# expected odd, tolerance, stake, selectors, timeouts (ms), poll (ms), token,
+# callback. window.__stsTickets[token] tells PROBE_BET_JS whether the
+# place-bet button was clicked, and stops the script before it is.
+PLACE_BET_JS = """
+const [tile, label, expectedOdd, tolerance, stake, sel, timeouts, poll, token, done] = arguments;
+const started = performance.now();
+const state = {confirmed: false, abort: false};
+window.__stsTickets = window.__stsTickets || {};
+window.__stsTickets[token] = state;
+const readText = (el) => (el ? (el.innerText || el.textContent || "").trim() : "");
+const money = (t) => {
+    const v = parseFloat(t.replace(/zł|\\s/g, "").replace(",", "."));
+    return isNaN(v) ? 0 : v;
+};
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+const waitFor = async (check, ms) => {
+    const end = performance.now() + ms;
+    while (true) {
+        const value = check();
+        if (value) return value;
+        if (performance.now() >= end) return null;
+        await sleep(poll);
+    }
+};
+const result = {odd: 0, potential_win: 0, message: "", settled: false, confirmed: false};
+const finish = (status) => {
+    delete window.__stsTickets[token];
+    done(Object.assign(result, {status: status, elapsed_ms: performance.now() - started}));
+};
+
+(async () => {
+    const button = Array.from(tile.querySelectorAll("sds-odds-button")).find(
+        (b) => readText(b.querySelector(".odds-button__label")).toLowerCase() === label
+    );
+    if (!button) {
+        result.message = "odds button not found";
+        return finish("rejected");
+    }
+    result.odd = money(readText(button.querySelector("[data-testid='odds-value']")));
+    if (Math.abs(result.odd - expectedOdd) > tolerance + 1e-9) {
+        return finish("odds_changed");
+    }
+    (button.querySelector("button") || button).click();
+
+    const input = await waitFor(() => {
+        const el = document.querySelector(sel.stake);
+        return el && !el.disabled ? el : null;
+    }, timeouts.ticket_open);
+    if (!input) {
+        result.message = "stake input not found";
+        return finish("rejected");
+    }
+    const setValue = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, "value").set;
+    input.focus();
+    setValue.call(input, String(stake));
+    input.dispatchEvent(new Event("input", {bubbles: true}));
+    input.dispatchEvent(new Event("change", {bubbles: true}));
+    input.blur();
+
+    result.potential_win = await waitFor(() => {
+        const b = document.querySelector(sel.placeBet);
+        const value = money(readText(b && b.querySelector(".submit-button__content")));
+        return value > 0 ? value : null;
+    }, timeouts.potential_win) || 0;
+
+    const first = document.querySelector(sel.placeBet);
+    if (!first) {
+        result.message = "place-bet button not found";
+        return finish("rejected");
+    }
+    if (state.abort) {
+        result.message = "aborted before confirming";
+        return finish("rejected");
+    }
+    first.click();
+    state.confirmed = result.confirmed = true;
+    // the ticket re-renders the button after the first click
+    const second = await waitFor(() => {
+        const b = document.querySelector(sel.placeBet);
+        return b && b !== first && !b.disabled ? b : null;
+    }, timeouts.second_click) || document.querySelector(sel.placeBet);
+    if (second) second.click();
+
+    const settled = await waitFor(() => {
+        const dialog = document.querySelector(sel.status);
+        if (dialog && readText(dialog)) return readText(dialog);
+        return document.querySelector(sel.placeBet) ? null : "-";
+    }, timeouts.bet_settled);
+    if (settled) {
+        result.settled = true;
+        result.message = settled === "-" ? "" : settled;
+    }
+    return finish("unknown");
+})().catch((e) => {
+    result.message = String(e);
+    finish("unknown");
+});
+"""
+
+# After PLACE_BET_JS failed on the Python side: was the place-bet button
+# clicked? Also stops a script still running before that click (scripts run
+# one at a time in the page, so the answer holds). null: state unknown.
+PROBE_BET_JS = """
+const state = (window.__stsTickets || {})[arguments[0]];
+if (!state) return null;
+state.abort = true;
+return state.confirmed;
+"""
+
+def confirmed_before_failure(driver, token):
+    """
+    True/False from PROBE_BET_JS; True too when the page cannot tell (the
+    stake may have left the account).
+    """
+    try:
+        confirmed = driver.execute_script(PROBE_BET_JS, token)
+    except WebDriverException:
+        return True
+    return confirmed is not False
+
+def ticket_status(result):
+    """
+    Final status from what the script saw on the ticket. A dialog text we
+    don't recognise stays unknown: the bet is recorded, not retried.
+    """
+    if result["status"] != BET_UNKNOWN or not result["settled"]:
+        return result["status"]
+    message = result["message"].lower()
+    if not message or any(m in message for m in ACCEPTED_MARKERS):
+        # no dialog but the place-bet button is gone => ticket went through
+        return BET_ACCEPTED
+    if any(m in message for m in ODDS_CHANGED_MARKERS):
+        return BET_ODDS_CHANGED
+    return BET_UNKNOWN
+
+def place_single_bet(driver, match_el, label, expected_odd, stake, odds_tolerance=None):
+    """
+    Place one single bet in a single execute_async_script: click the `label`
+    odds button inside match_el (only if it still shows expected_odd, give or
+    take odds_tolerance, default ODDS_TOLERANCE), set the stake, confirm, and
+    watch the ticket. Returns a dict:
+      {
+        "status": "accepted" | "rejected" | "odds_changed" | "unknown",
+        "odd": float,            # odd shown on the button when clicked
+        "potential_win": float,  # from the place-bet button
+        "message": str,          # status dialog text, if any
+        "confirmed": bool,       # the place-bet button was clicked
+        "elapsed_ms": float,     # decision -> ticket status
+      }
+    A bet that may have gone through is taken off the BalanceLedger. A
+    WebDriver error only counts as possibly placed when the place-bet button
+    was (or may have been) clicked before it.
+    """
+    if odds_tolerance is None:
+        odds_tolerance = ODDS_TOLERANCE
+    token = uuid.uuid4().hex
+    timeouts_ms = {
+        step: TIMEOUTS[step] * 1000
+        for step in ("ticket_open", "potential_win", "second_click", "bet_settled")
+    }
+    selectors = {
+        "stake": STAKE_INPUT_SELECTOR,
+        "placeBet": PLACE_BET_SELECTOR,
+        "status": STATUS_DIALOG_SELECTOR,
+    }
+    try:
+        result = driver.execute_async_script(
+            PLACE_BET_JS,
+            match_el,
+            label.lower(),
+            expected_odd,
+            odds_tolerance,
+            stake,
+            selectors,
+            timeouts_ms,
+            POLL_FREQUENCY * 1000,
+            token
+        )
+        result["status"] = ticket_status(result)
+    except StaleElementReferenceException:
+        result = {"status": BET_REJECTED, "odd": 0.0, "potential_win": 0.0,
+                  "message": "tile went stale", "confirmed": False, "elapsed_ms": 0.0}
+    except (TimeoutException, WebDriverException) as e:
+        if confirmed_before_failure(driver, token):
+            # the script may have got as far as confirming: treat as placed
+            result = {"status": BET_UNKNOWN, "odd": 0.0, "potential_win": 0.0,
+                      "message": str(e).strip(), "confirmed": True, "elapsed_ms": 0.0}
+        else:
+            result = {"status": BET_REJECTED, "odd": 0.0, "potential_win": 0.0,
+                      "message": f"failed before confirming: {str(e).strip()}",
+                      "confirmed": False, "elapsed_ms": 0.0}
+
+    TICKET_RESULTS.inc(status=result["status"])
+    if bet_possibly_placed(result):
+        BALANCE.spend(stake)
+    if result["status"] == BET_UNKNOWN:
+        # the page has the real balance
+        BALANCE.mark_unsure("unclear ticket")
+    return result
+
+def bet_possibly_placed(result):
+    """
+    True if the stake may have left the account, i.e. the match must be
+    recorded so it is never bet twice.
+    """
+    return result["status"] == BET_ACCEPTED or (result["status"] == BET_UNKNOWN and result["confirmed"])
@@ -0,0 +1,123 @@
+# common/tile_stream.py
+
+from common.live_tiles import (
+    LIVE_TILE_SELECTOR,
+    READ_TILE_JS,
+    match_id_from_link,
+    tile_from_js
+)
+
+TILE_TAG = "bb-live-match-tile"
+
+# Installs a MutationObserver that remembers which tiles changed, then returns
+# every tile once (the full read the table starts from). `key` identifies the
+# sport page, so a drain after navigating elsewhere is detected.
+INSTALL_WATCH_JS = READ_TILE_JS + """
+const selector = arguments[0];
+const tileTag = arguments[1];
+if (window.__stsTileWatch) {
+    window.__stsTileWatch.observer.disconnect();
+}
+const watch = {key: arguments[2], dirty: new Set(), observer: null};
+const markTiles = (node) => {
+    if (!node || node.nodeType !== 1) return;
+    if (node.matches(tileTag)) watch.dirty.add(node);
+    for (const tile of node.querySelectorAll(tileTag)) watch.dirty.add(tile);
+};
+watch.observer = new MutationObserver((mutations) => {
+    for (const m of mutations) {
+        const target = m.target.nodeType === 1 ? m.target : m.target.parentElement;
+        const tile = target ? target.closest(tileTag) : null;
+        if (tile) watch.dirty.add(tile);
+        for (const node of m.addedNodes) markTiles(node);
+        for (const node of m.removedNodes) markTiles(node);
+    }
+});
+watch.observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+window.__stsTileWatch = watch;
+return Array.from(document.querySelectorAll(selector)).map(readTile);
+"""
+
+# Returns only the tiles that changed since the last drain (and the links of
+# tiles that left the page), or null if the watcher is gone / for another page.
+DRAIN_WATCH_JS = READ_TILE_JS + """
+const watch = window.__stsTileWatch;
+if (!watch || watch.key !== arguments[1]) return null;
+const changed = [];
+const removed = [];
+for (const tile of watch.dirty) {
+    if (tile.isConnected && tile.matches(arguments[0])) {
+        changed.push(readTile(tile));
+    } else {
+        const anchor = tile.querySelector("a");
+        removed.push({
+            el: tile,
+            data_cy: anchor ? anchor.getAttribute("data-cy") : null,
+            href: anchor ? anchor.href : null,
+        });
+    }
+}
+watch.dirty.clear();
+return {changed: changed, removed: removed};
+"""
+
+class LiveTileTable:
+    """
+    Incremental view of one sport's live page. install() reads every tile
+    once and leaves a MutationObserver on the page; poll() then costs one
+    execute_script that returns only changed tiles, and the table's
+    (match_el, match_info) entries are updated in place.
+    """
+
+    def __init__(self, key, info_from_tile):
+        self.key = key
+        self.info_from_tile = info_from_tile
+        self.entries = {}
+        self.last_changed = []
+
+    def apply(self, tiles):
+        self.last_changed = []
+        for tile in tiles:
+            if not tile["match_id"]:
+                continue
+            self.entries[tile["match_id"]] = (tile["el"], self.info_from_tile(tile))
+            self.last_changed.append(tile["match_id"])
+
+    def install(self, driver):
+        raw_tiles = driver.execute_script(INSTALL_WATCH_JS, LIVE_TILE_SELECTOR, TILE_TAG, self.key) or []
+        self.entries = {}
+        self.apply([tile_from_js(raw) for raw in raw_tiles])
+        return self.matches()
+
+    def poll(self, driver):
+        """
+        Apply changes since the last poll. Returns None when the page was
+        left or reloaded (the observer is gone) and install() is needed.
+        """
+        result = driver.execute_script(DRAIN_WATCH_JS, LIVE_TILE_SELECTOR, self.key)
+        if result is None:
+            return None
+
+        # removals first: a re-rendered tile shows up as removed + changed
+        for link in result.get("removed") or []:
+            match_id = match_id_from_link(link.get("data_cy"), link.get("href"))
+            entry = self.entries.get(match_id)
+            # only if the table still points at the removed element
+            # (its replacement may have been picked up by an earlier poll)
+            if entry is not None and entry[0] == link.get("el"):
+                del self.entries[match_id]
+        self.apply([tile_from_js(raw) for raw in result.get("changed") or []])
+        return self.matches()
+
+    def read(self, driver, navigate):
+        matches = self.poll(driver)
+        if matches is None:
+            navigate(driver)
+            matches = self.install(driver)
+            print(f"[{self.key}] Tile watcher installed on {len(matches)} tiles.")
+        else:
+            print(f"[{self.key}] {len(self.last_changed)} tiles changed since last poll.")
+        return matches
+
+    def matches(self):
+        return list(self.entries.values())
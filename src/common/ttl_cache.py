@@ -0,0 +1,39 @@
+# common/ttl_cache.py
+
+import time
+import threading
+
+class TTLCache:
+    """
+    Dict whose entries expire `ttl` seconds after they were put.
+    Thread-safe (crawler workers share one).
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.items = {}
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.items.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if time.monotonic() >= expires:
+                del self.items[key]
+                return default
+            return value
+
+    def put(self, key, value=True):
+        with self.lock:
+            self.items[key] = (value, time.monotonic() + self.ttl)
+
+    def __contains__(self, key):
+        return self.get(key, None) is not None
+
+    def purge(self):
+        now = time.monotonic()
+        with self.lock:
+            for key in [k for k, (_, expires) in self.items.items() if now >= expires]:
+                del self.items[key]
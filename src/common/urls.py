@@ -0,0 +1,14 @@
+# common/urls.py
+
+import os
+
+DEFAULT_BASE_URL = "https://www.sts.pl"
+
+def sts_url(path):
+    """
+    Full URL for a site path, e.g. sts_url("/live/tenis").
+    STS_BASE_URL overrides the host (the offline replay harness points it
+    at a local server).
+    """
+    base_url = os.getenv("STS_BASE_URL") or DEFAULT_BASE_URL
+    return base_url.rstrip("/") + path
@@ -0,0 +1,84 @@
+# common/waits.py
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
+)
+
+# Upper bounds (seconds) per step. Each wait returns as soon as its condition
+# holds, so these only matter when the site is slow or the element never shows.
+TIMEOUTS = {
+    "page_ready": 10,
+    "cookie_banner": 3,
+    "login_form": 10,
+    "login_done": 10,
+    "live_tiles": 5,
+    "ticket_menu": 3,
+    "ticket_open": 5,
+    "potential_win": 5,
+    "second_click": 2,
+    "bet_settled": 3,
+    "inspiration_page": 10,
+    "coupon_copy": 5,
+    "coupon_page": 5,
+    "status_dialog": 5,
+    "session_check": 5,
+}
+
+POLL_FREQUENCY = 0.1
+
+STAKE_INPUT_SELECTOR = "sts-shared-input[data-cy='ticket-stake'] input#AMOUNT"
+PLACE_BET_SELECTOR = "button[data-testid='button-place-a-bet']"
+STATUS_DIALOG_SELECTOR = "div.status-dialog-content__description"
+BALANCE_SELECTOR = "sts-shared-icon-button-deposit-info .icon-button-deposit-info__amount"
+
+def wait_until(driver, condition, step, timeout=None):
+    """
+    WebDriverWait(driver).until(condition) with the per-step timeout.
+    Returns the condition's value, or None on timeout.
+    """
+    if timeout is None:
+        timeout = TIMEOUTS[step]
+    try:
+        wait = WebDriverWait(
+            driver,
+            timeout,
+            poll_frequency=POLL_FREQUENCY,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+        )
+        return wait.until(condition)
+    except TimeoutException:
+        return None
+
+def document_ready(driver):
+    return driver.execute_script("return document.readyState") == "complete"
+
+def wait_for_page_ready(driver, step="page_ready"):
+    return bool(wait_until(driver, document_ready, step))
+
+def wait_for_element(driver, css, step, clickable=False, timeout=None):
+    """
+    Return the element matching `css` once it is present (or clickable), else None.
+    """
+    if clickable:
+        condition = EC.element_to_be_clickable((By.CSS_SELECTOR, css))
+    else:
+        condition = EC.presence_of_element_located((By.CSS_SELECTOR, css))
+    return wait_until(driver, condition, step, timeout)
+
+def wait_for_invisibility(driver, css, step):
+    return bool(wait_until(driver, EC.invisibility_of_element_located((By.CSS_SELECTOR, css)), step))
+
+def wait_for_live_tiles(driver, tile_selector):
+    """
+    After driver.get on a live page: wait for the document and at least one
+    tile. Returns False if the page has no tiles (e.g. no live matches).
+    """
+    def tiles_ready(d):
+        return document_ready(d) and len(d.find_elements(By.CSS_SELECTOR, tile_selector)) > 0
+
+    return bool(wait_until(driver, tiles_ready, "live_tiles"))
@@ -1,42 +1,105 @@
 import os
-import time
+import atexit
+import argparse
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 
-from common.auth import login_sts
-from common.bet_logic import (
-    load_bets_data,
-    save_bets_data,
-    get_balance,
-    clear_basket
-)
-
-from sports.football import (
-    navigate_to_football_live,
-    scrape_football_matches,
-    place_bet as place_football_bet
-)
-from sports.hockey import (
-    navigate_to_hockey_live,
-    scrape_hockey_matches,
-    place_hockey_bet
-)
-from sports.basketball import (
-    navigate_to_basketball_live,
-    scrape_basketball_matches,
-    place_basketball_bet
-)
-from sports.tennis import (
-    navigate_to_tennis_live,
-    scrape_tennis_matches,
-    place_tennis_bet
-)
-from sports.inspiration import bet_inspiration_coupons
+from common.browser import create_driver
+from common.call_trace import trace_driver_calls
+from common.session import profile_dir, resume_session, save_session
+from common.bet_logic import load_bets_data
+from common.bet_guard import BetGuard
+from common.metrics import start_metrics_export
+from common.odds_recorder import RECORDER
+from common.startup import STARTUP
+from common.tabs import TabManager
+from common.ticket import ODDS_TOLERANCE, set_odds_tolerance
+
+from sports.live_scan import SPORTS, SCRAPE_MODES, sport_cycle, run_parallel_scan, set_scrape_mode
+from sports.orchestrator import run_sports
+from sports.inspiration import INSPIRATION, InspirationCrawler, start_crawler_drivers, inspiration_cycle
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="STS live betting bot")
+    parser.add_argument(
+        "--parallel",
+        action="store_true",
+        help="scan all sports at once, one logged-in browser per sport"
+    )
+    page_mode = parser.add_mutually_exclusive_group()
+    page_mode.add_argument(
+        "--odds-feed",
+        action="store_true",
+        help="with --parallel: keep each sport page open and decide from its network frames"
+    )
+    page_mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="with --parallel: keep each sport page open and re-read only changed tiles"
+    )
+    parser.add_argument(
+        "--scrape",
+        choices=SCRAPE_MODES,
+        default="bulk",
+        help="how live pages are read: one script per page (bulk, default), per element only "
+             "for tiles in the time window (lazy), or per element for every tile (full)"
+    )
+    parser.add_argument(
+        "--odds-tolerance",
+        type=float,
+        default=ODDS_TOLERANCE,
+        metavar="ODDS",
+        help=f"place a bet even if its odd moved this much since the scrape (default {ODDS_TOLERANCE}; 0: exact)"
+    )
+    parser.add_argument(
+        "--tabs",
+        action="store_true",
+        help="keep each sport's live page open in its own tab, reloading only when stale"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="rewrite per-phase timings and counters to PATH in Prometheus text format"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="serve the same metrics on http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        "--lean",
+        action="store_true",
+        help="headless Chrome that blocks images, fonts and trackers (STS_LEAN_ALLOW / STS_LEAN_DENY); "
+             "needs a saved session, a captcha cannot be solved headless"
+    )
+    parser.add_argument(
+        "--trace-calls",
+        type=int,
+        nargs="?",
+        const=15,
+        default=0,
+        metavar="N",
+        help="count and time every WebDriver call by selector and call site, "
+             "printing the N most expensive after each sport (default 15)"
+    )
+    parser.add_argument(
+        "--record-odds",
+        action="store_true",
+        help="append every scraped match state to daily columnar files in common/db/odds"
+    )
+    parser.add_argument(
+        "--inspiration",
+        action="store_true",
+        help="without --parallel: also copy coupons of high-success users from the inspiration zone, "
+             "crawled by extra headless sessions"
+    )
+    return parser.parse_args()
 
 def main():
+    STARTUP.begin()
+    args = parse_args()
     load_dotenv()
 
     username = os.getenv("STS_USERNAME")
@@ -46,141 +109,76 @@ def main():
         print("Missing STS_USERNAME or STS_PASSWORD in .env!")
         return
 
-    service = Service(ChromeDriverManager().install())
-    options = Options()
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-
-    driver = webdriver.Chrome(service=service, options=options)
+    set_scrape_mode(args.scrape)
+    set_odds_tolerance(args.odds_tolerance)
+    start_metrics_export(args.metrics_file, args.metrics_port)
+    if args.record_odds:
+        RECORDER.start()
+        atexit.register(RECORDER.stop)
+
+    if args.parallel:
+        if args.inspiration:
+            print("--inspiration runs without --parallel only; ignoring it.")
+        run_parallel_scan(
+            username,
+            password,
+            use_odds_feed=args.odds_feed,
+            incremental=args.incremental,
+            lean=args.lean,
+            trace_calls=args.trace_calls
+        )
+        return
 
+    # Chrome starts while the ledger is read
+    session_dir = profile_dir("main")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        driver_future = pool.submit(STARTUP.timed, "browser", create_driver, profile_dir=session_dir, lean=args.lean)
+        with STARTUP.phase("ledger"):
+            bets_data = load_bets_data()
+        driver = driver_future.result()
+    if args.trace_calls:
+        trace_driver_calls(driver, args.trace_calls)
+    print(f"Loaded data: {len(bets_data['betted_matches'])} matches already bet, "
+          f"{len(bets_data['betted_coupons'])} coupons already bet.")
+
+    executor = None
+    crawler = None
     try:
-        # 1) Log in
-        login_sts(driver, username, password)
-        input("If a captcha appeared, solve it manually. Press Enter when finished...")
+        # Log in (skipped while the saved session is still valid)
+        with STARTUP.phase("login"):
+            if not resume_session(driver, username, password, session_dir):
+                input("If a captcha appeared, solve it manually. Press Enter when finished...")
+            save_session(driver, session_dir)
         print("Logged in successfully.")
 
-        # 2) Load bet data (match_ids, coupon_ids, etc.)
-        bets_data = load_bets_data()
-        print(f"Loaded data: {len(bets_data['betted_matches'])} matches already bet, "
-              f"{len(bets_data['betted_coupons'])} coupons already bet.")
-
-        while True:
-            # ==========  FOOTBALL  ==========
-            clear_basket(driver)
-            balance = get_balance(driver)
-            print(f"Current balance: {balance:.2f} zł")
-            if balance < 2.0:
-                print("Balance < 2.0, skipping bets.")
-                time.sleep(60)
-                continue
-
-            # Bet on Football
-            navigate_to_football_live(driver)
-            football_matches = scrape_football_matches(driver)
-            print(f"[FOOTBALL] Found {len(football_matches)} matches...")
-
-            for (match_el, match_info) in football_matches:
-                match_id = match_info["match_id"]
-                if not match_id:
-                    continue
-                if match_id in bets_data["betted_matches"]:
-                    continue
-
-                print(f"[FOOTBALL] Checking match_id={match_id}, {match_info['team_home']} vs {match_info['team_away']}")
-                stake_used, potential_win = place_football_bet(driver, match_el, match_info, bets_data)
-                # If stake_used==0 => no bet or fail, we skip
-                if stake_used > 0:
-                    print(f"[FOOTBALL] bet placed => stake={stake_used}, potential={potential_win:.2f}\n")
-
-            print("Done checking FOOTBALL. Sleep 20s...\n")
-            time.sleep(20)
-
-            # ==========  HOCKEY  ==========
-            clear_basket(driver)
-            if get_balance(driver) < 2.0:
-                print("Balance < 2.0 after football, skipping hockey.")
-                time.sleep(60)
-                continue
-
-            navigate_to_hockey_live(driver)
-            hockey_matches = scrape_hockey_matches(driver)
-            print(f"[HOCKEY] Found {len(hockey_matches)} matches...")
-
-            for (match_el, match_info) in hockey_matches:
-                match_id = match_info["match_id"]
-                if not match_id:
-                    continue
-                if match_id in bets_data["betted_matches"]:
-                    continue
-
-                print(f"[HOCKEY] Checking match_id={match_id}, {match_info['team_home']} vs {match_info['team_away']}")
-                stake_used, potential_win = place_hockey_bet(driver, match_el, match_info, bets_data)
-                if stake_used > 0:
-                    print(f"[HOCKEY] bet placed => stake={stake_used}, potential={potential_win:.2f}\n")
-
-            print("Done checking HOCKEY. Sleep 20s...\n")
-            time.sleep(20)
-
-            # ==========  BASKETBALL  ==========
-            clear_basket(driver)
-            if get_balance(driver) < 2.0:
-                print("Balance < 2.0, skipping basketball.")
-                time.sleep(60)
-                continue
-
-            navigate_to_basketball_live(driver)
-            basket_matches = scrape_basketball_matches(driver)
-            print(f"[BASKETBALL] Found {len(basket_matches)} matches...")
-
-            for (match_el, match_info) in basket_matches:
-                match_id = match_info["match_id"]
-                if not match_id:
-                    continue
-                if match_id in bets_data["betted_matches"]:
-                    continue
-
-                print(f"[BASKETBALL] Checking match_id={match_id}, {match_info['team_home']} vs {match_info['team_away']}")
-                stake_used, potential_win = place_basketball_bet(driver, match_el, match_info, bets_data)
-                if stake_used > 0:
-                    print(f"[BASKETBALL] bet placed => stake={stake_used}, potential={potential_win:.2f}\n")
-
-            print("Done checking BASKETBALL. Sleep 20s...\n")
-            time.sleep(20)
-            
-            # ==========  TENNIS  ==========
-            clear_basket(driver)
-            if get_balance(driver) < 2.0:
-                print("Balance < 2.0, skipping tennis.")
-                time.sleep(20)
-                continue
-
-            navigate_to_tennis_live(driver)
-            tennis_matches = scrape_tennis_matches(driver)
-            print(f"[TENNIS] Found {len(tennis_matches)} matches...")
-
-            for (match_el, match_info) in tennis_matches:
-                mid = match_info["match_id"]
-                if not mid:
-                    continue
-                if mid in bets_data["betted_matches"]:
-                    continue
-
-                stake_used, potential_win = place_tennis_bet(driver, match_el, match_info, bets_data)
-                if stake_used > 0:
-                    print(f"[TENNIS] Bet placed for match_id={mid}, potential={potential_win:.2f}...\n")
-
-            print("Done checking TENNIS. Sleep 20s...\n")
-            time.sleep(20)
-
-            # # ==========  INSPIRATION  ==========
-            # # One bet per copied coupon from high-success users
-            # clear_basket(driver)
-            # bets_data = bet_inspiration_coupons(driver, bets_data)
-            # print("Done checking Inspiration coupons. Sleeping 60s...\n")
-            # time.sleep(60)
-
+        sports = SPORTS
+        if args.tabs:
+            tabs = TabManager()
+            sports = [dict(sport, navigate=tabs.navigator(sport["name"], sport["navigate"])) for sport in SPORTS]
+
+        # one task per sport, each on its own cadence; they share the one
+        # browser, so their cycles take turns on a single executor thread
+        guard = BetGuard(bets_data)
+        session = (username, password, session_dir)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan")
+        jobs = [
+            (sport, partial(sport_cycle, driver, sport, bets_data, guard, None, session, args.tabs), executor)
+            for sport in sports
+        ]
+        if args.inspiration:
+            # one crawler for the whole run: its sessions, caches and ready
+            # queue carry over between cycles; bets go through `driver`
+            crawler = InspirationCrawler(start_crawler_drivers())
+            jobs.append((INSPIRATION, partial(inspiration_cycle, driver, bets_data, crawler), executor))
+        run_sports(jobs)
+
+    except KeyboardInterrupt:
+        print("Stopping sport scans...")
     finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        if crawler is not None:
+            crawler.close()
         driver.quit()
 
 if __name__ == "__main__":
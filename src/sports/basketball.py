@@ -1,14 +1,26 @@
-import time
 import re
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException
 
 from sports.football import parse_odd_text
-from common.bet_logic import get_balance, save_bets_data
+from common.balance import BALANCE
+from common.bet_logic import record_bet
+from common.live_tiles import (
+    LIVE_TILE_SELECTOR,
+    extract_live_tiles,
+    read_tile_elements,
+    scrape_tiles_lazily,
+    team_names,
+    odds_strings
+)
+from common.strategy import Strategy
+from common.urls import sts_url
+from common.ticket import place_single_bet, bet_possibly_placed
+from common.waits import wait_for_live_tiles
 
 def navigate_to_basketball_live(driver):
-    driver.get("https://www.sts.pl/live/koszykowka")
-    time.sleep(3)
+    driver.get(sts_url("/live/koszykowka"))
+    wait_for_live_tiles(driver, LIVE_TILE_SELECTOR)
 
 def parse_basketball_time(time_str):
     total_game_minutes = 40
@@ -39,65 +51,49 @@ def parse_basketball_time(time_str):
 
     return total_game_minutes, total_elapsed
 
-def scrape_basketball_matches(driver):
+def basketball_clock_fields(time_str):
+    total_game_minutes, total_elapsed = parse_basketball_time(time_str)
+    return {"total_game_minutes": total_game_minutes, "total_elapsed": total_elapsed}
+
+def basketball_minute(match_info):
+    return match_info["total_elapsed"]
+
+def basketball_info_from_tile(tile):
+    team_home, team_away = team_names(tile)
+    odd_1_str, odd_2_str = odds_strings(tile, 2)
+
+    return {
+        "match_id": tile["match_id"],
+        "team_home": team_home,
+        "team_away": team_away,
+        "time_str": tile["time_str"],
+        "partials": list(tile["partials"]),
+        **basketball_clock_fields(tile["time_str"]),
+        "odd_1": parse_odd_text(odd_1_str),
+        "odd_2": parse_odd_text(odd_2_str),
+    }
+
+def scrape_basketball_matches(driver, bulk=False, lazy=False, skip_ids=()):
+    if bulk:
+        return [
+            (tile["el"], basketball_info_from_tile(tile)) for tile in extract_live_tiles(driver)
+            if tile["match_id"] not in skip_ids
+        ]
+    if lazy:
+        return scrape_tiles_lazily(
+            driver, "BASKETBALL", basketball_info_from_tile, basketball_clock_fields, BASKETBALL_STRATEGY,
+            odds_count=2, skip_ids=skip_ids
+        )
+
     matches_data = []
-    all_match_containers = driver.find_elements(
-        By.CSS_SELECTOR, "div.collapsable-container bb-live-match-tile"
-    )
+
+    all_match_containers = driver.find_elements(By.CSS_SELECTOR, LIVE_TILE_SELECTOR)
 
     for match_el in all_match_containers:
         try:
-            anchor = match_el.find_element(By.CSS_SELECTOR, "a")
-            data_cy = anchor.get_attribute("data-cy")
-            href = anchor.get_attribute("href")
-
-            if data_cy and "/" in data_cy:
-                match_id = data_cy.split("/")[-1]
-            elif href and "/" in href:
-                match_id = href.split("/")[-1]
-            else:
-                match_id = None
-
-            team_elements = match_el.find_elements(
-                By.CSS_SELECTOR, ".match-tile-scoreboard-team__name span"
-            )
-            if len(team_elements) == 2:
-                team_home = team_elements[0].text.strip()
-                team_away = team_elements[1].text.strip()
-            else:
-                team_home = "Unknown"
-                team_away = "Unknown"
-
-            time_elements = match_el.find_elements(
-                By.CSS_SELECTOR, ".live-match-tile-time-details__game-name"
-            )
-            match_time_str = " / ".join(e.text for e in time_elements if e.text)
-
-            total_game_minutes, total_elapsed = parse_basketball_time(match_time_str)
-
-            odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-            if len(odds_buttons) >= 2:
-                odd_1_str = odds_buttons[0].find_element(By.CSS_SELECTOR, "[data-testid='odds-value']").text
-                odd_2_str = odds_buttons[1].find_element(By.CSS_SELECTOR, "[data-testid='odds-value']").text
-            else:
-                odd_1_str = "0.00"
-                odd_2_str = "0.00"
-
-            odd_1 = parse_odd_text(odd_1_str)
-            odd_2 = parse_odd_text(odd_2_str)
-
-            match_info = {
-                "match_id": match_id,
-                "team_home": team_home,
-                "team_away": team_away,
-                "time_str": match_time_str,
-                "total_game_minutes": total_game_minutes,
-                "total_elapsed": total_elapsed,
-                "odd_1": odd_1,
-                "odd_2": odd_2,
-            }
-
-            matches_data.append((match_el, match_info))
+            tile = read_tile_elements(match_el, odds_count=2)
+            if tile["match_id"] not in skip_ids:
+                matches_data.append((match_el, basketball_info_from_tile(tile)))
 
         except StaleElementReferenceException:
             print("[BASKETBALL] Stale element, skipping.")
@@ -107,33 +103,33 @@ def scrape_basketball_matches(driver):
 
     return matches_data
 
-def pick_basketball_bet_type(match_info):
-    total_game = match_info["total_game_minutes"]
+# Last 10% of the game, both odds in [1.20, 2.0] and max/min >= 1.25 => the favourite
+BASKETBALL_STRATEGY = Strategy("basketball", {
+    "conditions": [(("ratio", "total_elapsed", "total_game_minutes"), ">=", 0.9)],
+    "outcomes": [("home", "odd_1"), ("away", "odd_2")],
+    "odds_range": (1.20, 2.0),
+    "all_odds_in_range": True,
+    "min_odds_ratio": 1.25,
+})
+
+# Betting window of BASKETBALL_STRATEGY, for the poll scheduler
+WINDOW_RATIO = BASKETBALL_STRATEGY.params()["ratio(total_elapsed,total_game_minutes) >="]
+# the clock stops on every foul and timeout: real seconds per game minute
+BASKETBALL_CLOCK_RATIO = 2.2
+
+def basketball_seconds_to_window(match_info):
+    """
+    Estimated seconds until WINDOW_RATIO of the game clock has run
+    (0 inside the window, None when the clock could not be read).
+    """
+    total = match_info["total_game_minutes"]
     elapsed = match_info["total_elapsed"]
-    threshold_elapsed = 0.9 * total_game
-
-    if elapsed < threshold_elapsed:
+    if total <= 0 or elapsed <= 0:
         return None
+    return max(0.0, WINDOW_RATIO * total - elapsed) * 60 * BASKETBALL_CLOCK_RATIO
 
-    odd_1 = match_info["odd_1"]
-    odd_2 = match_info["odd_2"]
-
-    the_min = min(odd_1, odd_2)
-    the_max = max(odd_1, odd_2)
-
-    if the_min < 1.20:
-        return None
-    if the_max > 2.0:
-        return None
-
-    ratio = the_max / the_min
-    if ratio < 1.25:
-        return None
-
-    if odd_1 == the_min:
-        return ("home", odd_1)
-    else:
-        return ("away", odd_2)
+def pick_basketball_bet_type(match_info):
+    return BASKETBALL_STRATEGY.pick(match_info)
 
 def place_basketball_bet(driver, match_el, match_info, bets_data):
     """
@@ -151,69 +147,24 @@ def place_basketball_bet(driver, match_el, match_info, bets_data):
         return (0, 0)
 
     stake_used = 2.0
-    potential_win = 0.0
-
-    # 1) click correct odds
-    try:
-        odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-        for btn in odds_buttons:
-            try:
-                label_el = btn.find_element(By.CSS_SELECTOR, ".odds-button__label")
-                if label_el.text.strip().lower() == label_to_find.lower():
-                    btn.click()
-                    print(f"[BASKETBALL] Clicked odds '{label_el.text.strip()}' in tile.")
-                    time.sleep(2)
-                    break
-            except NoSuchElementException:
-                pass
-    except Exception as e:
-        print(f"[BASKETBALL place_bet] error selecting bet => {e}")
-        return (0, 0)
 
-    # 2) set stake
-    try:
-        stake_input = driver.find_element(By.CSS_SELECTOR, "sts-shared-input[data-cy='ticket-stake'] input#AMOUNT")
-        stake_input.clear()
-        stake_input.send_keys(str(stake_used))
-        print(f"[BASKETBALL] Stake set to {stake_used:.2f}")
-        time.sleep(2)
-    except NoSuchElementException:
-        print("[BASKETBALL] stake input not found => fail.")
+    # odds -> stake -> confirm -> ticket status, in one scripted step
+    result = place_single_bet(driver, match_el, label_to_find, odd_val, stake_used)
+    print(f"[BASKETBALL] Ticket {result['status']} in {result['elapsed_ms']:.0f} ms "
+          f"(odd {result['odd']:.2f}, potential win {result['potential_win']:.2f} zł) {result['message']}")
+    if not bet_possibly_placed(result):
         return (0, 0)
 
-    # 3) parse potential
-    try:
-        place_bet_button = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        potential_el = place_bet_button.find_element(By.CSS_SELECTOR, ".submit-button__content")
-        raw_text = potential_el.text.strip()
-        cleaned = raw_text.replace(",", ".").replace("zł","").replace("\xa0","").strip()
-        potential_win = float(cleaned)
-        print(f"[BASKETBALL] Potential win: {potential_win:.2f}")
-    except Exception:
-        print("[BASKETBALL] could not parse potential => 0.0")
-
-    # 4) confirm bet
-    try:
-        place_bet_button.click()
-        time.sleep(2)
-        place_bet_button = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        place_bet_button.click()
-        print("[BASKETBALL] Bet placed!")
-        time.sleep(3)
-    except NoSuchElementException:
-        print("[BASKETBALL] final bet button not found => partial fail.")
-
-    # 5) save immediately
-    if stake_used > 0:
-        bets_data["betted_matches"].add(match_info["match_id"])
-        bets_data["bets_details"].append({
-            "sport": "basketball",
-            "match_id": match_info["match_id"],
-            "teams": f"{match_info['team_home']} vs {match_info['team_away']}",
-            "stake": stake_used,
-            "potential_win": potential_win,
-            "balance_after": get_balance(driver),
-        })
-        save_bets_data(bets_data)
+    potential_win = result["potential_win"]
+    record_bet(bets_data, {
+        "sport": "basketball",
+        "match_id": match_info["match_id"],
+        "teams": f"{match_info['team_home']} vs {match_info['team_away']}",
+        "stake": stake_used,
+        "odd": result["odd"],
+        "potential_win": potential_win,
+        "status": result["status"],
+        "balance_after": BALANCE.estimate(),
+    })
 
     return (stake_used, potential_win)
@@ -1,14 +1,26 @@
-import time
 import re
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException
 
 from sports.football import parse_odd_text  # reuse parse_odd_text
-from common.bet_logic import get_balance, save_bets_data
+from common.balance import BALANCE
+from common.bet_logic import record_bet
+from common.live_tiles import (
+    LIVE_TILE_SELECTOR,
+    extract_live_tiles,
+    read_tile_elements,
+    scrape_tiles_lazily,
+    team_names,
+    odds_strings
+)
+from common.strategy import Strategy
+from common.urls import sts_url
+from common.ticket import place_single_bet, bet_possibly_placed
+from common.waits import wait_for_live_tiles
 
 def navigate_to_hockey_live(driver):
-    driver.get("https://www.sts.pl/live/hokej-na-lodzie")
-    time.sleep(3)
+    driver.get(sts_url("/live/hokej-na-lodzie"))
+    wait_for_live_tiles(driver, LIVE_TILE_SELECTOR)
 
 def parse_hockey_time(time_str):
     tercja = 0
@@ -23,69 +35,50 @@ def parse_hockey_time(time_str):
 
     return tercja, minute
 
-def scrape_hockey_matches(driver):
+def hockey_clock_fields(time_str):
+    tercja, minute_in_tercja = parse_hockey_time(time_str)
+    return {"tercja": tercja, "minute_in_tercja": minute_in_tercja}
+
+def hockey_minute(match_info):
+    return match_info["minute_in_tercja"]
+
+def hockey_info_from_tile(tile):
+    team_home, team_away = team_names(tile)
+    odd_home_str, odd_draw_str, odd_away_str = odds_strings(tile, 3)
+
+    return {
+        "match_id": tile["match_id"],
+        "team_home": team_home,
+        "team_away": team_away,
+        "time_str": tile["time_str"],
+        "partials": list(tile["partials"]),
+        **hockey_clock_fields(tile["time_str"]),
+        "odd_home": parse_odd_text(odd_home_str),
+        "odd_draw": parse_odd_text(odd_draw_str),
+        "odd_away": parse_odd_text(odd_away_str)
+    }
+
+def scrape_hockey_matches(driver, bulk=False, lazy=False, skip_ids=()):
+    if bulk:
+        return [
+            (tile["el"], hockey_info_from_tile(tile)) for tile in extract_live_tiles(driver)
+            if tile["match_id"] not in skip_ids
+        ]
+    if lazy:
+        return scrape_tiles_lazily(
+            driver, "HOCKEY", hockey_info_from_tile, hockey_clock_fields, HOCKEY_STRATEGY,
+            odds_count=3, skip_ids=skip_ids
+        )
+
     matches_data = []
 
-    all_match_containers = driver.find_elements(
-        By.CSS_SELECTOR, "div.collapsable-container bb-live-match-tile"
-    )
+    all_match_containers = driver.find_elements(By.CSS_SELECTOR, LIVE_TILE_SELECTOR)
 
     for match_el in all_match_containers:
         try:
-            anchor = match_el.find_element(By.CSS_SELECTOR, "a")
-            data_cy = anchor.get_attribute("data-cy")
-            href = anchor.get_attribute("href")
-
-            if data_cy and "/" in data_cy:
-                match_id = data_cy.split("/")[-1]
-            elif href and "/" in href:
-                match_id = href.split("/")[-1]
-            else:
-                match_id = None
-
-            team_elements = match_el.find_elements(By.CSS_SELECTOR, ".match-tile-scoreboard-team__name span")
-            if len(team_elements) == 2:
-                team_home = team_elements[0].text.strip()
-                team_away = team_elements[1].text.strip()
-            else:
-                team_home = "Unknown"
-                team_away = "Unknown"
-
-            time_elements = match_el.find_elements(By.CSS_SELECTOR, ".live-match-tile-time-details__game-name")
-            match_time_str = " / ".join(e.text for e in time_elements if e.text)
-
-            tercja, minute_in_tercja = parse_hockey_time(match_time_str)
-
-            odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-            if len(odds_buttons) >= 3:
-                odd_home_str = odds_buttons[0].find_element(
-                    By.CSS_SELECTOR, "[data-testid='odds-value']").text
-                odd_draw_str = odds_buttons[1].find_element(
-                    By.CSS_SELECTOR, "[data-testid='odds-value']").text
-                odd_away_str = odds_buttons[2].find_element(
-                    By.CSS_SELECTOR, "[data-testid='odds-value']").text
-            else:
-                odd_home_str = "0.00"
-                odd_draw_str = "0.00"
-                odd_away_str = "0.00"
-
-            odd_home = parse_odd_text(odd_home_str)
-            odd_draw = parse_odd_text(odd_draw_str)
-            odd_away = parse_odd_text(odd_away_str)
-
-            match_info = {
-                "match_id": match_id,
-                "team_home": team_home,
-                "team_away": team_away,
-                "time_str": match_time_str,
-                "tercja": tercja,
-                "minute_in_tercja": minute_in_tercja,
-                "odd_home": odd_home,
-                "odd_draw": odd_draw,
-                "odd_away": odd_away
-            }
-
-            matches_data.append((match_el, match_info))
+            tile = read_tile_elements(match_el, odds_count=3)
+            if tile["match_id"] not in skip_ids:
+                matches_data.append((match_el, hockey_info_from_tile(tile)))
 
         except StaleElementReferenceException:
             print("[HOCKEY] Stale element, skipping.")
@@ -95,26 +88,37 @@ def scrape_hockey_matches(driver):
 
     return matches_data
 
-def pick_hockey_bet_type(match_info):
-    if match_info["tercja"] != 3:
-        return None
-    if match_info["minute_in_tercja"] < 10:
-        return None
-
-    print(f"[HOCKEY] Checking match_id={match_info['match_id']} => tercja={match_info['tercja']}, "
-          f"minute_in_tercja={match_info['minute_in_tercja']}, raw='{match_info['time_str']}'")
-
-    candidates = [
-        ("home", match_info["odd_home"]),
-        ("draw", match_info["odd_draw"]),
-        ("away", match_info["odd_away"])
-    ]
-    valid = [(outcome, val) for (outcome, val) in candidates if 1.20 <= val <= 2.0]
-    if not valid:
+# 3rd period, minute >=10; lowest odd in [1.20, 2.0]
+HOCKEY_STRATEGY = Strategy("hockey", {
+    "conditions": [("tercja", "==", 3), ("minute_in_tercja", ">=", 10)],
+    "outcomes": [("home", "odd_home"), ("draw", "odd_draw"), ("away", "odd_away")],
+    "odds_range": (1.20, 2.0),
+})
+
+# Betting window of HOCKEY_STRATEGY, for the poll scheduler
+WINDOW_TERCJA = HOCKEY_STRATEGY.params()["tercja =="]
+WINDOW_MINUTE = HOCKEY_STRATEGY.params()["minute_in_tercja >="]
+TERCJA_MINUTES = 20
+# the clock stops a lot: real seconds per game minute
+HOCKEY_CLOCK_RATIO = 1.7
+INTERMISSION_SECONDS = 18 * 60
+
+def hockey_seconds_to_window(match_info):
+    """
+    Estimated seconds until minute WINDOW_MINUTE of tercja WINDOW_TERCJA
+    (0 inside the window, None when past it or the clock is unknown).
+    """
+    tercja = match_info["tercja"]
+    minute = match_info["minute_in_tercja"]
+    if tercja == 0 or tercja > WINDOW_TERCJA:
         return None
+    if tercja == WINDOW_TERCJA:
+        return max(0, WINDOW_MINUTE - minute) * 60 * HOCKEY_CLOCK_RATIO
+    game_minutes = (TERCJA_MINUTES - minute) + (WINDOW_TERCJA - tercja - 1) * TERCJA_MINUTES + WINDOW_MINUTE
+    return game_minutes * 60 * HOCKEY_CLOCK_RATIO + (WINDOW_TERCJA - tercja) * INTERMISSION_SECONDS
 
-    best_outcome, best_odd = min(valid, key=lambda x: x[1])
-    return best_outcome, best_odd
+def pick_hockey_bet_type(match_info):
+    return HOCKEY_STRATEGY.pick(match_info)
 
 def place_hockey_bet(driver, match_el, match_info, bets_data):
     """
@@ -131,70 +135,25 @@ def place_hockey_bet(driver, match_el, match_info, bets_data):
         print(f"[HOCKEY] Unknown bet type: {outcome}")
         return (0, 0)
 
-    # 1) click the correct odds button
-    try:
-        odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-        for btn in odds_buttons:
-            try:
-                label_el = btn.find_element(By.CSS_SELECTOR, ".odds-button__label")
-                if label_el.text.strip().lower() == label_to_find.lower():
-                    btn.click()
-                    print(f"[HOCKEY] Clicked odds '{label_el.text.strip()}' in tile.")
-                    time.sleep(2)
-                    break
-            except NoSuchElementException:
-                pass
-    except Exception as e:
-        print(f"[HOCKEY place_bet] Error selecting bet: {e}")
-        return (0, 0)
-
     stake_used = 2.0
-    potential_win = 0.0
-
-    # 2) set stake
-    try:
-        stake_input = driver.find_element(By.CSS_SELECTOR, "sts-shared-input[data-cy='ticket-stake'] input#AMOUNT")
-        stake_input.clear()
-        stake_input.send_keys(str(stake_used))
-        print(f"[HOCKEY] Stake set to {stake_used:.2f}")
-        time.sleep(2)
-    except NoSuchElementException:
-        print("[HOCKEY] stake input not found => fail.")
+
+    # odds -> stake -> confirm -> ticket status, in one scripted step
+    result = place_single_bet(driver, match_el, label_to_find, odd_val, stake_used)
+    print(f"[HOCKEY] Ticket {result['status']} in {result['elapsed_ms']:.0f} ms "
+          f"(odd {result['odd']:.2f}, potential win {result['potential_win']:.2f} zł) {result['message']}")
+    if not bet_possibly_placed(result):
         return (0, 0)
 
-    # 3) parse potential
-    try:
-        place_bet_button = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        potential_el = place_bet_button.find_element(By.CSS_SELECTOR, ".submit-button__content")
-        raw_text = potential_el.text.strip()
-        cleaned = raw_text.replace(",", ".").replace("zł", "").replace("\xa0", "").strip()
-        potential_win = float(cleaned)
-        print(f"[HOCKEY] Potential win: {potential_win:.2f}")
-    except Exception:
-        print("[HOCKEY] Could not parse potential => 0.0")
-
-    # 4) confirm bet (some sites need two clicks)
-    try:
-        place_bet_button.click()
-        time.sleep(2)
-        place_bet_button = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        place_bet_button.click()
-        print("[HOCKEY] Bet placed!")
-        time.sleep(3)
-    except NoSuchElementException:
-        print("[HOCKEY] final bet button not found => partial fail.")
-
-    # 5) Immediately save
-    if stake_used > 0:
-        bets_data["betted_matches"].add(match_info["match_id"])
-        bets_data["bets_details"].append({
-            "sport": "hockey",
-            "match_id": match_info["match_id"],
-            "teams": f"{match_info['team_home']} vs {match_info['team_away']}",
-            "stake": stake_used,
-            "potential_win": potential_win,
-            "balance_after": get_balance(driver),
-        })
-        save_bets_data(bets_data)
+    potential_win = result["potential_win"]
+    record_bet(bets_data, {
+        "sport": "hockey",
+        "match_id": match_info["match_id"],
+        "teams": f"{match_info['team_home']} vs {match_info['team_away']}",
+        "stake": stake_used,
+        "odd": result["odd"],
+        "potential_win": potential_win,
+        "status": result["status"],
+        "balance_after": BALANCE.estimate(),
+    })
 
     return (stake_used, potential_win)
@@ -1,16 +1,38 @@
 # sports/inspiration.py
 
-import time
 import re
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from common.bet_logic import get_balance, save_bets_data
+from common.balance import BALANCE
+from common.bet_logic import record_bet, clear_basket
+from common.browser import create_driver, resolve_driver_path
+from common.coupon_feed import drain_coupon_log, collect_coupons
+from common.lean import report_page
+from common.ttl_cache import TTLCache
+from common.urls import sts_url
+from common.waits import (
+    STAKE_INPUT_SELECTOR,
+    PLACE_BET_SELECTOR,
+    STATUS_DIALOG_SELECTOR,
+    wait_until,
+    wait_for_page_ready,
+    wait_for_element,
+    wait_for_invisibility
+)
+
+COUPON_ID_SELECTOR = "p.coupon-details__body-info-item-value.copied-info"
+PAGINATION_SELECTOR = "div.sts-bonus-components__pagination-page"
 
 def go_to_inspiration_page(driver):
-    driver.get("https://www.sts.pl/strefa-inspiracji/polecamy")
-    time.sleep(3)
+    driver.get(sts_url("/strefa-inspiracji/polecamy"))
+    wait_for_page_ready(driver)
+    wait_for_element(driver, "div.coupons-zone__profiles-info", "inspiration_page")
 
 def find_inspiration_users(driver):
     """
@@ -46,7 +68,7 @@ def get_coupon_id(driver, timeout=10):
         wait = WebDriverWait(driver, timeout)
         el = wait.until(
             EC.presence_of_element_located(
-                (By.CSS_SELECTOR, "p.coupon-details__body-info-item-value.copied-info")
+                (By.CSS_SELECTOR, COUPON_ID_SELECTOR)
             )
         )
         coupon_str = el.text.strip()
@@ -61,19 +83,21 @@ def copy_coupon(driver):
     Click the copy icon => <sts-shared-icon-button iconname="icon-copy"...>
     Return True if success
     """
-    time.sleep(2)
-    try:
-        copy_button = driver.find_element(
-            By.CSS_SELECTOR,
-            "sts-shared-icon-button[iconname='icon-copy'] div.icon-button__icon i.icon.icon-copy"
-        )
-        copy_button.click()
-        print("[INSP] Copied coupon to basket.")
-        time.sleep(2)
-        return True
-    except NoSuchElementException:
+    copy_button = wait_for_element(
+        driver,
+        "sts-shared-icon-button[iconname='icon-copy'] div.icon-button__icon i.icon.icon-copy",
+        "coupon_copy",
+        clickable=True
+    )
+    if copy_button is None:
         return False
 
+    copy_button.click()
+    print("[INSP] Copied coupon to basket.")
+    # the ticket shows the stake input once the coupon landed in the basket
+    wait_for_element(driver, STAKE_INPUT_SELECTOR, "ticket_open")
+    return True
+
 def place_inspiration_bet(driver, coupon_id, bets_data, stake=2.0):
     """
     1) stake=2
@@ -89,36 +113,28 @@ def place_inspiration_bet(driver, coupon_id, bets_data, stake=2.0):
     potential = 0.0
 
     # A) set stake
-    try:
-        stake_input = driver.find_element(
-            By.CSS_SELECTOR,
-            "sts-shared-input[data-cy='ticket-stake'] input#AMOUNT"
-        )
-        stake_input.clear()
-        stake_input.send_keys(str(stake))
-        print(f"[INSP] Stake set to {stake:.2f}")
-        used_stake = stake
-        time.sleep(1)
-    except NoSuchElementException:
+    stake_input = wait_for_element(driver, STAKE_INPUT_SELECTOR, "ticket_open", clickable=True)
+    if stake_input is None:
         print("[INSP] stake input not found => fail.")
         return (0, 0)
+    stake_input.clear()
+    stake_input.send_keys(str(stake))
+    print(f"[INSP] Stake set to {stake:.2f}")
+    used_stake = stake
 
     # B) click "Obstaw i graj" once
-    try:
-        bet_btn = driver.find_element(
-            By.CSS_SELECTOR, 
-            "button[data-testid='button-place-a-bet']"
-        )
-        bet_btn.click()
-        print("[INSP] Clicked 'Obstaw i graj' once.")
-        time.sleep(2)
-    except NoSuchElementException:
+    bet_btn = wait_for_element(driver, PLACE_BET_SELECTOR, "ticket_open", clickable=True)
+    if bet_btn is None:
         print("[INSP] No 'Obstaw i graj' button => fail.")
         return (0, 0)
+    bet_btn.click()
+    print("[INSP] Clicked 'Obstaw i graj' once.")
 
     # C) parse final success overlay
-    try:
-        success_box = driver.find_element(By.CSS_SELECTOR, "div.status-dialog-content__description")
+    success_box = wait_for_element(driver, STATUS_DIALOG_SELECTOR, "status_dialog")
+    if success_box is None:
+        print("[INSP] no success overlay => potential=0.0")
+    else:
         raw_text = success_box.text
         match = re.search(r"Możesz wygrać\s*([\d\.,]+)\s*zł", raw_text)
         if match:
@@ -135,24 +151,20 @@ def place_inspiration_bet(driver, coupon_id, bets_data, stake=2.0):
                 "//button[contains(@class,'static-button') and contains(.,'OK, zamknij')]"
             )
             ok_close_btn.click()
-            time.sleep(1)
+            wait_for_invisibility(driver, STATUS_DIALOG_SELECTOR, "status_dialog")
             print("[INSP] Clicked 'OK, zamknij' to close overlay.")
         except NoSuchElementException:
             print("[INSP] 'OK, zamknij' not found => maybe auto-closed.")
-    except NoSuchElementException:
-        print("[INSP] no success overlay => potential=0.0")
 
     # E) If used_stake > 0 => store in JSON
     if used_stake > 0:
-        bets_data["betted_coupons"].add(coupon_id)
-        bets_data["bets_details"].append({
+        record_bet(bets_data, {
             "sport": "inspiration",
             "coupon_id": coupon_id,
             "stake": used_stake,
             "potential_win": potential,
-            "balance_after": get_balance(driver),
+            "balance_after": BALANCE.spend(used_stake),
         })
-        save_bets_data(bets_data)
 
     return (used_stake, potential)
 
@@ -162,12 +174,12 @@ def go_to_next_coupon_page(driver):
     If current < total => click next => return True
     else return False
     """
-    time.sleep(2)
+    pagination_info = wait_for_element(driver, PAGINATION_SELECTOR, "coupon_page")
+    if pagination_info is None:
+        print("[INSP] No pagination or next button => no more coupons.")
+        return False
+
     try:
-        pagination_info = driver.find_element(
-            By.CSS_SELECTOR,
-            "div.sts-bonus-components__pagination-page"
-        )
         text = pagination_info.text.strip()  # e.g. "Kupon 2 z 3"
         text = text.replace("\xa0"," ")
         match = re.search(r"(?i)Kupon\s*(\d+)\s*[^\d]+\s*(\d+)", text)
@@ -185,9 +197,12 @@ def go_to_next_coupon_page(driver):
             By.CSS_SELECTOR,
             "sts-shared-static-button[icon='icon-next'] button.secondary.small.static.static-button.only-icon:not(.disabled)"
         )
+        old_coupon_els = driver.find_elements(By.CSS_SELECTOR, COUPON_ID_SELECTOR)
+        old_coupon_id = old_coupon_els[0].text.strip() if old_coupon_els else None
+
         next_btn.click()
         print(f"[INSP] Moved to next coupon => (current was {current_num}, total={total_num})")
-        time.sleep(3)
+        wait_for_coupon_page(driver, current_num + 1, old_coupon_id)
         return True
     except NoSuchElementException:
         print("[INSP] No pagination or next button => no more coupons.")
@@ -196,62 +211,345 @@ def go_to_next_coupon_page(driver):
         print(f"[INSP] Problem reading pagination => {e}")
         return False
 
-def bet_inspiration_coupons(driver, bets_data):
+def wait_for_coupon_page(driver, page_num, old_coupon_id):
     """
-    1) go_to_inspiration_page
-    2) for each user with success>=79 => open
-       while True => get coupon_id => if not bet => copy => place => next
+    After clicking next: wait until pagination says "Kupon <page_num> ..."
+    and the coupon details no longer show the previous coupon_id.
+    """
+    def next_coupon_shown(d):
+        text = d.find_element(By.CSS_SELECTOR, PAGINATION_SELECTOR).text.replace("\xa0", " ")
+        match = re.search(r"(?i)Kupon\s*(\d+)", text)
+        if not match or int(match.group(1)) != page_num:
+            return False
+        coupon_els = d.find_elements(By.CSS_SELECTOR, COUPON_ID_SELECTOR)
+        return bool(coupon_els) and coupon_els[0].text.strip() != old_coupon_id
+
+    return bool(wait_until(driver, next_coupon_shown, "coupon_page"))
+
+# Users under this success rate (%) are not copied
+MIN_SUCCESS_RATE = 79
+# Browser sessions the crawler reads users/coupons with (public pages, no login)
+CRAWL_WORKERS = 3
+# How long a user's success rate, a crawled user and a finished coupon are remembered
+SUCCESS_TTL = 30 * 60
+USER_TTL = 10 * 60
+SEEN_TTL = 12 * 60 * 60
+
+# Scheduled next to the sports by sports.orchestrator (same keys as a SPORTS entry)
+INSPIRATION = {
+    "name": "INSPIRATION",
+    "interval": 60,
+    "timeout": 600,
+}
+
+# Every user box on the inspiration page in one call. A user is keyed by a
+# stable attribute of the box (data-id/id, else its profile link); the box
+# index is the last resort. `name` (first text line) is only for the log.
+READ_USERS_JS = """
+const rateSelector = ".coupons-zone__profile-info-item-details-stats-badge-content-value";
+const idOf = (el) => el && (el.getAttribute("data-id") || el.getAttribute("data-user-id") || el.getAttribute("id"));
+return Array.from(
+    document.querySelectorAll("div.coupons-zone__profiles-info sts-coupons-zone-profile-info")
+).map((box, index) => {
+    const rate = box.querySelector(rateSelector);
+    const link = box.querySelector("a[href]");
+    return {
+        index: index,
+        key: idOf(box) || idOf(box.firstElementChild) || (link ? link.getAttribute("href") : "") || ("#" + index),
+        name: (box.innerText || "").trim().split("\\n")[0].trim(),
+        rate: rate ? (rate.textContent || "").trim() : "",
+    };
+});
+"""
+
+def parse_success_rate(text):
+    try:
+        return float(text.replace("%", "").replace("\xa0", "").replace(",", ".").strip())
+    except ValueError:
+        return 0.0
+
+def open_user(driver, key, before_click=None):
+    """
+    Load the inspiration page and open the user box with `key` (see
+    READ_USERS_JS; boxes move around between visits, so they are found by key).
+    before_click(driver) runs right before the box is clicked.
     """
     go_to_inspiration_page(driver)
-    user_boxes = find_inspiration_users(driver)
-    print(f"[INSP] Found {len(user_boxes)} user boxes in strefa-inspiracji.")
+    users = driver.execute_script(READ_USERS_JS)
+    index = next((u["index"] for u in users if u["key"] == key), None)
+    boxes = find_inspiration_users(driver)
+    if index is None or index >= len(boxes):
+        print(f"[INSP] User {key} is no longer listed.")
+        return False
+    try:
+        if before_click is not None:
+            before_click(driver)
+        boxes[index].click()
+    except Exception as e:
+        print(f"[INSP] Could not click user box => {e}")
+        return False
+    return True
 
-    for box in user_boxes:
-        success = get_user_success_rate(box)
-        print(f"[INSP] success={success:.2f}% for this user box.")
-        if success < 79:
-            continue
+def coupon_count(driver):
+    """
+    M of "Kupon N z M" on an opened profile; 1 without pagination, None
+    when the pagination text cannot be parsed.
+    """
+    pagination_info = wait_for_element(driver, PAGINATION_SELECTOR, "coupon_page")
+    if pagination_info is None:
+        return 1
+    text = pagination_info.text.strip().replace("\xa0", " ")
+    match = re.search(r"(?i)Kupon\s*(\d+)\s*[^\d]+\s*(\d+)", text)
+    if not match:
+        print(f"[INSP] Could not parse pagination => '{text}'")
+        return None
+    return int(match.group(2))
+
+def walk_user_coupons(driver):
+    """
+    [(page, coupon_id)] of the opened user, clicking through the pagination.
+    """
+    coupons = []
+    page = 1
+    while True:
+        coupon_id = get_coupon_id(driver)
+        if not coupon_id:
+            break
+        coupons.append((page, coupon_id))
+        if not go_to_next_coupon_page(driver):
+            break
+        page += 1
+    return [(page, coupon_id, None) for (page, coupon_id) in coupons]
+
+def find_coupon_page(driver, coupon_id):
+    """
+    Click through the opened user's coupons from page 1 until `coupon_id`
+    shows. Returns its page, 0 when every page was read without it, None
+    when a page could not be read (the walk broke off).
+    """
+    page = 1
+    while True:
+        shown = get_coupon_id(driver)
+        if shown is None:
+            return None
+        if shown == coupon_id:
+            return page
+        if not go_to_next_coupon_page(driver):
+            return 0
+        page += 1
+
+def discover_user_coupons(driver, key, name=""):
+    """
+    Open user `key` and return [(page, coupon_id, legs)] of all their
+    coupons. With a network-capturing driver they are read in one pass from
+    the responses the profile loads (see common.coupon_feed), no pagination
+    clicks, as long as all M of "Kupon N z M" arrive. Otherwise the
+    pagination is walked (walk_user_coupons), keeping the legs the network
+    did deliver. None when the user could not be opened.
+    """
+    capture = getattr(driver, "capture_network", False)
+    if not open_user(driver, key, before_click=drain_coupon_log if capture else None):
+        return None
+    if not capture:
+        return walk_user_coupons(driver)
+
+    total = coupon_count(driver)
+    coupons = collect_coupons(driver, expected=total)
+    if total is not None and len(coupons) >= total:
+        print(f"[INSP] {name or key}: {len(coupons)} coupon(s) from network responses.")
+        return coupons
+    print(f"[INSP] {name or key}: {len(coupons)}/{total if total is not None else '?'} coupon(s) "
+          f"from the network => paginating.")
+    legs = {coupon_id: coupon_legs for (_, coupon_id, coupon_legs) in coupons}
+    return [(page, coupon_id, legs.get(coupon_id)) for (page, coupon_id, _) in walk_user_coupons(driver)]
+
+class InspirationCrawler:
+    """
+    Reads the inspiration zone with several browser sessions at once and
+    keeps `ready`: a queue of {"coupon_id", "user" (key), "page", "legs"} not bet yet,
+    from users with at least MIN_SUCCESS_RATE. Success rates and crawled
+    users are cached with a TTL, so a repeat crawl only opens users whose
+    coupons may have changed. A coupon stays out of the queue while it is
+    in it, and for SEEN_TTL once the bettor reports it finished (bet, or
+    gone from the profile); see finish_coupon.
+    """
+
+    def __init__(self, drivers, min_success_rate=MIN_SUCCESS_RATE):
+        self.drivers = drivers
+        self.min_success_rate = min_success_rate
+        self.rates = TTLCache(SUCCESS_TTL)
+        self.crawled_users = TTLCache(USER_TTL)
+        self.seen_coupons = TTLCache(SEEN_TTL)
+        self.queued = set()
+        self.ready = queue.Queue()
+        self.lock = threading.Lock()
+
+    def read_users(self, driver):
+        go_to_inspiration_page(driver)
+        report_page(driver, "INSPIRATION")
+        users = []
+        for user in driver.execute_script(READ_USERS_JS):
+            rate = self.rates.get(user["key"])
+            if rate is None:
+                rate = parse_success_rate(user["rate"])
+                self.rates.put(user["key"], rate)
+            users.append({"key": user["key"], "name": user["name"], "rate": rate})
+        return users
+
+    def crawl_worker(self, driver, users, betted_coupons):
+        queued = 0
+        while True:
+            try:
+                user = users.get_nowait()
+            except queue.Empty:
+                return queued
+            coupons = discover_user_coupons(driver, user["key"], user["name"])
+            if coupons is None:
+                continue
+            for page, coupon_id, legs in coupons:
+                with self.lock:
+                    # two users can share a copied coupon
+                    if coupon_id in betted_coupons or coupon_id in self.seen_coupons or coupon_id in self.queued:
+                        continue
+                    self.queued.add(coupon_id)
+                self.ready.put({"coupon_id": coupon_id, "user": user["key"], "page": page, "legs": legs})
+                queued += 1
+            self.crawled_users.put(user["key"])
 
-        # open user
+    def crawl(self, betted_coupons):
+        """
+        Fill `ready`; returns how many coupons were queued.
+        """
+        start = time.perf_counter()
+        users = queue.Queue()
+        listed = self.read_users(self.drivers[0])
+        for user in listed:
+            if user["rate"] >= self.min_success_rate and user["key"] not in self.crawled_users:
+                users.put(user)
+        to_crawl = users.qsize()
+        with ThreadPoolExecutor(max_workers=len(self.drivers)) as pool:
+            futures = [pool.submit(self.crawl_worker, d, users, betted_coupons) for d in self.drivers]
+            queued = 0
+            for future in futures:
+                try:
+                    queued += future.result()
+                except Exception as e:
+                    print(f"[INSP] Crawler session failed: {e}")
+        print(f"[INSP] {len(listed)} users, {to_crawl} crawled, {queued} new coupon(s) "
+              f"in {time.perf_counter() - start:.1f}s.")
+        return queued
+
+    def finish_coupon(self, coupon_id, seen):
+        """
+        The bettor is done with a queued coupon. seen=True (bet, or gone from
+        the profile) keeps it out of the queue for SEEN_TTL; seen=False (a
+        failed copy or bet) lets the next crawl of its user queue it again.
+        """
+        with self.lock:
+            self.queued.discard(coupon_id)
+            if seen:
+                self.seen_coupons.put(coupon_id)
+
+    def close(self):
+        quit_drivers(self.drivers)
+
+def quit_drivers(drivers):
+    for driver in drivers:
         try:
-            box.click()
-            time.sleep(2)
+            driver.quit()
         except Exception as e:
-            print(f"[INSP] Could not click user box => {e}")
+            print(f"[INSP] Could not close crawler session: {e}")
+
+def start_crawler_drivers(count=CRAWL_WORKERS):
+    """
+    Lean headless sessions for the crawler (the inspiration zone is public),
+    capturing network responses so coupons are read without pagination.
+    If any session fails to start, the ones that did are quit before the
+    error is re-raised.
+    """
+    driver_path = resolve_driver_path()
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [
+            pool.submit(create_driver, driver_path, capture_network=True, lean=True) for _ in range(count)
+        ]
+    drivers, error = [], None
+    for future in futures:
+        try:
+            drivers.append(future.result())
+        except Exception as e:
+            error = error or e
+    if error is not None:
+        print(f"[INSP] Crawler session failed to start: {error}")
+        quit_drivers(drivers)
+        raise error
+    return drivers
+
+def bet_inspiration_coupons(driver, bets_data, crawler):
+    """
+    Crawl with `crawler` (a long-lived InspirationCrawler, so its caches and
+    ready queue carry over between calls), then copy and bet every ready
+    coupon with `driver`. Coupons of the same user are taken in page order,
+    so each user is opened once.
+    """
+    crawler.crawl(bets_data["betted_coupons"])
+
+    current_user, current_page = None, 0
+    while True:
+        try:
+            coupon = crawler.ready.get_nowait()
+        except queue.Empty:
+            break
+        if coupon["coupon_id"] in bets_data["betted_coupons"]:
+            crawler.finish_coupon(coupon["coupon_id"], seen=True)
             continue
 
-        while True:
-            coupon_id = get_coupon_id(driver)
-            if not coupon_id:
-                print("[INSP] No coupon ID found => stopping this user.")
-                break
-
-            if coupon_id in bets_data["betted_coupons"]:
-                print(f"[INSP] Already bet coupon {coupon_id} => next page.")
-                if not go_to_next_coupon_page(driver):
-                    time.sleep(5)
-                    break
+        if coupon["user"] != current_user or coupon["page"] < current_page:
+            current_user, current_page = None, 0
+            if not open_user(driver, coupon["user"]):
+                crawler.finish_coupon(coupon["coupon_id"], seen=False)
                 continue
-
-            # copy to basket
-            if not copy_coupon(driver):
-                print("[INSP] Could not copy coupon => skip or next page")
-                if not go_to_next_coupon_page(driver):
-                    time.sleep(5)
-                    break
+            current_user, current_page = coupon["user"], 1
+        while current_page < coupon["page"] and go_to_next_coupon_page(driver):
+            current_page += 1
+        if current_page != coupon["page"] or get_coupon_id(driver) != coupon["coupon_id"]:
+            # network pages are in response order, which may not be the
+            # pagination order: look for the coupon on every page
+            print(f"[INSP] Coupon {coupon['coupon_id']} not on page {coupon['page']} => searching.")
+            current_user = None
+            if not open_user(driver, coupon["user"]):
+                crawler.finish_coupon(coupon["coupon_id"], seen=False)
                 continue
+            page = find_coupon_page(driver, coupon["coupon_id"])
+            if not page:
+                print(f"[INSP] Coupon {coupon['coupon_id']} "
+                      f"{'is gone' if page == 0 else 'could not be found'} => skip.")
+                # gone for good only when every page was read
+                crawler.finish_coupon(coupon["coupon_id"], seen=page == 0)
+                continue
+            current_user, current_page = coupon["user"], page
 
-            # place bet => save
-            stake_used, potential_win = place_inspiration_bet(driver, coupon_id, bets_data)
-            if stake_used == 0:
-                print("[INSP] Bet not placed => skip coupon.")
-            # else we already saved in place_inspiration_bet
-
-            # next page?
-            if not go_to_next_coupon_page(driver):
-                time.sleep(5)
-                break
+        # copy to basket
+        if not copy_coupon(driver):
+            print("[INSP] Could not copy coupon => skip.")
+            crawler.finish_coupon(coupon["coupon_id"], seen=False)
+            continue
 
-        time.sleep(2)
+        # place bet => save
+        stake_used, potential_win = place_inspiration_bet(driver, coupon["coupon_id"], bets_data)
+        if stake_used == 0:
+            print("[INSP] Bet not placed => skip coupon.")
+            # the copied legs must not ride along with the next coupon
+            clear_basket(driver)
+            current_user = None
+        # else we already saved in place_inspiration_bet
+        crawler.finish_coupon(coupon["coupon_id"], seen=stake_used > 0)
 
     return bets_data
+
+def inspiration_cycle(driver, bets_data, crawler):
+    """
+    One clear_basket -> crawl -> bet pass (blocking; run by sports.orchestrator).
+    """
+    clear_basket(driver)
+    bet_inspiration_coupons(driver, bets_data, crawler)
+    return INSPIRATION["interval"]
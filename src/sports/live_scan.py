@@ -0,0 +1,380 @@
+# sports/live_scan.py
+
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from common.bet_guard import BetGuard
+from common.balance import BALANCE
+from common.bet_logic import load_bets_data, clear_basket
+from common.browser import create_driver, resolve_driver_path
+from common.call_trace import trace_driver_calls, report_calls
+from common.lean import report_page
+from common.live_tiles import find_tile_element
+from common.match_book import MatchBook
+from common.metrics import timed, TILES_SCRAPED, CANDIDATES, BETS_PLACED, CYCLES
+from common.odds_feed import LiveOddsFeed
+from common.odds_recorder import RECORDER
+from common.session import profile_dir, resume_session, save_session, is_logged_in
+from common.startup import STARTUP
+from common.tile_stream import LiveTileTable
+
+from sports.football import (
+    navigate_to_football_live,
+    scrape_football_matches,
+    FOOTBALL_STRATEGY,
+    football_info_from_tile,
+    football_minute,
+    football_seconds_to_window,
+    place_bet as place_football_bet
+)
+from sports.hockey import (
+    navigate_to_hockey_live,
+    scrape_hockey_matches,
+    HOCKEY_STRATEGY,
+    hockey_info_from_tile,
+    hockey_minute,
+    hockey_seconds_to_window,
+    place_hockey_bet
+)
+from sports.basketball import (
+    navigate_to_basketball_live,
+    scrape_basketball_matches,
+    BASKETBALL_STRATEGY,
+    basketball_info_from_tile,
+    basketball_minute,
+    basketball_seconds_to_window,
+    place_basketball_bet
+)
+from sports.orchestrator import run_sports, next_poll_delay, HOT_ODDS_MARGIN
+from sports.tennis import (
+    navigate_to_tennis_live,
+    scrape_tennis_matches,
+    TENNIS_STRATEGY,
+    tennis_info_from_tile,
+    tennis_minute,
+    tennis_seconds_to_window,
+    place_tennis_bet
+)
+
+# How live pages are read (main.py --scrape):
+#   "bulk": the whole page in one execute_script
+#   "lazy": per-element calls, odds/names only for tiles inside the time window
+#   "full": per-element calls for every field of every tile
+SCRAPE_MODES = ("bulk", "lazy", "full")
+SCRAPE_MODE = "bulk"
+
+def set_scrape_mode(mode):
+    global SCRAPE_MODE
+    if mode not in SCRAPE_MODES:
+        raise ValueError(f"Unknown scrape mode {mode!r}; one of {SCRAPE_MODES}")
+    SCRAPE_MODE = mode
+
+STAKE = 2.0
+# Cadence per sport when a cycle fails (each SPORTS entry has its own
+# "interval"); successful cycles are scheduled from the match clocks
+SLEEP_AFTER_SPORT = 20
+SLEEP_LOW_BALANCE = 60
+# A scan cycle running longer than this is reported and backed off
+CYCLE_TIMEOUT = 180
+
+SPORTS = [
+    {
+        "name": "FOOTBALL",
+        "navigate": navigate_to_football_live,
+        "scrape": scrape_football_matches,
+        "info_from_tile": football_info_from_tile,
+        "strategy": FOOTBALL_STRATEGY,
+        "book": MatchBook(FOOTBALL_STRATEGY.odds_keys, football_minute),
+        "seconds_to_window": football_seconds_to_window,
+        "interval": SLEEP_AFTER_SPORT,
+        "timeout": CYCLE_TIMEOUT,
+        "place": place_football_bet,
+    },
+    {
+        "name": "HOCKEY",
+        "navigate": navigate_to_hockey_live,
+        "scrape": scrape_hockey_matches,
+        "info_from_tile": hockey_info_from_tile,
+        "strategy": HOCKEY_STRATEGY,
+        "book": MatchBook(HOCKEY_STRATEGY.odds_keys, hockey_minute),
+        "seconds_to_window": hockey_seconds_to_window,
+        "interval": SLEEP_AFTER_SPORT,
+        "timeout": CYCLE_TIMEOUT,
+        "place": place_hockey_bet,
+    },
+    {
+        "name": "BASKETBALL",
+        "navigate": navigate_to_basketball_live,
+        "scrape": scrape_basketball_matches,
+        "info_from_tile": basketball_info_from_tile,
+        "strategy": BASKETBALL_STRATEGY,
+        "book": MatchBook(BASKETBALL_STRATEGY.odds_keys, basketball_minute),
+        "seconds_to_window": basketball_seconds_to_window,
+        "interval": SLEEP_AFTER_SPORT,
+        "timeout": CYCLE_TIMEOUT,
+        "place": place_basketball_bet,
+    },
+    {
+        "name": "TENNIS",
+        "navigate": navigate_to_tennis_live,
+        "scrape": scrape_tennis_matches,
+        "info_from_tile": tennis_info_from_tile,
+        "strategy": TENNIS_STRATEGY,
+        "book": MatchBook(TENNIS_STRATEGY.odds_keys, tennis_minute),
+        "seconds_to_window": tennis_seconds_to_window,
+        "interval": SLEEP_AFTER_SPORT,
+        "timeout": CYCLE_TIMEOUT,
+        "place": place_tennis_bet,
+    },
+]
+
+def match_teams(match_info):
+    if "player1" in match_info:
+        return f"{match_info['player1']} vs {match_info['player2']}"
+    return f"{match_info['team_home']} vs {match_info['team_away']}"
+
+def scrape_mode_in_use(read_all=False):
+    """
+    SCRAPE_MODE as read_matches applies it: lazy leaves tiles out, so
+    read_all falls back to full.
+    """
+    return "full" if read_all and SCRAPE_MODE == "lazy" else SCRAPE_MODE
+
+def read_matches(driver, sport, source=None, skip_ids=(), read_all=False):
+    """
+    (match_el, match_info) pairs for a sport. `source` is an optional
+    long-lived view of the page (LiveOddsFeed or LiveTileTable) that only
+    navigates/re-reads when it has to; match_el may be None for feed records.
+    Scrapers leave out `skip_ids` (and, when lazy, tiles outside the time
+    window); read_all=True reads every tile regardless.
+    """
+    name = sport["name"]
+    if source is not None:
+        # navigates only when the source has to resync
+        with timed("scrape", name):
+            matches = source.read(driver, sport["navigate"])
+    else:
+        with timed("navigate", name):
+            sport["navigate"](driver)
+        mode = scrape_mode_in_use(read_all)
+        with timed("scrape", name):
+            matches = sport["scrape"](
+                driver, bulk=mode == "bulk", lazy=mode == "lazy",
+                skip_ids=() if read_all else skip_ids
+            )
+    TILES_SCRAPED.inc(len(matches), sport=name)
+    STARTUP.first_scrape(name)
+    report_page(driver, name)
+
+    print(f"[{name}] Found {len(matches)} matches...")
+    return matches
+
+def scan_sport(driver, sport, bets_data, guard=None, source=None):
+    """
+    One scrape -> pick -> place pass over a sport's live page.
+    Returns the match_info of every match that was not bet before the pass.
+    Every scrape is added to the sport's MatchBook first, so the Strategy
+    also sees how the odds moved ("<odds_key>_change"). Picks are evaluated
+    over all matches at once and ranked lowest odd first.
+    With a BetGuard (parallel mode) each match is claimed and the stake
+    reserved before place_* runs, so no other worker can bet the same
+    match or spend the same money.
+    """
+    name = sport["name"]
+    # the recorder wants every match state, bet or not, in the window or not
+    recording = RECORDER.is_recording()
+    matches = read_matches(driver, sport, source, skip_ids=bets_data["betted_matches"], read_all=recording)
+    with timed("history", name):
+        infos = [match_info for (_, match_info) in matches]
+        sport["book"].observe(infos)
+        sport["book"].annotate(infos)
+    RECORDER.record(name, infos)
+    matches = [
+        (match_el, match_info) for (match_el, match_info) in matches
+        if match_info["match_id"] and match_info["match_id"] not in bets_data["betted_matches"]
+    ]
+
+    # the whole page is evaluated in one pass; only candidates reach place_*
+    with timed("pick", name):
+        candidates = sport["strategy"].rank([match_info for (_, match_info) in matches])
+    CANDIDATES.inc(len(candidates), sport=name)
+    print(f"[{name}] {len(candidates)} candidates.")
+
+    for (i, _, _) in candidates:
+        match_el, match_info = matches[i]
+        match_id = match_info["match_id"]
+
+        if match_el is None:
+            # feed record: only find the tile when there is something to bet
+            match_el = find_tile_element(driver, match_id)
+            if match_el is None:
+                continue
+
+        if guard is not None:
+            if not guard.claim_match(match_id):
+                continue
+            if not guard.reserve_stake(STAKE):
+                guard.release_match(match_id)
+                print(f"[{name}] Not enough free balance => stop {name} for this cycle.")
+                break
+
+        stake_used = 0
+        try:
+            print(f"[{name}] Checking match_id={match_id}, {match_teams(match_info)}")
+            with timed("place", name):
+                stake_used, potential_win = sport["place"](driver, match_el, match_info, bets_data)
+            # If stake_used==0 => no bet or fail, we skip
+            if stake_used > 0:
+                BETS_PLACED.inc(sport=name)
+                print(f"[{name}] bet placed => stake={stake_used}, potential={potential_win:.2f}\n")
+        finally:
+            if guard is not None:
+                guard.release_stake(STAKE, spent=stake_used)
+                guard.release_match(match_id)
+    CYCLES.inc(sport=name)
+    report_calls(driver, name)
+    return [match_info for (_, match_info) in matches]
+
+def sport_cycle(driver, sport, bets_data, guard, source=None, session=None, show_page=False):
+    """
+    One clear_basket -> balance -> scan pass for a sport (blocking; run by
+    sports.orchestrator). The balance comes from common.balance.BALANCE,
+    which only reads the page when due. Returns the delay before the next pass:
+    SLEEP_LOW_BALANCE, or from how soon the tracked matches are expected to
+    enter the betting window (orchestrator.next_poll_delay). Matches already
+    in the window keep the sport hot only while their odds are near the
+    strategy's range; otherwise the sport's "interval" applies, as it does
+    for every pass with the lazy scrape mode (it never sees upcoming matches).
+    session=(username, password, session_dir) logs back in when the balance
+    reads low because the session expired. show_page switches to the sport's
+    page (tab) first, so the basket and balance are read there.
+    """
+    name = sport["name"]
+    if show_page:
+        sport["navigate"](driver)
+    with timed("clear_basket", name):
+        clear_basket(driver)
+    # the page is only read when the ledger is due a check or reads low
+    guard.update_balance(BALANCE.current(driver, name, low=guard.min_balance))
+    print(f"[{name}] Current balance: {guard.available():.2f} zł")
+    balance_unknown = guard.available() < guard.min_balance or BALANCE.read_failed
+    if balance_unknown and session is not None and not is_logged_in(driver):
+        print(f"[{name}] Session expired.")
+        username, password, session_dir = session
+        if not resume_session(driver, username, password, session_dir):
+            input("If a captcha appeared, solve it manually. Press Enter when finished...")
+        save_session(driver, session_dir)
+        guard.update_balance(BALANCE.reconcile(driver, name, "login"))
+    if guard.available() < guard.min_balance:
+        print(f"[{name}] Balance < {guard.min_balance:.1f}, skipping bets.")
+        return SLEEP_LOW_BALANCE
+
+    infos = scan_sport(driver, sport, bets_data, guard, source)
+    infos = [match_info for match_info in infos if match_info["match_id"] not in bets_data["betted_matches"]]
+    near_range = sport["strategy"].odds_near_range(infos, HOT_ODDS_MARGIN)
+    etas = []
+    cold_in_window = False
+    for match_info, near in zip(infos, near_range):
+        eta = sport["seconds_to_window"](match_info)
+        if eta == 0 and not near:
+            # in the window, but its odds are nowhere near the range
+            eta = None
+            cold_in_window = True
+        etas.append(eta)
+    delay = next_poll_delay(etas)
+    # a lazy scrape returns only tiles already in the window, so the matches
+    # about to enter it have no ETA: poll at the sport's plain interval
+    lazy = source is None and scrape_mode_in_use(RECORDER.is_recording()) == "lazy"
+    if cold_in_window or lazy:
+        delay = min(delay, sport["interval"])
+    return delay
+
+def make_page_source(sport, use_odds_feed=False, incremental=False):
+    if use_odds_feed:
+        return LiveOddsFeed(sport["info_from_tile"])
+    if incremental:
+        return LiveTileTable(sport["name"], sport["info_from_tile"])
+    return None
+
+def start_sport_browser(driver_path, sport, username, password, use_odds_feed=False, lean=False, trace_calls=0):
+    """
+    (driver, session_dir, session_reused) for one sport's browser.
+    """
+    session_dir = profile_dir(sport["name"].lower())
+    driver = create_driver(driver_path, capture_network=use_odds_feed, profile_dir=session_dir, lean=lean)
+    if trace_calls:
+        trace_driver_calls(driver, trace_calls)
+    try:
+        reused = resume_session(driver, username, password, session_dir)
+    except Exception:
+        driver.quit()
+        raise
+    return driver, session_dir, reused
+
+def run_parallel_scan(username, password, use_odds_feed=False, incremental=False, lean=False, trace_calls=0):
+    """
+    One logged-in Chrome per sport, each scanned by its own
+    sports.orchestrator task on its own executor thread, so a slow page or
+    an error in one sport never holds up another. All sports share
+    bets_data (loaded here) and one BetGuard.
+    Every browser keeps its own profile (common.session), so a restart only
+    logs in (and asks for a captcha) where the session has expired.
+    Each worker stays on its own page, so it can keep a long-lived view of it:
+    use_odds_feed=True decides from the network frames between DOM resyncs,
+    incremental=True re-reads only the tiles a MutationObserver saw change.
+    lean=True runs the browsers headless with images/fonts/trackers blocked.
+    trace_calls=N prints each worker's N most expensive WebDriver calls per cycle.
+    A sport whose browser fails to start is skipped; the rest keep scanning.
+    """
+    drivers = []
+    executors = []
+
+    try:
+        # browsers start (and resume their sessions) side by side while the
+        # ledger loads; only the captcha prompts are one after another
+        with ThreadPoolExecutor(max_workers=len(SPORTS) + 1) as pool:
+            ledger_future = pool.submit(STARTUP.timed, "ledger", load_bets_data)
+            driver_path = STARTUP.timed("driver_path", resolve_driver_path)
+            with STARTUP.phase("browsers"):
+                futures = [
+                    pool.submit(
+                        start_sport_browser, driver_path, sport, username, password, use_odds_feed, lean, trace_calls
+                    )
+                    for sport in SPORTS
+                ]
+                started = []
+                for sport, future in zip(SPORTS, futures):
+                    try:
+                        started.append((sport, *future.result()))
+                    except Exception as e:
+                        print(f"[BROWSER] Could not start the {sport['name']} browser, skipping it: {e}")
+                drivers = [driver for _, driver, _, _ in started]
+            bets_data = ledger_future.result()
+        if not started:
+            print("[BROWSER] No sport browser started, nothing to scan.")
+            return
+        print(f"Loaded data: {len(bets_data['betted_matches'])} matches already bet, "
+              f"{len(bets_data['betted_coupons'])} coupons already bet.")
+
+        with STARTUP.phase("login"):
+            for sport, driver, session_dir, reused in started:
+                if not reused:
+                    input(f"[{sport['name']}] If a captcha appeared, solve it manually. Press Enter when finished...")
+                save_session(driver, session_dir)
+
+        guard = BetGuard(bets_data)
+        jobs = []
+        for sport, driver, _, _ in started:
+            source = make_page_source(sport, use_odds_feed, incremental)
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"scan-{sport['name'].lower()}")
+            executors.append(executor)
+            cycle = partial(sport_cycle, driver, sport, bets_data, guard, source)
+            jobs.append((sport, cycle, executor))
+        run_sports(jobs)
+    except KeyboardInterrupt:
+        print("Stopping sport scans...")
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for driver in drivers:
+            driver.quit()
@@ -0,0 +1,85 @@
+# sports/orchestrator.py
+
+import asyncio
+from contextlib import suppress
+
+from common.metrics import SCAN_FAILURES
+
+# After failures in a row the next cycle waits interval * 2**(n-1), capped
+MAX_BACKOFF = 8
+
+# Predictive polling: a sport with a match inside its betting window is
+# scanned every HOT_INTERVAL seconds; otherwise the next scan is due
+# LEAD_SECONDS before the earliest match is expected to enter it, but at
+# most IDLE_INTERVAL away (new matches appear on the page between scans).
+HOT_INTERVAL = 5
+IDLE_INTERVAL = 120
+LEAD_SECONDS = 15
+# A match inside its window only counts as hot while one of its odds is in
+# the strategy's range or at most this factor above it; the others are
+# rechecked at the sport's plain interval.
+HOT_ODDS_MARGIN = 1.25
+
+def next_poll_delay(etas, hot=HOT_INTERVAL, idle=IDLE_INTERVAL, lead=LEAD_SECONDS):
+    """
+    Seconds until the next scan, from each tracked match's estimated
+    seconds to its betting window (None: no estimate).
+    """
+    etas = [eta for eta in etas if eta is not None]
+    if not etas:
+        return idle
+    return min(idle, max(hot, min(etas) - lead))
+
+async def sport_loop(sport, cycle, executor):
+    """
+    Run `cycle` (blocking: a whole clear_basket -> scan pass) for one sport
+    forever, on `executor`. cycle() returns the delay before its next run
+    (see next_poll_delay); sport["interval"] is used when it returns None.
+    A cycle that errors or runs past sport["timeout"] only delays this
+    sport: its driver stays busy until the call returns, the others don't wait.
+    The timeout counts from when the cycle starts running, not while it is
+    queued behind another sport on a shared executor.
+    """
+    name = sport["name"]
+    loop = asyncio.get_running_loop()
+    failures = 0
+    while True:
+        started = asyncio.Event()
+
+        def run_cycle():
+            loop.call_soon_threadsafe(started.set)
+            return cycle()
+
+        future = loop.run_in_executor(executor, run_cycle)
+        delay = sport["interval"]
+        try:
+            await started.wait()
+            next_delay = await asyncio.wait_for(asyncio.shield(future), sport["timeout"])
+            failures = 0
+            if next_delay is not None:
+                delay = next_delay
+        except asyncio.TimeoutError:
+            failures += 1
+            SCAN_FAILURES.inc(sport=name, kind="timeout")
+            print(f"[{name}] Cycle still running after {sport['timeout']}s, other sports carry on.")
+            with suppress(Exception):
+                await future
+        except Exception as e:
+            failures += 1
+            SCAN_FAILURES.inc(sport=name, kind="error")
+            print(f"[{name}] Cycle error: {e}")
+        if failures:
+            delay = sport["interval"] * min(2 ** (failures - 1), MAX_BACKOFF)
+        print(f"[{name}] Next scan in {delay:.0f}s.\n")
+        await asyncio.sleep(delay)
+
+def run_sports(jobs):
+    """
+    jobs: [(sport, cycle, executor)], one asyncio task each. Sports sharing
+    a driver must share a single-thread executor; separate drivers get their
+    own so nothing serialises them. Runs until interrupted.
+    """
+    async def run_all():
+        await asyncio.gather(*(sport_loop(sport, cycle, executor) for (sport, cycle, executor) in jobs))
+
+    asyncio.run(run_all())
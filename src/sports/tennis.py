@@ -1,21 +1,76 @@
 # sports/tennis.py
 
-import time
 import re
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.common.exceptions import StaleElementReferenceException
 
 from sports.football import parse_odd_text  # Reuse parse_odd_text from football.py
-from common.bet_logic import get_balance, save_bets_data
+from common.balance import BALANCE
+from common.bet_logic import record_bet
+from common.live_tiles import (
+    LIVE_TILE_SELECTOR,
+    extract_live_tiles,
+    read_tile_elements,
+    scrape_tiles_lazily,
+    team_names,
+    odds_strings
+)
+from common.strategy import Strategy
+from common.urls import sts_url
+from common.ticket import place_single_bet, bet_possibly_placed
+from common.waits import wait_for_live_tiles
 
 def navigate_to_tennis_live(driver):
     """
     Navigate to the tennis live page
     """
-    driver.get("https://www.sts.pl/live/tenis")
-    time.sleep(3)
-
-def scrape_tennis_matches(driver):
+    driver.get(sts_url("/live/tenis"))
+    wait_for_live_tiles(driver, LIVE_TILE_SELECTOR)
+
+def tennis_info_from_tile(tile):
+    player1, player2 = team_names(tile)
+    time_str = tile["time_str"]  # e.g. "1 set" or "2 set"
+
+    # Scoreboard partials => ".live-match-tile-scoreboard-score__partials div"
+    # typically game_values might be [6,4, 2,2] if there's 2 partial lines
+    game_values = []
+    for txt in tile["partials"]:
+        txt = txt.strip()
+        if txt.isdigit():
+            game_values.append(int(txt))
+
+    # We only want the CURRENT set row. It's site-specific. We'll assume the *first row*
+    # is set #1, the second row is set #2. So if "2 set," we parse the second row.
+    games_player1 = 0
+    games_player2 = 0
+    set_number = parse_current_set_number(time_str)
+    if set_number == 2:
+        if len(game_values) >= 4:
+            # row1 => [0,1], row2 => [2,3]
+            games_player1 = game_values[2]
+            games_player2 = game_values[3]
+        elif len(game_values) >= 2:
+            # fallback if there's only 2 partial digits => maybe it's set #2 right away
+            games_player1 = game_values[0]
+            games_player2 = game_values[1]
+
+    # Odds => only 2 outcomes => "1" or "2"
+    odd_1_str, odd_2_str = odds_strings(tile, 2)
+
+    return {
+        "match_id": tile["match_id"],
+        "player1": player1,
+        "player2": player2,
+        "time_str": time_str,
+        "partials": list(tile["partials"]),
+        "set_number": set_number,
+        "games_player1": games_player1,
+        "games_player2": games_player2,
+        "odd_1": parse_odd_text(odd_1_str),
+        "odd_2": parse_odd_text(odd_2_str)
+    }
+
+def scrape_tennis_matches(driver, bulk=False, lazy=False, skip_ids=()):
     """
     Return a list of (match_el, match_info).
     match_info is a dict with:
@@ -24,122 +79,36 @@ def scrape_tennis_matches(driver):
         "player1": str,
         "player2": str,
         "time_str": str,  # e.g. "1 set", "2 set"
+        "set_number": int,
         "games_player1": int (current set games),
         "games_player2": int (current set games),
         "odd_1": float,
         "odd_2": float
       }
     We'll only pick matches in set #2, and ensure "3 or fewer games left."
+    bulk=True reads the whole page in one execute_script (see common.live_tiles).
+    lazy=True reads partials and odds only for tiles in set #2; skip_ids are left out.
     """
+    if bulk:
+        return [
+            (tile["el"], tennis_info_from_tile(tile)) for tile in extract_live_tiles(driver)
+            if tile["match_id"] not in skip_ids
+        ]
+    if lazy:
+        return scrape_tiles_lazily(
+            driver, "TENNIS", tennis_info_from_tile, tennis_clock_fields, TENNIS_STRATEGY,
+            odds_count=2, with_partials=True, skip_ids=skip_ids
+        )
+
     matches_data = []
 
-    all_match_containers = driver.find_elements(
-        By.CSS_SELECTOR, "div.collapsable-container bb-live-match-tile"
-    )
+    all_match_containers = driver.find_elements(By.CSS_SELECTOR, LIVE_TILE_SELECTOR)
 
     for match_el in all_match_containers:
         try:
-            # 1) Identify match_id
-            anchor = match_el.find_element(By.CSS_SELECTOR, "a")
-            data_cy = anchor.get_attribute("data-cy")
-            href = anchor.get_attribute("href")
-            if data_cy and "/" in data_cy:
-                match_id = data_cy.split("/")[-1]
-            elif href and "/" in href:
-                match_id = href.split("/")[-1]
-            else:
-                match_id = None
-
-            # 2) Players
-            team_els = match_el.find_elements(
-                By.CSS_SELECTOR, ".match-tile-scoreboard-team__name span"
-            )
-            if len(team_els) == 2:
-                player1 = team_els[0].text.strip()
-                player2 = team_els[1].text.strip()
-            else:
-                player1 = "Unknown"
-                player2 = "Unknown"
-
-            # 3) Time string => e.g. "1 set" or "2 set"
-            time_el = match_el.find_elements(
-                By.CSS_SELECTOR, ".live-match-tile-time-details__game-name"
-            )
-            time_str = " / ".join(e.text for e in time_el if e.text)
-
-            # 4) Parse scoreboard partial => e.g. games
-            #    We look for ".live-match-tile-scoreboard-score__partials"
-            #    The FIRST partial row typically shows the current set games.
-            #    e.g. 4 5 => means 4:5 in the second set so far
-            partials = match_el.find_elements(
-                By.CSS_SELECTOR,
-                ".live-match-tile-scoreboard-score__partials div"
-            )
-            # partials might contain multiple lines: 1) set 1 / set 2 scores, 2) total sets, etc.
-            # We'll assume the FIRST line we see is the current set if we are in set #2
-            # or we do a more robust approach: parse last line if "2 set"...
-            # For simplicity, let's just parse the first two integers if they exist:
-
-            games_player1 = 0
-            games_player2 = 0
-            game_values = []
-            for p in partials:
-                txt = p.text.strip()
-                if txt.isdigit():
-                    game_values.append(int(txt))
-
-            # typically game_values might be [6,4, 2,2] if there's 2 partial lines
-            # We only want the CURRENT set row. It's site-specific. We'll assume the *first row*
-            # is set #1, the second row is set #2. So if "2 set," we parse the second row, etc.
-
-            # We'll do a small helper:
-            set_number = parse_current_set_number(time_str)  # see below
-            if set_number == 2:
-                # we attempt to parse the second row
-                # each "row" typically has 2 digits => we need to skip the first 2 digits from game_values
-                if len(game_values) >= 4:
-                    # row1 => [0,1], row2 => [2,3]
-                    # so player1=game_values[2], player2=game_values[3]
-                    # that means the partial array might be bigger if the match had multiple sets
-                    games_player1 = game_values[2]
-                    games_player2 = game_values[3]
-                elif len(game_values) >= 2:
-                    # fallback if there's only 2 partial digits => maybe it's set #2 right away
-                    games_player1 = game_values[0]
-                    games_player2 = game_values[1]
-            else:
-                # if not 2 set, we might still parse the first row, but in theory we skip anyway
-                games_player1 = 0
-                games_player2 = 0
-
-            # 5) Odds => only 2 outcomes => "1" or "2"
-            odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-            if len(odds_buttons) >= 2:
-                odd_1_str = odds_buttons[0].find_element(
-                    By.CSS_SELECTOR, "[data-testid='odds-value']"
-                ).text
-                odd_2_str = odds_buttons[1].find_element(
-                    By.CSS_SELECTOR, "[data-testid='odds-value']"
-                ).text
-            else:
-                odd_1_str = "0.00"
-                odd_2_str = "0.00"
-
-            odd_1 = parse_odd_text(odd_1_str)
-            odd_2 = parse_odd_text(odd_2_str)
-
-            match_info = {
-                "match_id": match_id,
-                "player1": player1,
-                "player2": player2,
-                "time_str": time_str,
-                "games_player1": games_player1,
-                "games_player2": games_player2,
-                "odd_1": odd_1,
-                "odd_2": odd_2
-            }
-
-            matches_data.append((match_el, match_info))
+            tile = read_tile_elements(match_el, odds_count=2, with_partials=True)
+            if tile["match_id"] not in skip_ids:
+                matches_data.append((match_el, tennis_info_from_tile(tile)))
 
         except StaleElementReferenceException:
             print("[TENNIS] Stale element, skipping.")
@@ -160,6 +129,14 @@ def parse_current_set_number(time_str):
         return int(match.group(1))
     return 0
 
+def tennis_clock_fields(time_str):
+    # games of the current set live in the partials, read later
+    return {"set_number": parse_current_set_number(time_str)}
+
+def tennis_minute(match_info):
+    # no game clock in tennis: the set stands in for it
+    return match_info["set_number"]
+
 def is_set_almost_finished(g1, g2):
     """
     Return True if "there are only 3 or fewer games left in this set."
@@ -177,33 +154,44 @@ def is_set_almost_finished(g1, g2):
     leftover = 6 - big
     return (leftover <= 3)
 
-def pick_tennis_bet_type(match_info):
+# 1) Must be "2 set"
+# 2) Set almost finished: leader on 3-5 games (see is_set_almost_finished)
+# 3) Among odd_1, odd_2 in [1.15, 2.0], pick the *lowest*
+TENNIS_STRATEGY = Strategy("tennis", {
+    "conditions": [
+        ("set_number", "==", 2),
+        (("max", "games_player1", "games_player2"), ">=", 3),
+        (("max", "games_player1", "games_player2"), "<", 6),
+    ],
+    "outcomes": [("player1", "odd_1"), ("player2", "odd_2")],
+    "odds_range": (1.15, 2.0),
+})
+
+# Betting window of TENNIS_STRATEGY, for the poll scheduler
+WINDOW_SET = TENNIS_STRATEGY.params()["set_number =="]
+WINDOW_GAMES = TENNIS_STRATEGY.params()["max(games_player1,games_player2) >="]
+WINDOW_END_GAMES = TENNIS_STRATEGY.params()["max(games_player1,games_player2) <"]
+GAME_SECONDS = 4 * 60
+# games left in a set we have no partials for (about half of a ~10 game set)
+UNKNOWN_SET_GAMES = 5
+
+def tennis_seconds_to_window(match_info):
     """
-    1) Must be "2 set"
-    2) Must be is_set_almost_finished(g1, g2) => True
-    3) Among odd_1, odd_2 in [1.15, 2.0], pick the *lowest*
+    Estimated seconds until the leader of set WINDOW_SET has WINDOW_GAMES
+    games (0 inside the window, None when past it or before a known set).
     """
-    set_number = parse_current_set_number(match_info["time_str"])
-    if set_number != 2:
-        return None
-
-    g1 = match_info["games_player1"]
-    g2 = match_info["games_player2"]
-    if not is_set_almost_finished(g1, g2):
-        return None
-
-    candidates = []
-    if 1.15 <= match_info["odd_1"] <= 2.0:
-        candidates.append(("player1", match_info["odd_1"]))
-    if 1.15 <= match_info["odd_2"] <= 2.0:
-        candidates.append(("player2", match_info["odd_2"]))
-
-    if not candidates:
-        return None
+    set_number = match_info["set_number"]
+    leader = max(match_info.get("games_player1", 0), match_info.get("games_player2", 0))
+    if set_number == WINDOW_SET:
+        if leader >= WINDOW_END_GAMES:
+            return None
+        return max(0, WINDOW_GAMES - leader) * GAME_SECONDS
+    if set_number == WINDOW_SET - 1:
+        return (UNKNOWN_SET_GAMES + WINDOW_GAMES) * GAME_SECONDS
+    return None
 
-    # pick the outcome with the *lowest* odd
-    best_outcome, best_odd = min(candidates, key=lambda x: x[1])
-    return best_outcome, best_odd
+def pick_tennis_bet_type(match_info):
+    return TENNIS_STRATEGY.pick(match_info)
 
 def place_tennis_bet(driver, match_el, match_info, bets_data):
     """
@@ -222,86 +210,31 @@ def place_tennis_bet(driver, match_el, match_info, bets_data):
         return (0, 0)
 
     # Check balance inside the function => user wants per-bet check
-    balance_now = get_balance(driver)
+    balance_now = BALANCE.current(driver, "TENNIS", low=2.0)
     if balance_now < 2.0:
         print(f"[TENNIS] balance={balance_now:.2f} <2 => skip match={match_info['match_id']}")
         return (0, 0)
 
     print(f"[TENNIS] Attempting bet: {outcome}, odd={odd_val:.2f} on {match_info['player1']} vs {match_info['player2']}")
     stake_used = 2.0
-    potential_win = 0.0
-
-    # 1) click the correct odds => "sds-odds-button" with label map
-    try:
-        odds_buttons = match_el.find_elements(By.CSS_SELECTOR, "sds-odds-button")
-        for btn in odds_buttons:
-            try:
-                label_el = btn.find_element(By.CSS_SELECTOR, ".odds-button__label")
-                if label_el.text.strip().lower() == label_to_find.lower():
-                    btn.click()
-                    print(f"[TENNIS] Clicked odds '{label_el.text.strip()}' in tile.")
-                    time.sleep(2)
-                    break
-            except NoSuchElementException:
-                pass
-    except Exception as e:
-        print(f"[TENNIS] Error selecting bet: {e}")
-        return (0, 0)
 
-    # 2) input stake=2
-    try:
-        stake_input = driver.find_element(By.CSS_SELECTOR, "sts-shared-input[data-cy='ticket-stake'] input#AMOUNT")
-        stake_input.clear()
-        stake_input.send_keys(str(stake_used))
-        print("[TENNIS] Stake set to 2.0")
-        time.sleep(2)
-    except NoSuchElementException:
-        print("[TENNIS] stake input not found => fail.")
+    # odds -> stake -> confirm -> ticket status, in one scripted step
+    result = place_single_bet(driver, match_el, label_to_find, odd_val, stake_used)
+    print(f"[TENNIS] Ticket {result['status']} in {result['elapsed_ms']:.0f} ms "
+          f"(odd {result['odd']:.2f}, potential win {result['potential_win']:.2f} zł) {result['message']}")
+    if not bet_possibly_placed(result):
         return (0, 0)
 
-    # 3) parse potential
-    try:
-        place_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        potential_el = place_btn.find_element(By.CSS_SELECTOR, ".submit-button__content")
-        raw_text = potential_el.text.strip()  # e.g. "2,28 zł"
-        cleaned = raw_text.replace(",", ".").replace("zł", "").replace("\xa0", "").strip()
-        potential_win = float(cleaned)
-        print(f"[TENNIS] Potential win: {potential_win:.2f}")
-    except Exception:
-        print("[TENNIS] Could not parse potential => 0.0")
-
-    # 4) confirm bet (2-click if needed)
-    try:
-        # first click
-        place_btn.click()
-        time.sleep(2)
-
-        # second click attempt
-        place_btn_2 = driver.find_element(By.CSS_SELECTOR, "button[data-testid='button-place-a-bet']")
-        place_btn_2.click()
-        print("Bet placed!")
-        time.sleep(3)
-
-    except StaleElementReferenceException:
-        print("Element became stale; possibly only one click is needed or site updated.")
-        print("Proceeding with no second click.")
-
-    except NoSuchElementException:
-        print("No second place button found => continuing anyway.")
-
-
-    # 5) immediately save
-    if stake_used > 0:
-        bets_data["betted_matches"].add(match_info["match_id"])
-        bets_data["bets_details"].append({
-            "sport": "tennis",
-            "match_id": match_info["match_id"],
-            "players": f"{match_info['player1']} vs {match_info['player2']}",
-            "stake": stake_used,
-            # or user might do odd_val * stake => but we do potential_win from slip
-            "potential_win": potential_win,
-            "balance_after": get_balance(driver),
-        })
-        save_bets_data(bets_data)
+    potential_win = result["potential_win"]
+    record_bet(bets_data, {
+        "sport": "tennis",
+        "match_id": match_info["match_id"],
+        "players": f"{match_info['player1']} vs {match_info['player2']}",
+        "stake": stake_used,
+        "odd": result["odd"],
+        "potential_win": potential_win,
+        "status": result["status"],
+        "balance_after": BALANCE.estimate(),
+    })
 
     return (stake_used, potential_win)